@@ -0,0 +1,142 @@
+"""
+Admission control for the JARVIS API.
+Each client gets a token bucket; a request that finds its bucket empty is turned
+away with 429. Admitted requests then need a slot in a concurrency pool: cheap
+local intents and slow network-bound intents have separate pools, so a burst of
+searches cannot starve the dashboard pollers. A pool queues only a few waiters
+and rejects the rest at once (503), shedding load before it piles up.
+"""
+import collections
+import threading
+import time
+
+from metrics import REGISTRY
+
+ADMISSION_IN_FLIGHT = REGISTRY.gauge(
+    "jarvis_admission_in_flight", "Requests holding a slot in each admission pool.", ("pool",)
+)
+ADMISSION_QUEUED = REGISTRY.gauge(
+    "jarvis_admission_queue_depth", "Requests waiting for a slot in each admission pool.", ("pool",)
+)
+ADMISSION_REJECTED = REGISTRY.counter(
+    "jarvis_admission_rejected_total", "Requests turned away by admission control.", ("pool", "reason")
+)
+
+
+class TokenBucket:
+    __slots__ = ("rate", "capacity", "tokens", "updated")
+
+    def __init__(self, rate, capacity, now):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = now
+
+    def take(self, cost, now):
+        """
+        Spend `cost` tokens; returns 0 on success, else seconds until they will be available.
+        A cost above the capacity is let through from a full bucket and leaves it in
+        debt, so a large batch is paid off before the client's next request.
+        """
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        needed = min(cost, self.capacity)
+        if self.tokens >= needed:
+            self.tokens -= cost
+            return 0
+        return (needed - self.tokens) / self.rate
+
+
+class RateLimiter:
+    """Per-client token buckets; the least recently seen clients are forgotten past max_clients."""
+
+    def __init__(self, rate, burst, max_clients=10000):
+        self.rate = rate
+        self.burst = burst
+        self.max_clients = max_clients
+        self._buckets = collections.OrderedDict()
+        self._lock = threading.Lock()
+
+    def check(self, client, cost=1):
+        """0 when the request may proceed, else the seconds the client should wait."""
+        now = time.monotonic()
+        with self._lock:
+            bucket = self._buckets.get(client)
+            if bucket is None:
+                bucket = self._buckets[client] = TokenBucket(self.rate, self.burst, now)
+                if len(self._buckets) > self.max_clients:
+                    self._buckets.popitem(last=False)
+            else:
+                self._buckets.move_to_end(client)
+            return bucket.take(cost, now)
+
+
+class ConcurrencyPool:
+    """At most `limit` holders; up to `max_queue` callers wait `timeout` seconds for a slot."""
+
+    def __init__(self, name, limit, max_queue, timeout):
+        self.name = name
+        self.limit = limit
+        self.max_queue = max_queue
+        self.timeout = timeout
+        self.active = 0
+        self.waiting = 0
+        self._cond = threading.Condition()
+
+    def acquire(self):
+        """Take a slot; returns False (and counts a rejection) when the pool is saturated."""
+        with self._cond:
+            if self.active < self.limit:
+                self.active += 1
+                ADMISSION_IN_FLIGHT.set(self.active, pool=self.name)
+                return True
+            if self.waiting >= self.max_queue:
+                ADMISSION_REJECTED.inc(pool=self.name, reason="queue_full")
+                return False
+
+            self.waiting += 1
+            ADMISSION_QUEUED.set(self.waiting, pool=self.name)
+            deadline = time.monotonic() + self.timeout
+            try:
+                while self.active >= self.limit:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        ADMISSION_REJECTED.inc(pool=self.name, reason="queue_timeout")
+                        return False
+                    self._cond.wait(remaining)
+            finally:
+                self.waiting -= 1
+                ADMISSION_QUEUED.set(self.waiting, pool=self.name)
+            self.active += 1
+            ADMISSION_IN_FLIGHT.set(self.active, pool=self.name)
+            return True
+
+    def release(self):
+        with self._cond:
+            self.active -= 1
+            ADMISSION_IN_FLIGHT.set(self.active, pool=self.name)
+            self._cond.notify()
+
+
+class AdmissionController:
+    def __init__(self, rate, burst, pools):
+        # A rate of 0 disables per-client limits
+        self.limiter = RateLimiter(rate, burst) if rate > 0 else None
+        self.pools = {pool.name: pool for pool in pools}
+
+    def admit(self, client, pool_name, cost=1):
+        """
+        (True, None) when admitted, which must be paired with release(pool_name);
+        otherwise (False, (status, retry_after_seconds)).
+        """
+        if self.limiter is not None:
+            wait = self.limiter.check(client, cost)
+            if wait:
+                ADMISSION_REJECTED.inc(pool=pool_name, reason="rate_limited")
+                return False, (429, wait)
+        if not self.pools[pool_name].acquire():
+            return False, (503, 1)
+        return True, None
+
+    def release(self, pool_name):
+        self.pools[pool_name].release()
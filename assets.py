@@ -0,0 +1,103 @@
+"""
+Dashboard asset serving for JARVIS.
+index.html, script.js and style.css are read once, fingerprinted and compressed
+(gzip, plus brotli when the brotli package is installed) so each request is a
+dictionary lookup. index.html links the other assets by content hash, which lets
+them be cached for a year; index.html itself is revalidated with its ETag.
+"""
+import gzip
+import hashlib
+import mimetypes
+import os
+import re
+
+from lazy import optional_import
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+DASHBOARD_FILES = ("index.html", "script.js", "style.css")
+
+IMMUTABLE = "public, max-age=31536000, immutable"
+REVALIDATE = "no-cache"
+
+# Preferred first; identity is always available
+ENCODINGS = ("br", "gzip")
+
+
+class Asset:
+    __slots__ = ("name", "mimetype", "digest", "bodies")
+
+    def __init__(self, name, mimetype, data):
+        self.name = name
+        self.mimetype = mimetype
+        self.digest = hashlib.sha256(data).hexdigest()[:16]
+        self.bodies = {"identity": data}
+
+    def etag(self, encoding):
+        return self.digest if encoding == "identity" else f"{self.digest}-{encoding}"
+
+    def compress(self, brotli):
+        data = self.bodies["identity"]
+        variants = {"gzip": gzip.compress(data, compresslevel=9, mtime=0)}
+        if brotli is not None:
+            variants["br"] = brotli.compress(data, quality=11)
+        for encoding, body in variants.items():
+            # Tiny files can grow when compressed
+            if len(body) < len(data):
+                self.bodies[encoding] = body
+
+
+class AssetStore:
+    def __init__(self, root=ROOT, names=DASHBOARD_FILES, api_base=""):
+        self.assets = {}
+        brotli = optional_import("brotli")
+        pages = []
+        for name in names:
+            with open(os.path.join(root, name), "rb") as f:
+                data = f.read()
+            mimetype = mimetypes.guess_type(name)[0] or "application/octet-stream"
+            if name.endswith(".html"):
+                pages.append((name, mimetype, data))
+            else:
+                self.assets[name] = Asset(name, mimetype, data)
+
+        # Pages are rewritten once the assets they reference have their hashes
+        for name, mimetype, data in pages:
+            self.assets[name] = Asset(name, mimetype, self._link(data.decode("utf-8"), api_base).encode("utf-8"))
+        for asset in self.assets.values():
+            asset.compress(brotli)
+
+    def _link(self, html, api_base):
+        """Point the page at hashed asset URLs and at this server for API calls."""
+        for name, asset in self.assets.items():
+            html = re.sub(rf'(href|src)="{re.escape(name)}"', rf'\1="{name}?v={asset.digest}"', html)
+        return re.sub(r'(<meta name="jarvis-api" content=")[^"]*(")', rf"\g<1>{api_base}\g<2>", html)
+
+    def get(self, name):
+        return self.assets.get(name)
+
+    def select(self, asset, accept_encodings):
+        """Best encoding the client accepts; accept_encodings is werkzeug's request.accept_encodings."""
+        for encoding in ENCODINGS:
+            if encoding in asset.bodies and accept_encodings.quality(encoding) > 0:
+                return encoding
+        return "identity"
+
+    def respond(self, name, request, response_class):
+        """Response for a GET of `name`: full body, 304, or None when there is no such asset."""
+        asset = self.get(name)
+        if asset is None:
+            return None
+        encoding = self.select(asset, request.accept_encodings)
+        versioned = request.args.get("v") == asset.digest
+
+        headers = {
+            "ETag": f'"{asset.etag(encoding)}"',
+            "Cache-Control": IMMUTABLE if versioned else REVALIDATE,
+            "Vary": "Accept-Encoding",
+        }
+        if any(request.if_none_match.contains(asset.etag(e)) for e in asset.bodies):
+            return response_class(status=304, headers=headers)
+
+        if encoding != "identity":
+            headers["Content-Encoding"] = encoding
+        return response_class(asset.bodies[encoding], mimetype=asset.mimetype, headers=headers)
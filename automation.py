@@ -2,51 +2,65 @@ import os
 import shutil
 from datetime import datetime
 
+from classifier import ContentClassifier
+
 class Automator:
+    # Define categories
+    extensions = {
+        "Images": [".jpg", ".jpeg", ".png", ".gif", ".webp", ".svg"],
+        "Documents": [".pdf", ".docx", ".txt", ".xlsx", ".pptx", ".csv"],
+        "Installers": [".exe", ".msi", ".dmg", ".iso"],
+        "Archives": [".zip", ".rar", ".7z", ".tar", ".gz"],
+        "Video": [".mp4", ".mkv", ".mov", ".avi"],
+        "Audio": [".mp3", ".wav", ".flac"]
+    }
+
     def __init__(self):
         self.downloads_path = os.path.join(os.path.expanduser("~"), "Downloads")
+        self.classifier = ContentClassifier(self.extensions)
 
-    def organize_downloads(self):
-        """Organizes files in the Downloads folder by extension."""
+    def organize_downloads(self, by_content=False, dedupe=False):
+        """
+        Organizes files in the Downloads folder by extension.
+        With by_content, files are sorted by their magic bytes so misnamed files land
+        in the right folder. With dedupe, identical copies are moved to 'Duplicates'.
+        """
         if not os.path.exists(self.downloads_path):
             return {"status": "error", "message": "Downloads folder not found."}
 
         stats = {"moved": 0, "errors": 0}
-        
-        # Define categories
-        extensions = {
-            "Images": [".jpg", ".jpeg", ".png", ".gif", ".webp", ".svg"],
-            "Documents": [".pdf", ".docx", ".txt", ".xlsx", ".pptx", ".csv"],
-            "Installers": [".exe", ".msi", ".dmg", ".iso"],
-            "Archives": [".zip", ".rar", ".7z", ".tar", ".gz"],
-            "Video": [".mp4", ".mkv", ".mov", ".avi"],
-            "Audio": [".mp3", ".wav", ".flac"]
-        }
 
         try:
-            for filename in os.listdir(self.downloads_path):
-                file_path = os.path.join(self.downloads_path, filename)
-                
-                if os.path.isfile(file_path):
-                    file_ext = os.path.splitext(filename)[1].lower()
-                    
-                    moved = False
-                    for category, exts in extensions.items():
-                        if file_ext in exts:
-                            target_dir = os.path.join(self.downloads_path, category)
-                            os.makedirs(target_dir, exist_ok=True)
-                            try:
-                                shutil.move(file_path, os.path.join(target_dir, filename))
-                                stats["moved"] += 1
-                                moved = True
-                                break
-                            except Exception:
-                                stats["errors"] += 1
+            files = [
+                os.path.join(self.downloads_path, filename)
+                for filename in os.listdir(self.downloads_path)
+                if os.path.isfile(os.path.join(self.downloads_path, filename))
+            ]
+
+            if dedupe:
+                stats["duplicates"] = 0
+                duplicates = set()
+                for group in self.classifier.find_duplicates(files):
+                    # Keep the first copy, set the rest aside (never delete)
+                    for path in group[1:]:
+                        if self._move(path, "Duplicates", stats):
+                            stats["duplicates"] += 1
+                            duplicates.add(path)
+                files = [path for path in files if path not in duplicates]
+
+            for file_path in files:
+                if by_content:
+                    category = self.classifier.classify(file_path)
+                else:
+                    category = self._category_for(file_path)
+
+                if category:
+                    self._move(file_path, category, stats)
                     
-                    # Optional: Move everything else to 'Misc'
-                    # if not moved:
-                    #     ...
-            
+                # Optional: Move everything else to 'Misc'
+                # if not category:
+                #     ...
+
             return {
                 "status": "success", 
                 "message": f"Protocol Complete. Organized {stats['moved']} files.",
@@ -56,6 +70,35 @@ class Automator:
         except Exception as e:
             return {"status": "error", "message": str(e)}
 
+    def _category_for(self, file_path):
+        file_ext = os.path.splitext(file_path)[1].lower()
+        for category, exts in self.extensions.items():
+            if file_ext in exts:
+                return category
+        return None
+
+    def _move(self, file_path, category, stats):
+        target_dir = os.path.join(self.downloads_path, category)
+        os.makedirs(target_dir, exist_ok=True)
+        try:
+            shutil.move(file_path, self._free_path(target_dir, os.path.basename(file_path)))
+            stats["moved"] += 1
+            return True
+        except Exception:
+            stats["errors"] += 1
+            return False
+
+    @staticmethod
+    def _free_path(target_dir, name):
+        """target_dir/name, or 'name (1).ext', 'name (2).ext', ... if it is taken (moves never overwrite)."""
+        stem, ext = os.path.splitext(name)
+        path = os.path.join(target_dir, name)
+        n = 1
+        while os.path.lexists(path):
+            path = os.path.join(target_dir, f"{stem} ({n}){ext}")
+            n += 1
+        return path
+
     def get_system_summary(self):
         """Returns a quick text summary of the system state."""
         # Placeholder for more complex logic
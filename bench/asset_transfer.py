@@ -0,0 +1,113 @@
+"""
+Dashboard transfer bytes and modelled time-to-interactive.
+
+Compares the old setup (files from a separate static server, uncompressed, API
+calls cross-origin so every JSON POST needs a CORS preflight) with the backend
+serving the dashboard itself (precompressed, hashed URLs, ETag revalidation).
+Bytes come from real responses of the app; time-to-interactive is modelled on a
+link with the given round-trip time and bandwidth: HTML, then CSS and JS in
+parallel, then the first command round trip.
+
+    python bench/asset_transfer.py --rtt-ms 40 --mbps 20
+"""
+import argparse
+import os
+import re
+import sys
+import tempfile
+import time
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO = os.path.dirname(BENCH_DIR)
+sys.path.insert(0, REPO)
+sys.path.insert(0, BENCH_DIR)
+
+import stubs
+
+
+def wire_bytes(response):
+    """Body plus a rough size of the status line and headers."""
+    headers = sum(len(k) + len(v) + 4 for k, v in response.headers.items()) + 17
+    return headers + len(response.data)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rtt-ms", type=float, default=40)
+    parser.add_argument("--mbps", type=float, default=20)
+    parser.add_argument("--repeat", type=int, default=2000, help="requests for the server-side timing")
+    args = parser.parse_args()
+
+    os.environ.setdefault("JARVIS_LOG_LEVEL", "WARNING")
+    os.environ.setdefault("JARVIS_RATE_LIMIT", "0")
+    os.chdir(tempfile.mkdtemp(prefix="jarvis-assets-"))
+    stubs.install()
+
+    import server
+    client = server.app.test_client()
+    rtt = args.rtt_ms / 1000
+    bytes_per_second = args.mbps * 1e6 / 8
+
+    def fetch_time(size):
+        return rtt + size / bytes_per_second
+
+    raw = {}
+    for name in ("index.html", "style.css", "script.js"):
+        with open(os.path.join(REPO, name), "rb") as f:
+            # A plain static server adds roughly the same headers
+            raw[name] = len(f.read()) + 150
+
+    command = {"command": "who are you"}
+    api = wire_bytes(client.post("/command", json=command))
+
+    # Old: separate static server, cross-origin API with a preflight before the POST
+    old_bytes = sum(raw.values()) + api
+    old_tti = (fetch_time(raw["index.html"]) + max(fetch_time(raw["style.css"]), fetch_time(raw["script.js"]))
+               + rtt + fetch_time(api))
+
+    def load(encoding, etags=None):
+        headers = {"Accept-Encoding": encoding}
+        if etags:
+            headers["If-None-Match"] = etags["index.html"]
+        page = client.get("/", headers=headers)
+        sizes = {"index.html": wire_bytes(page)}
+        tags = {"index.html": page.headers["ETag"]}
+        if page.status_code == 200:
+            html = server.assets.get("index.html").bodies["identity"].decode()
+            for url in re.findall(r'(?:href|src)="((?:style|script)\.\w+\?v=\w+)"', html):
+                response = client.get("/" + url, headers={"Accept-Encoding": encoding})
+                sizes[url.split("?")[0]] = wire_bytes(response)
+        return sizes, tags
+
+    rows = [("separate server", "identity", old_bytes, old_tti)]
+    for label, encoding in (("backend, gzip", "gzip"), ("backend, br", "br, gzip")):
+        if encoding.startswith("br") and "br" not in server.assets.get("index.html").bodies:
+            print("brotli not installed; skipping the br row")
+            continue
+        sizes, _ = load(encoding)
+        total = sum(sizes.values()) + api
+        tti = (fetch_time(sizes["index.html"]) + max(fetch_time(sizes["style.css"]), fetch_time(sizes["script.js"]))
+               + fetch_time(api))
+        rows.append((label, encoding, total, tti))
+
+    # Repeat visit: hashed assets come from the browser cache, the page revalidates
+    sizes, tags = load("gzip")
+    warm, _ = load("gzip", etags=tags)
+    warm_total = sum(warm.values()) + api
+    rows.append(("backend, repeat visit", "gzip", warm_total, fetch_time(warm["index.html"]) + fetch_time(api)))
+
+    print(f"Link: {args.rtt_ms:.0f} ms RTT, {args.mbps:.0f} Mbit/s")
+    print(f"{'setup':<24} {'bytes':>8} {'modelled TTI':>13}")
+    for label, _, total, tti in rows:
+        print(f"{label:<24} {total:8d} {tti * 1000:10.1f} ms")
+
+    for label, headers in (("200 gzip", {"Accept-Encoding": "gzip"}),
+                           ("304", {"Accept-Encoding": "gzip", "If-None-Match": tags["index.html"]})):
+        start = time.perf_counter()
+        for _ in range(args.repeat):
+            client.get("/", headers=headers)
+        print(f"server time for GET / ({label}): {(time.perf_counter() - start) / args.repeat * 1e6:.0f} us")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+"""
+Throughput of POST /command/batch against sequential POST /command calls.
+
+Sends the same command list both ways through the Flask test client, with the
+search backend stubbed (optionally with an artificial network delay so the
+concurrency of independent sessions is visible).
+
+    python bench/batch_throughput.py --commands 1000 --sessions 16 --search-ms 20
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(BENCH_DIR))
+sys.path.insert(0, BENCH_DIR)
+
+import stubs
+from bench_server import COMMAND_MIX
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--commands", type=int, default=1000)
+    parser.add_argument("--sessions", type=int, default=16)
+    parser.add_argument("--search-ms", type=float, default=0.0)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    os.environ.setdefault("JARVIS_LOG_LEVEL", "WARNING")
+    # Every benchmark request comes from the same loopback client
+    os.environ.setdefault("JARVIS_RATE_LIMIT", "0")
+    os.chdir(tempfile.mkdtemp(prefix="jarvis-batch-"))
+    stubs.install()
+    stubs.StubDDGS.latency = args.search_ms / 1000
+
+    import server
+    client = server.app.test_client()
+
+    rng = random.Random(args.seed)
+    items = [
+        {"command": rng.choice(COMMAND_MIX), "session": f"s{rng.randrange(args.sessions)}"}
+        for _ in range(args.commands)
+    ]
+
+    start = time.perf_counter()
+    for item in items:
+        assert client.post("/command", json=item).status_code == 200
+    sequential = time.perf_counter() - start
+
+    start = time.perf_counter()
+    response = client.post("/command/batch", json={"commands": items})
+    batched = time.perf_counter() - start
+    assert len(response.json["results"]) == len(items)
+
+    start = time.perf_counter()
+    first = None
+    response = client.post("/command/batch", json={"commands": items, "stream": True}, buffered=False)
+    for line in response.response:
+        if first is None:
+            first = time.perf_counter() - start
+    streamed = time.perf_counter() - start
+    response.close()
+
+    print(f"{args.commands} commands over {args.sessions} sessions, search latency {args.search_ms:.0f} ms")
+    print(f"sequential /command: {sequential:8.3f} s  {args.commands / sequential:10.0f} cmd/s")
+    print(f"/command/batch:      {batched:8.3f} s  {args.commands / batched:10.0f} cmd/s  ({sequential / batched:.1f}x)")
+    print(f"batch (NDJSON):      {streamed:8.3f} s  first result after {first * 1000:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""Admission control: per-request overhead and shedding under a burst."""
+import itertools
+import threading
+
+from admission import AdmissionController, ConcurrencyPool, RateLimiter
+from bench_singleflight import burst
+
+
+def bench_rate_limiter_check(benchmark):
+    limiter = RateLimiter(rate=1e9, burst=1e9)
+    clients = itertools.cycle([f"10.0.{i // 256}.{i % 256}" for i in range(1000)])
+    benchmark(lambda: limiter.check(next(clients)))
+
+
+def bench_admit_release(benchmark):
+    controller = AdmissionController(rate=1e9, burst=1e9, pools=[ConcurrencyPool("fast", 32, 64, timeout=1.0)])
+
+    def round_trip():
+        admitted, _ = controller.admit("127.0.0.1", "fast")
+        controller.release("fast")
+        return admitted
+
+    assert benchmark(round_trip)
+
+
+def bench_rate_limit_rejects_with_retry_after(benchmark):
+    def run():
+        controller = AdmissionController(rate=10, burst=5, pools=[ConcurrencyPool("fast", 32, 64, timeout=1.0)])
+        outcomes = []
+        for _ in range(8):
+            admitted, rejection = controller.admit("greedy", "fast")
+            if admitted:
+                controller.release("fast")
+            outcomes.append(rejection)
+        return outcomes
+
+    outcomes = benchmark(run)
+    assert outcomes[:5] == [None] * 5
+    assert all(status == 429 and 0 < wait <= 0.5 for status, wait in outcomes[5:])
+
+
+def bench_slow_pool_sheds_burst(benchmark):
+    def run():
+        slow = ConcurrencyPool("slow", limit=2, max_queue=2, timeout=0.5)
+        controller = AdmissionController(rate=0, burst=0, pools=[slow])
+
+        def request():
+            admitted, rejection = controller.admit("client", "slow")
+            if not admitted:
+                return rejection[0]
+            threading.Event().wait(0.05)
+            controller.release("slow")
+            return 200
+
+        return burst(request, n=20)
+
+    codes = benchmark.pedantic(run, rounds=3)
+    # Two run at once and two wait their turn; everyone else is turned away immediately
+    assert codes.count(200) == 4 and codes.count(503) == 16
+
+
+def bench_stats_under_admission(benchmark, client):
+    response = benchmark(client.get, "/stats")
+    assert response.status_code == 200
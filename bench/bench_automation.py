@@ -0,0 +1,32 @@
+"""organize_downloads and the content classifier on generated trees."""
+import os
+import random
+
+import pytest
+
+from automation import Automator
+
+EXTENSIONS = [".jpg", ".png", ".pdf", ".docx", ".zip", ".exe", ".mp4", ".mp3", ".txt", ".unknown"]
+
+
+def make_tree(root, files, seed=7):
+    rng = random.Random(seed)
+    root.mkdir(parents=True, exist_ok=True)
+    for i in range(files):
+        ext = rng.choice(EXTENSIONS)
+        (root / f"download_{i:05d}{ext}").write_bytes(rng.randbytes(rng.randint(256, 8192)))
+
+
+@pytest.mark.parametrize("files", [100, 1000])
+@pytest.mark.parametrize("by_content", [False, True], ids=["extension", "content"])
+def bench_organize_downloads(benchmark, tmp_path, files, by_content):
+    automator = Automator()
+    rounds = iter(range(1000))
+
+    def setup():
+        automator.downloads_path = str(tmp_path / f"round{next(rounds)}")
+        make_tree(tmp_path / os.path.basename(automator.downloads_path), files)
+        return (), {"by_content": by_content}
+
+    result = benchmark.pedantic(automator.organize_downloads, setup=setup, rounds=5)
+    assert result["status"] == "success"
@@ -0,0 +1,48 @@
+"""Response encoding cost for the /stats snapshot and /command replies."""
+import pytest
+
+import encoding
+
+ENCODERS = {
+    "stdlib": None,
+    "orjson": encoding.orjson,
+    "msgpack": encoding.msgpack,
+}
+
+
+@pytest.fixture
+def payloads(server):
+    return {"stats": server.collect_stats(), "command": server.process_command("who are you")}
+
+
+@pytest.fixture
+def encoders(server):
+    from flask.json.provider import DefaultJSONProvider
+
+    stdlib = DefaultJSONProvider(server.app)
+    return {
+        "stdlib": lambda p: stdlib.dumps(p, separators=(",", ":")).encode(),
+        "orjson": lambda p: encoding.orjson.dumps(p),
+        "msgpack": lambda p: encoding.msgpack.packb(p, use_bin_type=True),
+    }
+
+
+@pytest.mark.parametrize("payload", ["stats", "command"])
+@pytest.mark.parametrize("encoder", list(ENCODERS))
+def bench_encode(benchmark, payloads, encoders, payload, encoder):
+    if encoder != "stdlib" and ENCODERS[encoder] is None:
+        pytest.skip(f"{encoder} is not installed")
+    benchmark(encoders[encoder], payloads[payload])
+
+
+def bench_snapshot_reuse(benchmark, payloads):
+    snapshot = encoding.Snapshot(payloads["stats"])
+    body = snapshot.encode()
+    assert benchmark(snapshot.encode) is body
+
+
+def bench_stats_msgpack(benchmark, client):
+    if encoding.msgpack is None:
+        pytest.skip("msgpack is not installed")
+    response = benchmark(client.get, "/stats", headers={"Accept": "application/msgpack"})
+    assert response.headers["Content-Type"] == "application/msgpack"
@@ -0,0 +1,34 @@
+"""Conversation journal appends, per-session reads and startup reload."""
+import pytest
+
+from journal import ConversationJournal
+
+
+@pytest.fixture
+def journal(tmp_path):
+    journal = ConversationJournal(str(tmp_path / "journal.db"))
+    yield journal
+    journal.close()
+
+
+@pytest.fixture
+def filled(journal):
+    for i in range(20000):
+        journal.append(f"s{i % 200}", "user" if i % 2 == 0 else "ai", f"turn {i}")
+    journal.flush()
+    return journal
+
+
+def bench_append(benchmark, journal):
+    benchmark(journal.append, "default", "user", "what is the weather like")
+    assert journal.flush(timeout=10)
+
+
+def bench_recent(benchmark, filled):
+    turns = benchmark(filled.recent, "s7", 10)
+    assert len(turns) == 10 and turns[-1]["text"] == "turn 19807"
+
+
+def bench_load_recent(benchmark, filled):
+    histories = benchmark(filled.load_recent, 10)
+    assert len(histories) == 200 and all(len(turns) == 10 for turns in histories.values())
@@ -0,0 +1,13 @@
+"""Launcher resolution with the desktop and browser side effects stubbed."""
+import pytest
+
+from launcher import Launcher
+
+TARGETS = ["youtube", "vscode", "coding setup", "not installed anywhere"]
+
+
+@pytest.mark.parametrize("target", TARGETS)
+def bench_smart_open(benchmark, target):
+    launcher = Launcher()
+    result = benchmark(launcher.smart_open, target)
+    assert result["status"] in ("success", "error")
@@ -0,0 +1,68 @@
+"""MemoryCore reads and writes against a scratch SQLite file."""
+import itertools
+
+import pytest
+
+from memory import MemoryCore
+
+
+@pytest.fixture
+def memory(tmp_path):
+    return MemoryCore(db_path=str(tmp_path / "memory.db"))
+
+
+def bench_set_preference(benchmark, memory):
+    counter = itertools.count()
+    benchmark(lambda: memory.set_preference("name", f"Tony {next(counter)}"))
+
+
+def bench_get_preference(benchmark, memory):
+    memory.set_preference("name", "Tony")
+    benchmark(memory.get_preference, "name")
+
+
+def bench_add_task(benchmark, memory):
+    counter = itertools.count()
+    benchmark(lambda: memory.add_task(f"task {next(counter)}"))
+
+
+def bench_get_tasks(benchmark, memory):
+    for i in range(200):
+        memory.add_task(f"task {i}")
+    benchmark(memory.get_tasks)
+
+
+def bench_context(benchmark, memory):
+    def round_trip():
+        memory.set_context("last_topic", "quantum computing")
+        return memory.get_context("last_topic")
+
+    benchmark(round_trip)
+
+
+@pytest.fixture
+def notes(memory):
+    topics = [f"{thing} {detail}" for thing in "lab wifi battery project meeting dentist milk car garage door".split()
+              for detail in "code password alpha tuesday eggs keys spare blue friday upstairs".split()]
+    memory.add_notes([f"the {topics[i % len(topics)]} note {i} for week {i // 700}" for i in range(10000)])
+    return memory
+
+
+def bench_add_note(benchmark, memory):
+    counter = itertools.count()
+    benchmark(lambda: memory.add_note(f"the lab door code is {next(counter)}"))
+
+
+def bench_add_notes_batch(benchmark, memory):
+    batch = [f"note number {i} about the garage" for i in range(1000)]
+    benchmark(memory.add_notes, batch)
+
+
+def bench_recall_notes(benchmark, notes):
+    result = benchmark(notes.recall_notes, "what did i tell you about the dentist on tuesday")
+    assert result and "dentist" in result[0]["content"]
+
+
+def bench_search_notes_prefix(benchmark, notes):
+    result = benchmark(notes.search_notes_prefix, "pass")
+    assert result and "password" in result[0]["content"]
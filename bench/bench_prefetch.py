@@ -0,0 +1,34 @@
+"""Prefetch bookkeeping on the request path and cache lookups."""
+import itertools
+import threading
+
+from prefetch import PrefetchEngine, TTLCache
+
+
+def bench_after_command(benchmark):
+    engine = PrefetchEngine()
+    engine.register("weather", lambda arg: None)
+    sessions = itertools.cycle([f"s{i}" for i in range(100)])
+    intents = itertools.cycle(["time", "weather", "status", "search:black holes", None])
+    # Budget exhaustion keeps the executor quiet; this measures the bookkeeping
+    benchmark(lambda: engine.after_command(next(sessions), next(intents), ["weather"]))
+
+
+def bench_cache_hit(benchmark):
+    cache = TTLCache("bench", ttl=60)
+    cache.put("weather", {"status": "success"})
+    assert benchmark(cache.get, "weather") == {"status": "success"}
+
+
+def bench_learned_transition_is_prefetched(benchmark):
+    def run():
+        warmed = threading.Event()
+        engine = PrefetchEngine(min_observations=3)
+        engine.register("search", lambda query: warmed.set())
+        for session in ("a", "b", "c"):
+            engine.after_command(session, "search:black holes", [])
+            engine.after_command(session, "search:ada lovelace", [])
+        engine.after_command("d", "search:black holes", [])
+        return warmed.wait(1)
+
+    assert benchmark.pedantic(run, rounds=3)
@@ -0,0 +1,49 @@
+"""Knowledge-base lookup at scale."""
+import pytest
+
+from reasoning import ReasoningEngine
+
+SIZES = [25, 1000, 10000]
+
+QUERIES = [
+    "what is machine learning",
+    "define deep learning",
+    "what is a neural network",
+    "compare python and javascript",
+    "how does machine learning work",
+    "why is python popular",
+    "who won the world cup in 1998",
+]
+
+
+def grow(engine, size):
+    """Pad the knowledge base with synthetic topics up to `size` entries."""
+    for i in range(size - len(engine.knowledge_base)):
+        engine.knowledge_base[f"synthetic topic {i:05d}"] = f"Synthetic definition number {i}."
+    return engine
+
+
+@pytest.mark.parametrize("size", SIZES)
+def bench_answer(benchmark, size):
+    engine = grow(ReasoningEngine(), size)
+
+    def answer_all():
+        return [engine.answer(q)["status"] for q in QUERIES]
+
+    statuses = benchmark(answer_all)
+    assert statuses.count("success") >= 5
+
+
+@pytest.mark.parametrize("size", SIZES)
+def bench_miss(benchmark, size):
+    engine = grow(ReasoningEngine(), size)
+    result = benchmark(engine.answer, "who won the world cup in 1998")
+    assert result["status"] == "needs_search"
+
+
+@pytest.mark.parametrize("size", SIZES)
+def bench_semantic_query(benchmark, size):
+    engine = grow(ReasoningEngine(semantic=True), size)
+    engine.build_semantic_index()
+    result = benchmark(engine.semantic_answer, "what is a reusable block of code")
+    assert result and result["message"] == engine.knowledge_base["function"]
@@ -0,0 +1,45 @@
+"""Research text pipeline on recorded DDGS fixtures."""
+import pytest
+
+import stubs
+from research import Researcher
+
+QUERIES = [
+    "what is quantum computing",
+    "how to bake bread",
+    "who is ada lovelace",
+    "why is the sky blue",
+    "black holes",
+]
+
+
+@pytest.fixture
+def researcher():
+    researcher = Researcher()
+    # Entries expire at once, so every search runs the full pipeline
+    researcher.cache.ttl = 0
+    return researcher
+
+
+@pytest.mark.parametrize("query", QUERIES)
+def bench_search(benchmark, researcher, query):
+    result = benchmark(researcher.search, query)
+    assert result["status"] == "success"
+
+
+def bench_search_cached(benchmark):
+    researcher = Researcher()
+    researcher.search("black holes")
+    result = benchmark(researcher.search, "  Black   Holes ")
+    assert result["status"] == "success"
+
+
+def bench_interpret(benchmark, researcher):
+    results = stubs.load_results()["quantum computing"]
+    english = [r for r in results if researcher._is_english(r["body"] + r["title"])][:3]
+    benchmark(researcher._interpret_results, "what is quantum computing", english)
+
+
+def bench_sanitize(benchmark, researcher):
+    text = " ".join(r["body"] for results in stubs.load_results().values() for r in results)
+    benchmark(researcher._sanitize_text, text)
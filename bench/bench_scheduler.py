@@ -0,0 +1,63 @@
+"""Scheduler inserts into a large queue, dispatch of due jobs and reload after a restart."""
+import itertools
+import time
+
+import pytest
+
+from scheduler import Scheduler
+
+FUTURE = 10 * 86400
+
+
+def future_jobs(n):
+    now = time.time()
+    return [("noop", None, now + FUTURE + i, 0, None, None) for i in range(n)]
+
+
+@pytest.fixture
+def scheduler(tmp_path):
+    scheduler = Scheduler(str(tmp_path / "schedule.db"))
+    scheduler.register("noop", lambda payload: None)
+    scheduler.start()
+    yield scheduler
+    scheduler.stop()
+
+
+@pytest.fixture(scope="module")
+def filled_path(tmp_path_factory):
+    path = str(tmp_path_factory.mktemp("schedule") / "schedule.db")
+    scheduler = Scheduler(path)
+    scheduler.schedule_many(future_jobs(100000))
+    scheduler.stop()
+    return path
+
+
+def bench_schedule_into_100k(benchmark, scheduler):
+    scheduler.schedule_many(future_jobs(100000))
+    assert scheduler.wait_idle(timeout=30)
+    counter = itertools.count()
+    benchmark(lambda: scheduler.schedule("noop", {"n": next(counter)}, delay=FUTURE))
+
+
+def bench_schedule_many_1000(benchmark, scheduler):
+    benchmark(scheduler.schedule_many, future_jobs(1000))
+
+
+def bench_dispatch_1000_due(benchmark, scheduler):
+    def run():
+        scheduler.schedule_many([("noop", None, None, 0, None, None)] * 1000)
+        assert scheduler.wait_idle(timeout=30)
+
+    benchmark.pedantic(run, rounds=5)
+    assert scheduler.pending() == []
+
+
+def bench_restart_with_100k(benchmark, filled_path):
+    def restart():
+        scheduler = Scheduler(filled_path).start()
+        assert scheduler.wait_idle(timeout=30)
+        pending = scheduler.pending(limit=5)
+        scheduler.stop()
+        return pending
+
+    assert len(benchmark.pedantic(restart, rounds=3)) == 5
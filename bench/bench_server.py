@@ -0,0 +1,74 @@
+"""Command dispatch through the Flask test client."""
+
+# Representative mix: local intents, reasoning answers, searches and launches
+COMMAND_MIX = [
+    "hello",
+    "what is my name",
+    "who are you",
+    "status report",
+    "what is machine learning",
+    "difference between cpu and gpu",
+    "how does a neural network work",
+    "what is quantum computing",
+    "search for black holes",
+    "explain",
+    "weather today",
+    "open youtube",
+    "launch coding setup",
+    "add task review benchmarks",
+    "list tasks",
+    "remember that the lab door code is 4242",
+    "tell me a joke",
+    "thank you",
+    "ok",
+    "why is the sky blue",
+]
+
+
+def bench_command_mix(benchmark, client):
+    def run_mix():
+        for command in COMMAND_MIX:
+            response = client.post("/command", json={"command": command})
+            assert response.status_code == 200
+
+    benchmark(run_mix)
+
+
+def bench_local_intent(benchmark, client):
+    benchmark(client.post, "/command", json={"command": "who are you"})
+
+
+def bench_stats(benchmark, client):
+    benchmark(client.get, "/stats")
+
+
+def bench_dashboard(benchmark, client):
+    response = benchmark(client.get, "/", headers={"Accept-Encoding": "gzip"})
+    assert response.status_code == 200 and response.headers["Content-Encoding"] == "gzip"
+
+
+def bench_dashboard_not_modified(benchmark, client):
+    etag = client.get("/", headers={"Accept-Encoding": "gzip"}).headers["ETag"]
+    response = benchmark(client.get, "/", headers={"Accept-Encoding": "gzip", "If-None-Match": etag})
+    assert response.status_code == 304
+
+
+def bench_stream_local_intent(benchmark, client):
+    def stream():
+        # Closing the response hands its admission slot back, as a WSGI server does
+        with client.post("/command/stream", json={"command": "who are you"}) as response:
+            return response.get_data()
+
+    body = benchmark(stream)
+    assert body.endswith(b"}\n") and b'"done":true' in body
+
+
+def bench_stream_first_sentence(benchmark, client):
+    def first_sentence():
+        response = client.post("/command/stream", json={"command": "what is deep learning", "detail": False},
+                               buffered=False)
+        chunk = next(iter(response.response))
+        response.close()
+        return chunk
+
+    assert b'"index":0' in benchmark(first_sentence)
@@ -0,0 +1,115 @@
+"""Request coalescing for searches and weather under a burst of identical requests."""
+import threading
+
+import pytest
+
+import stubs
+from research import Researcher
+from singleflight import SingleFlight
+
+CONCURRENCY = 300
+
+
+def burst(fn, n=CONCURRENCY):
+    """Call fn from n threads released at the same instant; return their results."""
+    barrier = threading.Barrier(n)
+    results = [None] * n
+
+    def worker(i):
+        barrier.wait()
+        try:
+            results[i] = fn()
+        except Exception as e:
+            results[i] = e
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(n)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return results
+
+
+@pytest.fixture
+def slow_backend():
+    stubs.StubDDGS.latency = 0.2
+    yield stubs.StubDDGS
+    stubs.StubDDGS.latency = 0
+
+
+def bench_identical_searches_share_one_call(benchmark, slow_backend):
+    def run():
+        researcher = Researcher()
+        before = slow_backend.calls
+        results = burst(lambda: researcher.search("  What is Quantum   Computing "))
+        return slow_backend.calls - before, results
+
+    upstream_calls, results = benchmark.pedantic(run, rounds=3)
+    assert upstream_calls == 1
+    assert all(r["status"] == "success" for r in results)
+    # Callers get independent copies they can safely modify
+    assert len({id(r) for r in results}) == len(results)
+
+
+def bench_identical_weather_requests_share_one_call(benchmark, server, monkeypatch):
+    calls = []
+    release = threading.Event()
+
+    def fake_fetch():
+        calls.append(1)
+        release.wait(0.2)
+        return {"status": "success", "message": "Current weather in Stark Tower: 21°C, Partly cloudy."}
+
+    monkeypatch.setattr(server, "fetch_weather", fake_fetch)
+
+    def run():
+        calls.clear()
+        server.weather_cache.clear()
+        results = burst(server.get_weather)
+        return len(calls), results
+
+    upstream_calls, results = benchmark.pedantic(run, rounds=3)
+    assert upstream_calls == 1
+    assert all(r["status"] == "success" for r in results)
+
+
+def bench_errors_reach_every_waiter(benchmark):
+    flight = SingleFlight()
+
+    def failing():
+        threading.Event().wait(0.1)
+        raise ValueError("upstream down")
+
+    results = benchmark.pedantic(lambda: burst(lambda: flight.do("q", failing), n=50), rounds=1)
+    assert all(isinstance(r, ValueError) for r in results)
+    assert flight.in_flight() == 0
+
+
+def bench_waiters_time_out(benchmark):
+    flight = SingleFlight()
+    leader_started = threading.Event()
+
+    def slow():
+        leader_started.set()
+        threading.Event().wait(0.3)
+        return "late"
+
+    def run():
+        leader = threading.Thread(target=flight.do, args=("q", slow))
+        leader.start()
+        leader_started.wait()
+        try:
+            flight.do("q", slow, timeout=0.01)
+            outcome = None
+        except TimeoutError as e:
+            outcome = e
+        leader.join()
+        leader_started.clear()
+        return outcome
+
+    assert isinstance(benchmark.pedantic(run, rounds=1), TimeoutError)
+
+
+def bench_uncontended_overhead(benchmark):
+    flight = SingleFlight()
+    benchmark(flight.do, "q", len, "abc")
@@ -0,0 +1,94 @@
+"""State backends: in-process and Redis protocol (against the in-memory stand-in server), pooled and pipelined."""
+import pytest
+
+from memory import MemoryCore
+from prefetch import TTLCache
+import resp_server
+from state import InMemoryBackend, backend_from_url
+
+KEYS = [f"key{i}" for i in range(100)]
+
+
+@pytest.fixture(scope="module")
+def state_url():
+    process, url = resp_server.spawn()
+    yield url
+    process.terminate()
+    process.wait()
+
+
+@pytest.fixture
+def redis(state_url):
+    backend = backend_from_url(state_url)
+    yield backend
+    backend.pool.execute([("FLUSHDB",)])
+    backend.close()
+
+
+def bench_memory_get(benchmark):
+    backend = InMemoryBackend()
+    backend.set("context:last_topic", "quantum computing")
+    assert benchmark(backend.get, "context:last_topic") == "quantum computing"
+
+
+def bench_memory_history_append(benchmark):
+    backend = InMemoryBackend()
+    # Start full, so every round trims and the check holds with --benchmark-disable too
+    for _ in range(10):
+        backend.append("history:default", {"role": "user", "text": "hello"}, max_len=10)
+    benchmark(backend.append, "history:default", {"role": "user", "text": "hello"}, max_len=10)
+    assert len(backend.get_list("history:default")) == 10
+
+
+def bench_redis_get(benchmark, redis):
+    redis.set("context:last_topic", "quantum computing")
+    assert benchmark(redis.get, "context:last_topic") == "quantum computing"
+
+
+def bench_redis_set_each(benchmark, redis):
+    def set_each():
+        for key in KEYS:
+            redis.set(key, {"value": key}, ttl=60)
+
+    benchmark(set_each)
+
+
+def bench_redis_set_many(benchmark, redis):
+    # Same 100 writes as bench_redis_set_each, in one pipeline
+    benchmark(redis.set_many, {key: {"value": key} for key in KEYS}, ttl=60)
+    assert redis.get_many(KEYS[:2]) == [{"value": "key0"}, {"value": "key1"}]
+
+
+def bench_redis_get_many(benchmark, redis):
+    redis.set_many({key: {"value": key} for key in KEYS})
+    values = benchmark(redis.get_many, KEYS)
+    assert values[-1] == {"value": "key99"}
+
+
+def bench_redis_history_append(benchmark, redis):
+    for _ in range(10):
+        redis.append("history:default", {"role": "user", "text": "hello"}, max_len=10)
+    benchmark(redis.append, "history:default", {"role": "user", "text": "hello"}, max_len=10)
+    assert len(redis.get_list("history:default")) == 10
+
+
+def bench_shared_cache_other_node(benchmark, redis):
+    # Node A fetched the result; node B finds it in the shared backend on its first lookup
+    node_a = TTLCache("search", 300, shared=redis)
+    node_b = TTLCache("search", 300, shared=redis)
+    node_a.put("quantum computing", {"status": "success", "message": "Quantum computing uses qubits."}, 0.4)
+
+    def lookup():
+        node_b.clear()
+        return node_b.get("quantum computing")
+
+    assert benchmark(lookup)["status"] == "success"
+
+
+def bench_shared_preference(benchmark, redis, tmp_path):
+    node_a = MemoryCore(db_path=str(tmp_path / "a.db"), state=redis)
+    node_b = MemoryCore(db_path=str(tmp_path / "b.db"), state=redis)
+    node_a.set_preference("name", "Tony")
+    node_a.set_context("last_topic", "quantum computing")
+    assert node_b.get_context("last_topic") == "quantum computing"
+    assert benchmark(node_b.get_preference, "name") == "Tony"
@@ -0,0 +1,23 @@
+"""Extractive summarization over recorded search snippets."""
+import pytest
+
+import stubs
+from research import Researcher
+
+
+@pytest.fixture(scope="module")
+def snippets():
+    researcher = Researcher()
+    bodies = [r["body"] for results in stubs.load_results().values() for r in results]
+    return [researcher._sanitize_text(b) for b in bodies if researcher._is_english(b)]
+
+
+@pytest.mark.parametrize("count", [10, 25, 50])
+def bench_summarize(benchmark, snippets, count):
+    researcher = Researcher()
+    # Recycle the fixtures to reach larger result sets; repeats exercise deduplication
+    batch = (snippets * (count // len(snippets) + 1))[:count]
+    summary = benchmark(researcher.summarize, batch, "what is quantum computing", 600)
+    assert 0 < len(summary) <= 600
+    sentences = summary.split(". ")
+    assert len(sentences) == len(set(sentences))
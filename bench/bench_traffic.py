@@ -0,0 +1,48 @@
+"""Traffic recording overhead on /command, reading a log back and an in-process replay."""
+import pytest
+
+import replay
+from bench_server import COMMAND_MIX
+from traffic import TrafficRecorder, read_log
+
+
+@pytest.fixture
+def recorder(server, tmp_path):
+    recorder = TrafficRecorder(str(tmp_path / "traffic.jsonl.gz"))
+    # The shared app has served requests already, so Flask refuses install(); hook in directly
+    server.app.before_request_funcs.setdefault(None, []).append(recorder._begin)
+    server.app.after_request_funcs.setdefault(None, []).append(recorder._finish)
+    yield recorder
+    recorder.close()
+    server.app.before_request_funcs[None].remove(recorder._begin)
+    server.app.after_request_funcs[None].remove(recorder._finish)
+
+
+@pytest.fixture
+def recorded(client, recorder):
+    for i in range(10):
+        for command in COMMAND_MIX:
+            client.post("/command", json={"command": command, "session": f"s{i}"})
+        client.get("/stats")
+    assert recorder.flush(timeout=10)
+    return recorder.path
+
+
+def bench_local_intent_recorded(benchmark, client, recorder):
+    benchmark(client.post, "/command", json={"command": "who are you"})
+    assert recorder.flush(timeout=10)
+
+
+def bench_read_log_210(benchmark, recorded):
+    assert len(benchmark(read_log, recorded)) == 210
+
+
+def bench_replay_210(benchmark, client, recorded):
+    entries = read_log(recorded)
+
+    def run():
+        results, _ = replay.replay(client, entries, speed=0, workers=4)
+        return results
+
+    results = benchmark.pedantic(run, rounds=3)
+    assert all(status == 200 for status, *_ in results)
@@ -0,0 +1,25 @@
+"""Worker-process round trips and batched dispatch of answer stages."""
+import pytest
+
+import stubs
+from workers import CpuPool
+
+RESULTS = stubs.load_results()["quantum computing"]
+
+
+@pytest.fixture(scope="module", params=[1, 32], ids=["batch1", "batch32"])
+def pool(request):
+    pool = CpuPool(1, batch_size=request.param)
+    yield pool
+    pool.close()
+
+
+def bench_pool_call(benchmark, pool):
+    result = benchmark(pool.call, "reasoning", "answer", "what is python", None)
+    assert result["status"] == "success"
+
+
+def bench_pool_map_compose_256(benchmark, pool):
+    calls = [("what is quantum computing", RESULTS)] * 256
+    results = benchmark.pedantic(pool.map, ("research", "compose", calls), rounds=5)
+    assert len(results) == 256 and results[0]["status"] == "success"
@@ -0,0 +1,75 @@
+"""
+Compare a pytest-benchmark JSON report against the stored baseline.
+
+    cd bench
+    pytest --benchmark-json=results.json
+    python compare.py results.json                 # fails on regressions
+    python compare.py results.json --update        # accept results as the new baseline
+
+The baseline keeps only the median (seconds) per benchmark, so it stays small and
+reviewable. Medians are machine specific: refresh it with --update on the machine
+that runs the comparison.
+"""
+import argparse
+import json
+import os
+import sys
+
+BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline.json")
+
+
+def load_medians(report_path):
+    with open(report_path, encoding="utf-8") as f:
+        report = json.load(f)
+    return {b["fullname"].split("::", 1)[-1]: b["stats"]["median"] for b in report["benchmarks"]}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare benchmark results with the stored baseline.")
+    parser.add_argument("report", help="JSON written by pytest --benchmark-json")
+    parser.add_argument("--baseline", default=BASELINE)
+    parser.add_argument("--threshold", type=float, default=1.25,
+                        help="fail when a median is this many times slower than baseline (default 1.25)")
+    parser.add_argument("--update", action="store_true", help="write the report medians as the new baseline")
+    args = parser.parse_args()
+
+    current = load_medians(args.report)
+
+    if args.update:
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump(dict(sorted(current.items())), f, indent=2)
+            f.write("\n")
+        print(f"Baseline updated with {len(current)} benchmarks.")
+        return 0
+
+    with open(args.baseline, encoding="utf-8") as f:
+        baseline = json.load(f)
+
+    regressions = 0
+    width = max(len(name) for name in current) if current else 0
+    for name in sorted(current):
+        now = current[name]
+        before = baseline.get(name)
+        if before is None:
+            print(f"{name:<{width}}  {now * 1e6:12.1f} us   (new)")
+            continue
+        ratio = now / before if before else float("inf")
+        flag = ""
+        if ratio > args.threshold:
+            flag = "  REGRESSION"
+            regressions += 1
+        elif ratio < 1 / args.threshold:
+            flag = "  improved"
+        print(f"{name:<{width}}  {now * 1e6:12.1f} us   {ratio:6.2f}x{flag}")
+
+    for name in sorted(set(baseline) - set(current)):
+        print(f"{name:<{width}}  missing from this run")
+
+    if regressions:
+        print(f"\n{regressions} benchmark(s) slower than {args.threshold}x baseline.")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,43 @@
+import os
+import random
+import sys
+
+import pytest
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO = os.path.dirname(BENCH_DIR)
+sys.path.insert(0, REPO)
+sys.path.insert(0, BENCH_DIR)
+
+import stubs
+
+
+@pytest.fixture(scope="session", autouse=True)
+def offline(tmp_path_factory):
+    """Stub the network/desktop side effects and keep the SQLite files out of the repo."""
+    workdir = tmp_path_factory.mktemp("jarvis")
+    previous = os.getcwd()
+    os.chdir(workdir)
+    os.environ.setdefault("JARVIS_LOG_LEVEL", "WARNING")
+    # Every benchmark request comes from the same loopback client
+    os.environ.setdefault("JARVIS_RATE_LIMIT", "0")
+    stubs.install()
+    yield workdir
+    os.chdir(previous)
+
+
+@pytest.fixture(autouse=True)
+def seeded():
+    # Personality replies are random; fix the seed so every run takes the same branches
+    random.seed(1234)
+
+
+@pytest.fixture(scope="session")
+def server(offline):
+    import server
+    return server
+
+
+@pytest.fixture(scope="session")
+def client(server):
+    return server.app.test_client()
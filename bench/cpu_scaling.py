@@ -0,0 +1,99 @@
+"""
+Throughput of the CPU-bound answer stages on threads against worker processes.
+
+--clients threads each send a share of --queries through the two stages that
+workers.py offloads. One is composing a search answer from recorded DDGS
+results (English filter, sanitizing, extractive summary). The other is a
+reasoning answer that falls through to the semantic index. Each worker count
+in --workers runs the same load through a CpuPool; 0 runs it on the client
+threads, which is what the server does without JARVIS_CPU_WORKERS. With --batch 1
+every call is its own message, which shows what batching saves in IPC.
+
+    python bench/cpu_scaling.py --queries 2000 --clients 16 --workers 0,1,2,4
+"""
+import argparse
+import os
+import sys
+import threading
+import time
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(BENCH_DIR))
+sys.path.insert(0, BENCH_DIR)
+os.environ.setdefault("JARVIS_LOG_LEVEL", "WARNING")
+
+import stubs
+from workers import CpuPool, default_state
+
+PARAPHRASES = [
+    "tell me about graphics cards for training models",
+    "what does a relational query language do",
+    "explain storing data in organized tables",
+    "what is the science of living things",
+]
+
+
+def workload(queries):
+    """(target, method, args) calls mixing search composition and semantic reasoning."""
+    results = stubs.load_results()
+    topics = list(results)
+    calls = []
+    for i in range(queries):
+        if i % 2 == 0:
+            topic = topics[i // 2 % len(topics)]
+            calls.append(("research", "compose", (f"what is {topic}", results[topic])))
+        else:
+            calls.append(("reasoning", "answer", (PARAPHRASES[i // 2 % len(PARAPHRASES)], None)))
+    return calls
+
+
+def run(calls, clients, execute):
+    shares = [calls[i::clients] for i in range(clients)]
+    outputs = [None] * clients
+
+    def client(index):
+        outputs[index] = [execute(target, method, args) for target, method, args in shares[index]]
+
+    threads = [threading.Thread(target=client, args=(i,)) for i in range(clients)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return time.perf_counter() - start, outputs
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--queries", type=int, default=2000)
+    parser.add_argument("--clients", type=int, default=16)
+    parser.add_argument("--workers", default="0,1,2,4", help="comma-separated process counts; 0 = threads only")
+    parser.add_argument("--batch", type=int, default=32, help="most calls per worker message")
+    args = parser.parse_args()
+
+    calls = workload(args.queries)
+    inline = default_state()
+    print(f"{args.queries} calls from {args.clients} client threads on {os.cpu_count()} CPUs, batch {args.batch}")
+    baseline = expected = None
+    for processes in [int(n) for n in args.workers.split(",")]:
+        if processes == 0:
+            elapsed, outputs = run(calls, args.clients,
+                                   lambda target, method, call_args: getattr(inline[target], method)(*call_args))
+            label = "threads"
+        else:
+            pool = CpuPool(processes, batch_size=args.batch)
+            # One warm-up call per worker so page faults after fork are not timed
+            pool.map("reasoning", "answer", [(PARAPHRASES[0], None)] * processes)
+            elapsed, outputs = run(calls, args.clients,
+                                   lambda target, method, call_args: pool.call(target, method, *call_args))
+            pool.close()
+            label = f"{processes} worker{'s' if processes > 1 else ''}"
+        rate = args.queries / elapsed
+        baseline = baseline or rate
+        expected = expected or outputs
+        print(f"  {label:<10} {elapsed:6.2f} s  {rate:8.0f} calls/s  {rate / baseline:5.2f}x  "
+              f"same answers: {outputs == expected}")
+
+
+if __name__ == "__main__":
+    main()
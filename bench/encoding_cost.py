@@ -0,0 +1,76 @@
+"""
+Serialization cost and payload size of the API responses per encoder.
+
+Encodes a /stats snapshot, a short /command reply and a search reply with
+sources using the stdlib JSON provider Flask uses by default, orjson, msgpack
+(when installed) and a pre-encoded Snapshot, plus end-to-end GET /stats.
+
+    python bench/encoding_cost.py --repeat 20000
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+import timeit
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(BENCH_DIR))
+sys.path.insert(0, BENCH_DIR)
+
+import stubs
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--repeat", type=int, default=20000)
+    args = parser.parse_args()
+
+    os.environ.setdefault("JARVIS_LOG_LEVEL", "WARNING")
+    os.environ.setdefault("JARVIS_RATE_LIMIT", "0")
+    os.chdir(tempfile.mkdtemp(prefix="jarvis-encoding-"))
+    stubs.install()
+
+    import encoding
+    import server
+    from flask.json.provider import DefaultJSONProvider
+
+    stdlib = DefaultJSONProvider(server.app)
+    payloads = {
+        "stats": server.collect_stats(),
+        "command": server.process_command("who are you"),
+        "search": server.brain.search("what is quantum computing"),
+    }
+
+    encoders = [("stdlib json", lambda p: stdlib.dumps(p, separators=(",", ":")).encode())]
+    if encoding.orjson is not None:
+        encoders.append(("orjson", lambda p: encoding.orjson.dumps(p)))
+    if encoding.msgpack is not None:
+        encoders.append(("msgpack", lambda p: encoding.msgpack.packb(p, use_bin_type=True)))
+
+    print(f"{'payload':<8} {'encoder':<18} {'us/encode':>10} {'bytes':>7}")
+    with server.app.app_context():
+        for name, payload in payloads.items():
+            for label, encode in encoders:
+                seconds = timeit.timeit(lambda: encode(payload), number=args.repeat) / args.repeat
+                print(f"{name:<8} {label:<18} {seconds * 1e6:10.2f} {len(encode(payload)):7d}")
+            snapshot = encoding.Snapshot(payload)
+            snapshot.encode()
+            seconds = timeit.timeit(snapshot.encode, number=args.repeat) / args.repeat
+            print(f"{name:<8} {'snapshot (reused)':<18} {seconds * 1e6:10.2f} {len(snapshot.encode()):7d}")
+
+    # Whole request through Flask, with and without a fresh snapshot each time
+    client = server.app.test_client()
+    repeat = max(1, args.repeat // 10)
+    for label, ttl in (("GET /stats, new snapshot", 0), ("GET /stats, shared snapshot", 60)):
+        server.stats_cache.ttl = ttl
+        server.stats_cache.clear()
+        seconds = timeit.timeit(lambda: client.get("/stats"), number=repeat) / repeat
+        print(f"{label:<28} {seconds * 1e6:8.1f} us/request")
+
+    sizes = {name: len(json.dumps(p)) for name, p in payloads.items()}
+    print("stdlib json.dumps default separators, bytes:", sizes)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""
+Write throughput and caller latency of the conversation journal.
+
+Several threads append turns as fast as they can (like concurrent /command
+requests); the script reports how long append() holds the caller, how fast the
+background writer commits, and the cost of compaction and of reloading the last
+turns of every session.
+
+    python bench/journal_throughput.py --turns 200000 --threads 8 --sessions 1000
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+os.environ.setdefault("JARVIS_LOG_LEVEL", "WARNING")
+
+from journal import ConversationJournal
+
+PHRASES = [
+    "what is the weather like", "open spotify", "remember that the lab door code is 4242",
+    "Current weather in Stark Tower: 21°C, Partly cloudy.", "At your service, Boss.",
+    "search for quantum computing", "Quantum computing is a type of computation that harnesses quantum mechanics.",
+]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--turns", type=int, default=200000)
+    parser.add_argument("--threads", type=int, default=8)
+    parser.add_argument("--sessions", type=int, default=1000)
+    parser.add_argument("--keep", type=int, default=100000, help="max_turns used for the compaction pass")
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    path = os.path.join(tempfile.mkdtemp(prefix="jarvis-journal-"), "journal.db")
+    journal = ConversationJournal(path, max_age_days=0, max_turns=0)
+
+    per_thread = args.turns // args.threads
+    latencies = [[] for _ in range(args.threads)]
+    barrier = threading.Barrier(args.threads + 1)
+
+    def worker(i):
+        rng = random.Random(args.seed + i)
+        record = latencies[i].append
+        barrier.wait()
+        for n in range(per_thread):
+            text = rng.choice(PHRASES)
+            start = time.perf_counter()
+            journal.append(f"s{rng.randrange(args.sessions)}", "user" if n % 2 == 0 else "ai", text)
+            record(time.perf_counter() - start)
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(args.threads)]
+    for t in threads:
+        t.start()
+    barrier.wait()
+    start = time.perf_counter()
+    for t in threads:
+        t.join()
+    appended = time.perf_counter() - start
+    journal.flush()
+    committed = time.perf_counter() - start
+
+    total = per_thread * args.threads
+    samples = sorted(x for thread in latencies for x in thread)
+    p50 = samples[len(samples) // 2] * 1e6
+    p99 = samples[int(len(samples) * 0.99) - 1] * 1e6
+    print(f"{total} turns from {args.threads} threads: append p50 {p50:.1f} us, p99 {p99:.1f} us")
+    print(f"Callers done after {appended:.2f} s; all turns committed after {committed:.2f} s "
+          f"({total / committed:,.0f} turns/s); database {os.path.getsize(path) / 2 ** 20:.1f} MiB")
+
+    start = time.perf_counter()
+    histories = journal.load_recent(10)
+    print(f"load_recent(10) for {len(histories)} sessions in {(time.perf_counter() - start) * 1000:.1f} ms")
+
+    start = time.perf_counter()
+    for i in range(1000):
+        journal.recent(f"s{i % args.sessions}", 10)
+    print(f"recent(session, 10): {(time.perf_counter() - start):.3f} ms per call")
+
+    journal.max_turns = args.keep
+    start = time.perf_counter()
+    removed = journal.compact()
+    print(f"Compaction to {args.keep} turns removed {removed} in {time.perf_counter() - start:.2f} s; "
+          f"database {os.path.getsize(path) / 2 ** 20:.1f} MiB")
+    journal.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,154 @@
+"""
+Local load generator for admission control.
+
+Serves the app over HTTP behind a fixed number of worker slots (like a
+production WSGI server), with the search backend stubbed to a slow network call.
+Many clients hammer slow search commands while dashboard clients poll /stats
+once a second and send quick local commands. Reports status codes and latency
+per class, and the admission counters from /metrics.
+
+    python bench/load_generator.py --seconds 10 --searchers 40 --workers 16
+    python bench/load_generator.py --no-admission       # the same load without it
+"""
+import argparse
+import http.client
+import json
+import logging
+import os
+import sys
+import tempfile
+import threading
+import time
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(BENCH_DIR))
+sys.path.insert(0, BENCH_DIR)
+
+import stubs
+
+
+def limit_workers(app, workers):
+    """WSGI wrapper that lets at most `workers` requests run at once."""
+    slots = threading.BoundedSemaphore(workers)
+
+    def wsgi(environ, start_response):
+        with slots:
+            return list(app(environ, start_response))
+
+    return wsgi
+
+
+class Recorder:
+    def __init__(self):
+        self.samples = {}
+        self.lock = threading.Lock()
+
+    def add(self, kind, status, seconds):
+        with self.lock:
+            self.samples.setdefault(kind, []).append((status, seconds))
+
+    def report(self):
+        for kind, samples in sorted(self.samples.items()):
+            codes = {}
+            for status, _ in samples:
+                codes[status] = codes.get(status, 0) + 1
+            ok = sorted(seconds for status, seconds in samples if status == 200)
+            line = f"{kind:<8} {len(samples):6d} requests  " + "  ".join(
+                f"{code}: {count}" for code, count in sorted(codes.items(), key=lambda c: str(c[0])))
+            if ok:
+                line += (f"   200s p50 {ok[len(ok) // 2] * 1000:7.1f} ms"
+                         f"  p99 {ok[max(0, int(len(ok) * 0.99) - 1)] * 1000:7.1f} ms")
+            print(line)
+
+
+def call(port, method, path, body=None, client_id="load"):
+    conn = http.client.HTTPConnection("127.0.0.1", port, timeout=30)
+    headers = {"X-Jarvis-Client": client_id}
+    if body is not None:
+        headers["Content-Type"] = "application/json"
+        body = json.dumps(body)
+    try:
+        conn.request(method, path, body=body, headers=headers)
+        response = conn.getresponse()
+        response.read()
+        return response.status
+    except OSError:
+        return "error"
+    finally:
+        conn.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--seconds", type=float, default=10)
+    parser.add_argument("--searchers", type=int, default=40, help="clients sending slow search commands")
+    parser.add_argument("--pollers", type=int, default=4, help="dashboard clients polling /stats at 1 Hz")
+    parser.add_argument("--workers", type=int, default=16, help="concurrent requests the server can run")
+    parser.add_argument("--search-ms", type=float, default=500)
+    parser.add_argument("--no-admission", action="store_true")
+    args = parser.parse_args()
+
+    os.environ.setdefault("JARVIS_LOG_LEVEL", "WARNING")
+    os.environ["JARVIS_CLIENT_HEADER"] = "X-Jarvis-Client"
+    if args.no_admission:
+        os.environ["JARVIS_ADMISSION"] = "0"
+    os.chdir(tempfile.mkdtemp(prefix="jarvis-load-"))
+    stubs.install()
+    stubs.StubDDGS.latency = args.search_ms / 1000
+
+    logging.getLogger("werkzeug").setLevel(logging.ERROR)
+    from werkzeug.serving import make_server
+    import server
+
+    httpd = make_server("127.0.0.1", 0, limit_workers(server.app, args.workers), threaded=True)
+    port = httpd.server_port
+    threading.Thread(target=httpd.serve_forever, daemon=True).start()
+
+    recorder = Recorder()
+    deadline = time.monotonic() + args.seconds
+
+    def searcher(i):
+        n = 0
+        while time.monotonic() < deadline:
+            # Distinct queries so request coalescing does not hide the load
+            body = {"command": f"search for quantum computing {i} {n}", "session": f"search-{i}"}
+            start = time.perf_counter()
+            status = call(port, "POST", "/command", body, client_id=f"searcher-{i}")
+            recorder.add("search", status, time.perf_counter() - start)
+            n += 1
+            if status != 200:
+                time.sleep(0.05)
+
+    def poller(i):
+        while time.monotonic() < deadline:
+            tick = time.monotonic()
+            start = time.perf_counter()
+            recorder.add("stats", call(port, "GET", "/stats", client_id=f"dashboard-{i}"),
+                         time.perf_counter() - start)
+            start = time.perf_counter()
+            recorder.add("local", call(port, "POST", "/command", {"command": "who are you", "session": f"dash-{i}"},
+                                       client_id=f"dashboard-{i}"), time.perf_counter() - start)
+            time.sleep(max(0.0, 1.0 - (time.monotonic() - tick)))
+
+    threads = [threading.Thread(target=searcher, args=(i,)) for i in range(args.searchers)]
+    threads += [threading.Thread(target=poller, args=(i,)) for i in range(args.pollers)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    mode = "without" if args.no_admission else "with"
+    print(f"{args.seconds:.0f} s {mode} admission control: {args.searchers} searchers, {args.pollers} pollers, "
+          f"{args.workers} workers, search {args.search_ms:.0f} ms")
+    recorder.report()
+
+    conn = http.client.HTTPConnection("127.0.0.1", port)
+    conn.request("GET", "/metrics")
+    for line in conn.getresponse().read().decode().splitlines():
+        if line.startswith("jarvis_admission_rejected_total"):
+            print(line)
+    httpd.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+"""
+Insert throughput and query latency of the full-text notes store.
+
+Fills a scratch database with synthetic notes (1M by default) in batches, spread
+over the past year, then times ranked recall, prefix search, time-range recall and
+listing recent notes.
+
+    python bench/notes_fts.py --notes 1000000
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from memory import MemoryCore
+
+YEAR = 365 * 86400
+
+
+def pseudo_word(rng):
+    return "".join(rng.choice("bcdfghklmnprstvz") + rng.choice("aeiou") for _ in range(rng.randint(2, 4)))
+
+
+def make_vocabulary(size, seed):
+    rng = random.Random(seed)
+    words = set()
+    while len(words) < size:
+        words.add(pseudo_word(rng))
+    return sorted(words)
+
+
+def generate(vocabulary, count, seed, now):
+    """Notes of 6-20 words with Zipf-like word frequencies."""
+    rng = random.Random(seed)
+    size = len(vocabulary)
+    for _ in range(count):
+        # Log-uniform ranks: word r is drawn with probability ~ 1/r
+        words = [vocabulary[int(size ** rng.random()) - 1] for _ in range(rng.randint(6, 20))]
+        yield " ".join(words), now - rng.random() * YEAR
+
+
+def percentiles(latencies):
+    latencies = sorted(latencies)
+    return (latencies[len(latencies) // 2] * 1000,
+            latencies[max(0, int(len(latencies) * 0.99) - 1)] * 1000)
+
+
+def measure(name, fn, queries):
+    latencies = []
+    matched = 0
+    for query in queries:
+        start = time.perf_counter()
+        matched += len(fn(query))
+        latencies.append(time.perf_counter() - start)
+    p50, p99 = percentiles(latencies)
+    print(f"{name:<22} p50 {p50:7.2f} ms  p99 {p99:7.2f} ms  ({matched / len(queries):.1f} results/query)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--notes", type=int, default=1000000)
+    parser.add_argument("--batch", type=int, default=10000)
+    parser.add_argument("--vocabulary", type=int, default=20000)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--db", help="database path (default: a temporary file)")
+    args = parser.parse_args()
+
+    db_path = args.db or os.path.join(tempfile.mkdtemp(), "notes.db")
+    memory = MemoryCore(db_path)
+    vocabulary = make_vocabulary(args.vocabulary, args.seed)
+    now = time.time()
+
+    notes = generate(vocabulary, args.notes, args.seed, now)
+    elapsed = 0.0
+    inserted = 0
+    while inserted < args.notes:
+        batch = [next(notes) for _ in range(min(args.batch, args.notes - inserted))]
+        start = time.perf_counter()
+        memory.add_notes(batch)
+        elapsed += time.perf_counter() - start
+        inserted += len(batch)
+    print(f"Inserted {inserted} notes in {elapsed:.1f} s ({inserted / elapsed:,.0f} notes/s, "
+          f"batches of {args.batch}); database {os.path.getsize(db_path) / 2 ** 20:.0f} MiB")
+
+    # Queries use the long tail of the vocabulary, like real recall topics
+    rng = random.Random(args.seed + 1)
+    tail = vocabulary[len(vocabulary) // 10:]
+    topics = [" ".join(rng.sample(tail, rng.randint(1, 3))) for _ in range(args.queries)]
+    prefixes = [rng.choice(tail)[:4] for _ in range(args.queries)]
+
+    measure("single note insert", lambda q: [memory.add_note(q)], topics[:20])
+    measure("ranked recall", lambda q: memory.recall_notes(q), topics)
+    measure("recall, last 30 days", lambda q: memory.recall_notes(q, since=now - 30 * 86400), topics)
+    measure("prefix search", lambda q: memory.search_notes_prefix(q), prefixes)
+    measure("recent notes, 7 days", lambda q: memory.list_notes(since=now - 7 * 86400), topics[:20])
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+"""
+User-visible latency with and without speculative prefetch.
+
+Replays scripted sessions (time then weather, status then a diagnostic scan, and
+search pairs that only learned transitions can anticipate) with a pause between
+commands, against stubbed network backends. Caches are cleared at the start of
+every session so each one starts cold, as if the TTLs had expired.
+
+    python bench/prefetch_replay.py --sessions 40 --think-ms 600
+"""
+import argparse
+import os
+import random
+import re
+import statistics
+import sys
+import tempfile
+import time
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(BENCH_DIR))
+sys.path.insert(0, BENCH_DIR)
+
+import stubs
+
+SCRIPTS = [
+    ["what time is it", "what's the weather"],
+    ["system status", "run a diagnostic scan"],
+    ["search for black holes", "search for ada lovelace"],
+    ["search for quantum computing", "search for how to bake bread"],
+    ["hello", "who are you"],
+]
+
+
+def metric(text, name, labels):
+    pattern = re.escape(name) + r"\{" + re.escape(labels) + r"\} ([0-9.e+-]+)"
+    match = re.search(pattern, text)
+    return float(match.group(1)) if match else 0.0
+
+
+def replay(server, sessions, think):
+    latencies = []
+    for session, script in enumerate(sessions):
+        for cache in (server.weather_cache, server.diagnostic_cache, server.stats_cache, server.brain.cache):
+            cache.clear()
+        for cmd in script:
+            start = time.perf_counter()
+            server.process_command(cmd, f"replay-{id(sessions)}-{session}")
+            latencies.append(time.perf_counter() - start)
+            time.sleep(think)
+    return latencies
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sessions", type=int, default=40)
+    parser.add_argument("--think-ms", type=float, default=600)
+    parser.add_argument("--search-ms", type=float, default=300)
+    parser.add_argument("--weather-ms", type=float, default=200)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    os.environ.setdefault("JARVIS_LOG_LEVEL", "WARNING")
+    os.chdir(tempfile.mkdtemp(prefix="jarvis-prefetch-"))
+    stubs.install()
+    stubs.StubDDGS.latency = args.search_ms / 1000
+    stubs.weather_latency = args.weather_ms / 1000
+
+    import server
+    from metrics import REGISTRY
+
+    rng = random.Random(args.seed)
+    sessions = [rng.choice(SCRIPTS) for _ in range(args.sessions)]
+    think = args.think_ms / 1000
+
+    prefetcher = server.prefetcher
+    server.prefetcher = None
+    baseline = replay(server, sessions, think)
+
+    server.prefetcher = prefetcher
+    prefetched = replay(server, sessions, think)
+
+    for name, latencies in (("no prefetch", baseline), ("prefetch", prefetched)):
+        print(f"{name:<12} {len(latencies)} commands  mean {statistics.mean(latencies) * 1000:7.1f} ms  "
+              f"p50 {statistics.median(latencies) * 1000:6.1f} ms  total {sum(latencies):6.2f} s")
+
+    text = REGISTRY.render()
+    for cache in ("weather", "diagnostic", "search"):
+        filled = metric(text, "jarvis_prefetch_filled_total", f'cache="{cache}"')
+        used = metric(text, "jarvis_prefetch_used_total", f'cache="{cache}"')
+        saved = metric(text, "jarvis_prefetch_saved_seconds_total", f'cache="{cache}"')
+        rate = used / filled if filled else 0.0
+        print(f"{cache:<11} prefetched {filled:4.0f}  used {used:4.0f}  hit rate {rate:6.1%}  saved {saved:6.2f} s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,193 @@
+"""
+Replay recorded traffic against this build.
+
+Reads a log written with JARVIS_TRAFFIC_LOG (see traffic.py) and sends every
+request to the Flask app in-process at its recorded offset, divided by --speed
+(0 sends as fast as the workers allow). DuckDuckGo, wttr.in and the launcher are
+replaced by the deterministic stubs, each run starts from empty databases, and
+a session's requests are never reordered. Reports throughput, latency
+percentiles per endpoint and how far dispatch fell behind the recorded
+schedule, then diffs each JSON response against the one in the log, or against
+a run saved earlier with --save, and exits 1 if any differ.
+
+    JARVIS_TRAFFIC_LOG=traffic.jsonl.gz python server.py         # record
+    python bench/replay.py traffic.jsonl.gz --speed 4 --save old.jsonl.gz
+    python bench/replay.py traffic.jsonl.gz --speed 0 --compare old.jsonl.gz
+"""
+import argparse
+import difflib
+import gzip
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(BENCH_DIR))
+sys.path.insert(0, BENCH_DIR)
+
+import stubs
+
+# Responses that change from one moment to the next
+UNDIFFED_PATHS = ("/stats",)
+
+
+def percentile(sorted_values, q):
+    return sorted_values[min(len(sorted_values) - 1, int(len(sorted_values) * q))]
+
+
+def strip(value, ignore):
+    if isinstance(value, dict):
+        return {k: strip(v, ignore) for k, v in value.items() if k not in ignore}
+    if isinstance(value, list):
+        return [strip(v, ignore) for v in value]
+    return value
+
+
+def replay(client, entries, speed, workers):
+    """Send entries in order; returns a list of (status, seconds, response, lateness) per entry."""
+    results = [None] * len(entries)
+    previous = {}
+    pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="replay")
+
+    def send(index, entry, before, due):
+        if before is not None:
+            # Same session: wait for its previous request, as a real client would
+            before.result()
+        lateness = max(0.0, time.perf_counter() - due) if due is not None else 0.0
+        start = time.perf_counter()
+        if entry["method"] == "GET":
+            response = client.get(entry["path"], headers=entry.get("headers") or {})
+        else:
+            response = client.open(entry["path"], method=entry["method"], json=entry.get("body"),
+                                   headers=entry.get("headers") or {})
+        seconds = time.perf_counter() - start
+        body = response.get_json(silent=True) if response.mimetype == "application/json" else None
+        results[index] = (response.status_code, seconds, body, lateness)
+
+    first = entries[0]["t"]
+    started = time.perf_counter()
+    for index, entry in enumerate(entries):
+        due = None
+        if speed > 0:
+            due = started + (entry["t"] - first) / speed
+            delay = due - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+        previous[entry["session"]] = pool.submit(send, index, entry, previous.get(entry["session"]), due)
+    pool.shutdown(wait=True)
+    return results, time.perf_counter() - started
+
+
+def report(entries, results, elapsed):
+    print(f"{len(entries)} requests in {elapsed:.2f} s: {len(entries) / elapsed:.1f} req/s")
+    by_path = {}
+    for entry, (status, seconds, _, lateness) in zip(entries, results):
+        by_path.setdefault(entry["path"], []).append((status, seconds, lateness, entry.get("ms")))
+    print(f"{'path':<16} {'count':>6} {'p50 ms':>8} {'p90 ms':>8} {'p99 ms':>8} {'max ms':>8} "
+          f"{'recorded p50':>13} {'late p99':>9}  statuses")
+    for path, rows in sorted(by_path.items()):
+        latencies = sorted(r[1] * 1000 for r in rows)
+        late = sorted(r[2] * 1000 for r in rows)
+        recorded = sorted(r[3] for r in rows if r[3] is not None)
+        statuses = {}
+        for r in rows:
+            statuses[r[0]] = statuses.get(r[0], 0) + 1
+        print(f"{path:<16} {len(rows):6d} {percentile(latencies, 0.5):8.2f} {percentile(latencies, 0.9):8.2f} "
+              f"{percentile(latencies, 0.99):8.2f} {latencies[-1]:8.2f} "
+              f"{percentile(recorded, 0.5) if recorded else float('nan'):13.2f} {percentile(late, 0.99):9.2f}  "
+              + " ".join(f"{code}x{count}" for code, count in sorted(statuses.items())))
+
+
+def diff(entries, results, expected, ignore, show):
+    """Compare replayed JSON responses with expected ones (index-aligned); prints a summary."""
+    compared = changed = 0
+    shown = 0
+    for index, (entry, result) in enumerate(zip(entries, results)):
+        before = expected[index]
+        if entry["path"] in UNDIFFED_PATHS or before is None or result[2] is None:
+            continue
+        compared += 1
+        old, new = strip(before, ignore), strip(result[2], ignore)
+        if old == new:
+            continue
+        changed += 1
+        if shown < show:
+            shown += 1
+            body = entry.get("body") or {}
+            print(f"\n#{index} {entry['method']} {entry['path']} session={entry['session']} "
+                  f"command={body.get('command')!r}")
+            lines = difflib.unified_diff(
+                json.dumps(old, indent=1, sort_keys=True).splitlines(),
+                json.dumps(new, indent=1, sort_keys=True).splitlines(),
+                "expected", "replayed", lineterm="", n=1
+            )
+            print("\n".join(lines))
+    print(f"\nresponses compared: {compared}, identical: {compared - changed}, different: {changed}")
+    return changed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("log", help="traffic log (.jsonl.gz) recorded with JARVIS_TRAFFIC_LOG")
+    parser.add_argument("--speed", type=float, default=1.0, help="1 = recorded pace, 10 = 10x faster, 0 = flat out")
+    parser.add_argument("--workers", type=int, default=16, help="requests in flight at once")
+    parser.add_argument("--save", help="write this run's responses here for a later --compare")
+    parser.add_argument("--compare", help="diff against a run saved with --save instead of the recorded responses")
+    parser.add_argument("--ignore", action="append", default=[], help="response key to leave out of diffs")
+    parser.add_argument("--show", type=int, default=5, help="differing responses to print")
+    parser.add_argument("--search-ms", type=float, default=0, help="stub search latency")
+    parser.add_argument("--weather-ms", type=float, default=0, help="stub weather latency")
+    parser.add_argument("--admission", action="store_true", help="keep rate limits (all replayed requests share one client)")
+    args = parser.parse_args()
+
+    from traffic import read_log
+    entries = read_log(args.log)
+    if not entries:
+        sys.exit(f"{args.log}: no requests recorded")
+
+    # A fresh, offline app: empty databases, no desktop side effects, no re-recording
+    workdir = tempfile.mkdtemp(prefix="jarvis-replay-")
+    os.chdir(workdir)
+    os.environ["HOME"] = workdir
+    os.environ.pop("JARVIS_TRAFFIC_LOG", None)
+    os.environ.pop("JARVIS_STATE_URL", None)
+    os.environ.setdefault("JARVIS_LOG_LEVEL", "WARNING")
+    if not args.admission:
+        os.environ["JARVIS_RATE_LIMIT"] = "0"
+    stubs.install()
+    stubs.StubDDGS.latency = args.search_ms / 1000
+    stubs.weather_latency = args.weather_ms / 1000
+    random.seed(1234)
+
+    import server
+    results, elapsed = replay(server.app.test_client(), entries, args.speed, args.workers)
+    report(entries, results, elapsed)
+
+    if args.compare:
+        saved = read_log(args.compare)
+        expected = [e.get("response") for e in saved] if len(saved) == len(entries) else None
+        if expected is None:
+            sys.exit(f"{args.compare} has {len(saved)} requests, the log has {len(entries)}")
+    else:
+        expected = [e.get("response") for e in entries]
+    changed = diff(entries, results, expected, set(args.ignore), args.show)
+
+    if args.save:
+        with gzip.open(args.save, "wt", encoding="utf-8") as out:
+            for entry, (status, seconds, body, _) in zip(entries, results):
+                saved = dict(entry, status=status, ms=round(seconds * 1000, 3))
+                saved.pop("response", None)
+                if body is not None:
+                    saved["response"] = body
+                out.write(json.dumps(saved, separators=(",", ":")) + "\n")
+        print(f"saved {len(entries)} responses to {args.save}")
+    # Non-zero exit so a replay can gate a change
+    sys.exit(1 if changed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,226 @@
+"""
+In-memory stand-in for a Redis server, for the shared-state benchmarks.
+
+Speaks enough RESP for state.RedisBackend (PING, AUTH, SELECT, GET, SET with
+EX/PX, DEL, EXISTS, MGET, RPUSH, LTRIM, LRANGE, FLUSHDB). Every complete command
+already received on a connection is answered in one write, so pipelines behave
+as they do against a real server. Run it as its own process (spawn() does that)
+so it does not share the benchmark's GIL; --delay-ms holds every reply back to
+imitate a network hop between nodes.
+
+    python bench/resp_server.py --port 6399 --delay-ms 0.5
+"""
+import argparse
+import os
+import socket
+import socketserver
+import subprocess
+import sys
+import threading
+import time
+
+
+class Store:
+    def __init__(self):
+        self.values = {}
+        self.lists = {}
+        self.expires = {}
+        self.lock = threading.Lock()
+
+    def _expire(self, key):
+        deadline = self.expires.get(key)
+        if deadline is not None and deadline <= time.monotonic():
+            del self.expires[key]
+            self.values.pop(key, None)
+            self.lists.pop(key, None)
+
+    def run(self, args):
+        name = args[0].upper()
+        handler = getattr(self, "cmd_" + name.decode("ascii", "replace").lower(), None)
+        if handler is None:
+            return ValueError(f"ERR unknown command '{name.decode(errors='replace')}'")
+        with self.lock:
+            for key in args[1:2]:
+                self._expire(key)
+            try:
+                return handler(*args[1:])
+            except (TypeError, ValueError):
+                return ValueError(f"ERR wrong arguments for '{name.decode(errors='replace')}'")
+
+    def cmd_ping(self):
+        return "PONG"
+
+    def cmd_auth(self, password):
+        return "OK"
+
+    def cmd_select(self, db):
+        return "OK"
+
+    def cmd_flushdb(self):
+        self.values.clear()
+        self.lists.clear()
+        self.expires.clear()
+        return "OK"
+
+    def cmd_get(self, key):
+        return self.values.get(key)
+
+    def cmd_set(self, key, value, *options):
+        self.values[key] = value
+        self.expires.pop(key, None)
+        if options:
+            unit, amount = options[0].upper(), int(options[1])
+            self.expires[key] = time.monotonic() + (amount if unit == b"EX" else amount / 1000)
+        return "OK"
+
+    def cmd_del(self, *keys):
+        removed = 0
+        for key in keys:
+            self._expire(key)
+            found = self.values.pop(key, None) is not None or self.lists.pop(key, None) is not None
+            self.expires.pop(key, None)
+            removed += found
+        return removed
+
+    def cmd_exists(self, *keys):
+        for key in keys:
+            self._expire(key)
+        return sum(key in self.values or key in self.lists for key in keys)
+
+    def cmd_mget(self, *keys):
+        for key in keys:
+            self._expire(key)
+        return [self.values.get(key) for key in keys]
+
+    def cmd_rpush(self, key, *values):
+        items = self.lists.setdefault(key, [])
+        items.extend(values)
+        return len(items)
+
+    def cmd_ltrim(self, key, start, stop):
+        items = self.lists.get(key)
+        if items is not None:
+            kept = self._slice(items, int(start), int(stop))
+            if kept:
+                self.lists[key] = kept
+            else:
+                del self.lists[key]
+        return "OK"
+
+    def cmd_lrange(self, key, start, stop):
+        return self._slice(self.lists.get(key, []), int(start), int(stop))
+
+    @staticmethod
+    def _slice(items, start, stop):
+        # Redis ranges are inclusive and clamp out-of-range indexes
+        n = len(items)
+        start = max(start + n if start < 0 else start, 0)
+        stop = stop + n if stop < 0 else min(stop, n - 1)
+        return items[start:stop + 1]
+
+
+def encode(reply):
+    if reply is None:
+        return b"$-1\r\n"
+    if isinstance(reply, Exception):
+        return b"-" + str(reply).encode() + b"\r\n"
+    if isinstance(reply, str):
+        return b"+" + reply.encode() + b"\r\n"
+    if isinstance(reply, int):
+        return b":%d\r\n" % reply
+    if isinstance(reply, bytes):
+        return b"$%d\r\n%s\r\n" % (len(reply), reply)
+    return b"*%d\r\n" % len(reply) + b"".join(encode(r) for r in reply)
+
+
+def parse(buf, pos):
+    """(args, next position) for the command array at pos, or None when it is not complete yet."""
+    end = buf.find(b"\r\n", pos)
+    if end < 0:
+        return None
+    count = int(buf[pos + 1:end])
+    pos = end + 2
+    args = []
+    for _ in range(count):
+        end = buf.find(b"\r\n", pos)
+        if end < 0:
+            return None
+        length = int(buf[pos + 1:end])
+        start = end + 2
+        if len(buf) < start + length + 2:
+            return None
+        args.append(bytes(buf[start:start + length]))
+        pos = start + length + 2
+    return args, pos
+
+
+class Handler(socketserver.BaseRequestHandler):
+    def handle(self):
+        self.request.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        buf = bytearray()
+        while True:
+            data = self.request.recv(65536)
+            if not data:
+                return
+            buf += data
+            replies = []
+            pos = 0
+            while pos < len(buf):
+                parsed = parse(buf, pos)
+                if parsed is None:
+                    break
+                args, pos = parsed
+                replies.append(encode(self.server.store.run(args)))
+            del buf[:pos]
+            if replies:
+                if self.server.delay:
+                    time.sleep(self.server.delay)
+                self.request.sendall(b"".join(replies))
+
+
+class RespServer(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self, host="127.0.0.1", port=0, delay=0.0):
+        super().__init__((host, port), Handler)
+        self.store = Store()
+        self.delay = delay
+        self._thread = None
+
+    @property
+    def url(self):
+        host, port = self.server_address[:2]
+        return f"redis://{host}:{port}/0"
+
+    def start(self):
+        self._thread = threading.Thread(target=self.serve_forever, name="resp-server", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.shutdown()
+        self.server_close()
+
+
+def spawn(delay_ms=0.0):
+    """Start the stand-in in a child process on a free port; returns (process, url)."""
+    process = subprocess.Popen([sys.executable, os.path.abspath(__file__), "--port", "0", "--delay-ms", str(delay_ms)],
+                               stdout=subprocess.PIPE, text=True)
+    url = process.stdout.readline().split()[-1]
+    return process, url
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=6399)
+    parser.add_argument("--delay-ms", type=float, default=0.0)
+    args = parser.parse_args()
+    server = RespServer(args.host, args.port, args.delay_ms / 1000)
+    print(f"Listening on {server.url}", flush=True)
+    server.serve_forever()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+"""
+Scheduler behaviour with 100k pending jobs.
+
+Measures schedule() latency as the queue grows to --jobs, what the dispatcher
+costs while everything is in the future (wakeups and CPU over --idle-s), how
+late jobs start when --timed jobs are spread over the next two seconds, and the
+order in which overdue jobs catch up after a restart.
+
+    python bench/scheduler_load.py --jobs 100000
+"""
+import argparse
+import os
+import random
+import statistics
+import sys
+import tempfile
+import threading
+import time
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(BENCH_DIR))
+os.environ.setdefault("JARVIS_LOG_LEVEL", "WARNING")
+
+from metrics import REGISTRY
+from scheduler import Scheduler
+
+FUTURE = 10 * 86400
+
+
+def wakeups():
+    for line in REGISTRY.render().splitlines():
+        if line.startswith("jarvis_scheduler_wakeups_total "):
+            return float(line.split()[1])
+    return 0.0
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--jobs", type=int, default=100000)
+    parser.add_argument("--timed", type=int, default=2000)
+    parser.add_argument("--idle-s", type=float, default=2.0)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+    rng = random.Random(args.seed)
+    workdir = tempfile.mkdtemp(prefix="jarvis-scheduler-")
+
+    scheduler = Scheduler(os.path.join(workdir, "schedule.db"))
+    lags = []
+    lock = threading.Lock()
+
+    def record(payload):
+        with lock:
+            lags.append(time.time() - payload["due"])
+
+    scheduler.register("timed", record)
+    scheduler.start()
+
+    print("schedule() latency by queue size")
+    size = 0
+    for target in (1000, 10000, args.jobs):
+        now = time.time()
+        batch = [("future", None, now + FUTURE + rng.random() * FUTURE, 0, None, None) for _ in range(target - size)]
+        start = time.perf_counter()
+        scheduler.schedule_many(batch)
+        bulk = time.perf_counter() - start
+        size = target
+        start = time.perf_counter()
+        for _ in range(1000):
+            scheduler.schedule("future", None, delay=FUTURE + rng.random() * FUTURE)
+        single = (time.perf_counter() - start) / 1000
+        size += 1000
+        print(f"  {size:>7} pending  schedule() {single * 1e6:6.1f} us  "
+              f"(bulk insert {len(batch) / bulk:8.0f} jobs/s)")
+
+    scheduler.wait_idle(timeout=10)
+    before_wakeups, before_cpu = wakeups(), time.process_time()
+    time.sleep(args.idle_s)
+    print(f"\nidle with {size} future jobs for {args.idle_s:.0f}s: {wakeups() - before_wakeups:.0f} dispatcher "
+          f"wakeups, {(time.process_time() - before_cpu) * 1000:.1f} ms CPU")
+
+    now = time.time()
+    before_wakeups = wakeups()
+    dues = [now + 0.2 + rng.random() * 2 for _ in range(args.timed)]
+    for due in dues:
+        scheduler.schedule("timed", {"due": due}, due_at=due)
+    time.sleep(max(dues) - time.time())
+    scheduler.wait_idle(timeout=30)
+    lags.sort()
+    print(f"\n{len(lags)} jobs due over 2s: start lag p50 {statistics.median(lags) * 1000:.2f} ms, "
+          f"p99 {lags[int(len(lags) * 0.99)] * 1000:.2f} ms, max {lags[-1] * 1000:.2f} ms, "
+          f"{wakeups() - before_wakeups:.0f} wakeups")
+    scheduler.stop()
+
+    # Restart: jobs that fell due while the process was down
+    path = os.path.join(workdir, "restart.db")
+    down = Scheduler(path, catch_up_limit=3600)
+    now = time.time()
+    order = list(range(6))
+    rng.shuffle(order)
+    down.schedule_many([("log", {"name": f"one-off {i}"}, now - 600 + i * 60, 0, None, None) for i in order])
+    down.schedule("log", {"name": "too old"}, due_at=now - 7200)
+    down.schedule("log", {"name": "every minute"}, due_at=now - 10 * 60 - 30, interval=60, key="minutely")
+    down.stop()
+
+    ran = []
+    up = Scheduler(path, workers=1, catch_up_limit=3600)
+    up.register("log", lambda payload: ran.append(payload["name"]))
+    up.start()
+    up.wait_idle(timeout=10)
+    recurring = up.pending()[0]
+    up.stop()
+    print("\nafter restart, ran in order:", ", ".join(ran))
+    print(f"recurring job ran {ran.count('every minute')}x for 11 missed periods; next due in "
+          f"{recurring['due_at'] - time.time():.0f}s, on its original cadence: "
+          f"{round((recurring['due_at'] - (now - 630)) % 60, 6) in (0.0, 60.0)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,155 @@
+"""
+Hit rate and latency of semantic retrieval against the substring scan.
+
+Pads the knowledge base with synthetic entries (50k by default), then runs a set of
+paraphrased questions with known answers and two sets of out-of-domain questions
+that should fall through to web search, through both lookup strategies. The
+near-vocabulary set shares a word with an entry ("network engineer") and checks
+that a single borrowed word is not enough for an answer.
+
+    python bench/semantic_retrieval.py --entries 50000
+"""
+import argparse
+import os
+import random
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from reasoning import ReasoningEngine
+
+# (question, expected definition key)
+PARAPHRASES = [
+    ("what do neural nets do", "neural network"),
+    ("tell me about relational databases and queries", "sql"),
+    ("how do computers learn patterns from data", "machine learning"),
+    ("explain the study of living things", "biology"),
+    ("what is the study of matter and energy", "physics"),
+    ("what does the central processor do", "cpu"),
+    ("what is a graphics card used for", "gpu"),
+    ("what is volatile memory", "ram"),
+    ("define the science of numbers and quantity", "mathematics"),
+    ("what is a reusable block of code", "function"),
+    ("how do programs repeat code", "loop"),
+    ("what is a named storage location", "variable"),
+    ("what is a step by step procedure for solving problems", "algorithm"),
+    ("what are substances and chemical reactions", "chemistry"),
+    ("explain multi layer neural networks", "deep learning"),
+    ("what is renting servers over the internet", "cloud computing"),
+    ("explain extracting insights from data with statistics", "data science"),
+    ("what language runs in web browsers", "javascript"),
+    ("what is the write once run anywhere language", "java"),
+    ("how do applications talk to each other", "api"),
+]
+
+OUT_OF_DOMAIN = [
+    "who won the world cup in 1998",
+    "what is the weather in paris today",
+    "what is a good pizza recipe",
+    "how tall is mount everest",
+    "what time does the bank open",
+    "who is the president of france",
+    "what is the capital of australia",
+    "what are stocks doing today",
+    "how do i fix a flat tire",
+    "what is love",
+]
+
+NEAR_VOCABULARY = [
+    "what does a network engineer do",
+    "what is the best data plan for my phone",
+    "how much memory does an elephant have",
+    "what is cloud seeding",
+    "how do i book a function room",
+    "what is a loop road",
+    "how do i learn guitar",
+    "what is a variable rate mortgage",
+    "what is the speed of light in physics class",
+    "how deep is the ocean",
+    "what is a python snake",
+    "how do i store food safely",
+]
+
+VOCAB = (
+    "system method process model network data value structure engine service module signal "
+    "layer protocol device storage memory field theory element compound cell orbit wave particle "
+    "market policy design pattern language symbol graph matrix vector field sensor device circuit"
+).split()
+
+
+def pseudo_word(rng):
+    return "".join(rng.choice("bcdfghklmnprstvz") + rng.choice("aeiou") for _ in range(rng.randint(2, 4)))
+
+
+def pad(engine, entries, seed):
+    rng = random.Random(seed)
+    while len(engine.knowledge_base) < entries:
+        term = f"{pseudo_word(rng)} {pseudo_word(rng)}"
+        words = [rng.choice(VOCAB) if rng.random() < 0.3 else pseudo_word(rng) for _ in range(rng.randint(20, 45))]
+        engine.knowledge_base[term] = f"{term.title()} is a " + " ".join(words) + "."
+
+
+def substring_lookup(engine, query):
+    for term in engine.knowledge_base:
+        if term in query:
+            return term
+    return None
+
+
+def semantic_lookup(engine, query):
+    match = engine.semantic_match(query, 1)
+    return match[0].split(":", 1)[1] if match else None
+
+
+def evaluate(name, lookup, engine, repeat):
+    latencies = []
+    hits = answered_ood = answered_near = 0
+    for question, expected in PARAPHRASES:
+        for _ in range(repeat):
+            start = time.perf_counter()
+            found = lookup(engine, question)
+            latencies.append(time.perf_counter() - start)
+        hits += found == expected
+    for question in OUT_OF_DOMAIN:
+        for _ in range(repeat):
+            start = time.perf_counter()
+            found = lookup(engine, question)
+            latencies.append(time.perf_counter() - start)
+        answered_ood += found is not None
+    for question in NEAR_VOCABULARY:
+        for _ in range(repeat):
+            start = time.perf_counter()
+            found = lookup(engine, question)
+            latencies.append(time.perf_counter() - start)
+        answered_near += found is not None
+
+    latencies.sort()
+    p99 = latencies[int(len(latencies) * 0.99) - 1]
+    print(f"{name:<10} hit rate {hits}/{len(PARAPHRASES)}  "
+          f"false answers {answered_ood}/{len(OUT_OF_DOMAIN)}, near {answered_near}/{len(NEAR_VOCABULARY)}  "
+          f"latency mean {statistics.mean(latencies) * 1000:.3f} ms  p99 {p99 * 1000:.3f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--entries", type=int, default=50000)
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    engine = ReasoningEngine(semantic=True)
+    pad(engine, args.entries, args.seed)
+
+    start = time.perf_counter()
+    engine.build_semantic_index()
+    print(f"Indexed {len(engine.semantic_index.keys)} documents in {time.perf_counter() - start:.2f} s "
+          f"({engine.semantic_index.matrix.nnz} non-zeros)")
+
+    evaluate("substring", substring_lookup, engine, args.repeat)
+    evaluate("semantic", semantic_lookup, engine, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""
+Cold-start benchmark for server.py.
+
+Runs `python -X importtime -c "import server"` in a fresh interpreter for the lazy
+(default) and eager (JARVIS_EAGER_START=1) start-up modes, and reports the total
+import time, the slowest top-level imports and the wall time until the first
+/stats request has been served.
+
+    python bench/startup_importtime.py --runs 5
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+REPO = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+FIRST_REQUEST = (
+    "import time; t = time.perf_counter(); import server; "
+    "server.app.test_client().get('/stats'); "
+    "print(time.perf_counter() - t)"
+)
+
+
+def parse_importtime(stderr):
+    """Return {module: cumulative_us} for server and the modules it imports directly."""
+    modules = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative_us, field = line.split(":", 1)[1].split("|")
+        # Nesting is shown as two extra spaces of indentation per level, and children
+        # are listed before their parent, so anything before the last top-level
+        # import (site, encodings, ...) is interpreter start-up noise
+        depth = (len(field) - len(field.lstrip()) - 1) // 2
+        if depth == 0 and field.strip() != "server":
+            modules = {}
+        elif depth <= 1:
+            modules[field.strip()] = int(cumulative_us)
+    return modules
+
+
+def run(env_overrides, cwd):
+    env = dict(os.environ, PYTHONPATH=REPO, PYTHONDONTWRITEBYTECODE="1", **env_overrides)
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import server"],
+        cwd=cwd, env=env, capture_output=True, text=True, check=True
+    )
+    imports = parse_importtime(proc.stderr)
+
+    proc = subprocess.run(
+        [sys.executable, "-c", FIRST_REQUEST],
+        cwd=cwd, env=env, capture_output=True, text=True, check=True
+    )
+    first_request = float(proc.stdout.strip().splitlines()[-1])
+    return imports, first_request
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--top", type=int, default=8)
+    args = parser.parse_args()
+
+    # Run from a scratch directory so MemoryCore does not touch the tracked database
+    with tempfile.TemporaryDirectory(prefix="jarvis-startup-") as cwd:
+        for label, env in (("lazy", {}), ("eager", {"JARVIS_EAGER_START": "1"})):
+            totals, first_requests, last = [], [], {}
+            for _ in range(args.runs):
+                imports, first_request = run(env, cwd)
+                totals.append(imports.get("server", 0) / 1000)
+                first_requests.append(first_request * 1000)
+                last = imports
+
+            print(f"[{label}] import server: median {statistics.median(totals):.1f} ms, "
+                  f"first /stats served after {statistics.median(first_requests):.1f} ms")
+            slowest = sorted((m for m in last.items() if m[0] != "server"), key=lambda m: m[1], reverse=True)
+            for name, cumulative_us in slowest[:args.top]:
+                print(f"    {cumulative_us / 1000:8.1f} ms  {name}")
+
+
+if __name__ == "__main__":
+    main()
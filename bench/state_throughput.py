@@ -0,0 +1,100 @@
+"""
+Shared-state throughput: round trips versus pipelines, and pool scaling.
+
+Starts the in-memory Redis stand-in in its own process, once on plain loopback
+and once holding each reply back by --rtt-ms to imitate a network hop between
+nodes, and measures state.RedisBackend doing N writes one command at a time and
+as one pipeline, N GETs against one MGET, and history appends from several
+threads with connection pools from 1 up to --threads.
+
+    python bench/state_throughput.py --keys 100 --threads 8 --rtt-ms 0.5
+"""
+import argparse
+import os
+import sys
+import threading
+import time
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(BENCH_DIR))
+sys.path.insert(0, BENCH_DIR)
+
+import resp_server
+from state import backend_from_url
+
+
+def timed(fn, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - start) / repeat
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--keys", type=int, default=100)
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--threads", type=int, default=8)
+    parser.add_argument("--appends", type=int, default=2000, help="history appends per pool-size run")
+    parser.add_argument("--rtt-ms", type=float, default=0.5)
+    args = parser.parse_args()
+
+    print(f"{'operation':<28} {'loopback':>10} {'+' + str(args.rtt_ms) + ' ms RTT':>14}")
+    results = {}
+    for delay in (0.0, args.rtt_ms):
+        process, url = resp_server.spawn(delay)
+        try:
+            results[delay] = measure(url, args)
+        finally:
+            process.terminate()
+            process.wait()
+    for label in results[0.0]:
+        unit = "appends/s" if label.startswith("pool") else "ms"
+        print(f"{label:<28} {results[0.0][label]:10.2f} {results[args.rtt_ms][label]:14.2f}  {unit}")
+
+
+def measure(url, args):
+    backend = backend_from_url(url)
+    keys = [f"bench:{i}" for i in range(args.keys)]
+    mapping = {key: {"role": "user", "text": f"turn {key}"} for key in keys}
+
+    def set_each():
+        for key, value in mapping.items():
+            backend.set(key, value, ttl=60)
+
+    def get_each():
+        for key in keys:
+            backend.get(key)
+
+    results = {
+        f"SET x{args.keys}, one at a time": timed(set_each, args.repeat) * 1000,
+        f"SET x{args.keys}, pipelined": timed(lambda: backend.set_many(mapping, ttl=60), args.repeat) * 1000,
+        f"GET x{args.keys}, one at a time": timed(get_each, args.repeat) * 1000,
+        f"MGET of {args.keys}": timed(lambda: backend.get_many(keys), args.repeat) * 1000,
+    }
+    backend.close()
+
+    # Each thread appends to its own session, as concurrent /command requests do
+    pool = 1
+    while pool <= args.threads:
+        backend = backend_from_url(url, max_connections=pool)
+        per_thread = args.appends // args.threads
+
+        def worker(n):
+            for i in range(per_thread):
+                backend.append(f"history:bench-{n}", {"role": "user", "text": f"turn {i}"}, max_len=10)
+
+        threads = [threading.Thread(target=worker, args=(n,)) for n in range(args.threads)]
+        start = time.perf_counter()
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        results[f"pool of {pool}, {args.threads} threads"] = per_thread * args.threads / (time.perf_counter() - start)
+        backend.close()
+        pool *= 2
+    return results
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""
+Time to first sentence on /command/stream against full /command latency.
+
+Each command runs both ways through the Flask test client, with the search
+backend stubbed to a --search-ms network call and the search cache off. It
+prints three medians per class. The first is the full /command response. The
+second is the first chunk the stream yields, which is the holding line for a
+slow command. The third is the first sentence of the answer itself.
+
+    python bench/stream_latency.py --search-ms 300 --rounds 5
+"""
+import argparse
+import json
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(BENCH_DIR))
+sys.path.insert(0, BENCH_DIR)
+
+import stubs
+
+COMMANDS = {
+    "local": ["hello", "who are you", "status report", "list tasks"],
+    "reasoning": ["what is deep learning", "difference between cpu and gpu", "how does a neural network work"],
+    "search": ["why is the sky blue", "search for black holes", "who is ada lovelace"],
+}
+
+
+def plain_seeds(count):
+    """Seeds whose first draw skips the 20% sassy reply, so every command reaches its handler."""
+    seeds = []
+    candidate = 0
+    while len(seeds) < count:
+        random.seed(candidate)
+        if random.random() <= 0.8:
+            seeds.append(candidate)
+        candidate += 1
+    return seeds
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--search-ms", type=float, default=300)
+    parser.add_argument("--rounds", type=int, default=5)
+    args = parser.parse_args()
+
+    os.environ.setdefault("JARVIS_LOG_LEVEL", "WARNING")
+    os.environ.setdefault("JARVIS_RATE_LIMIT", "0")
+    os.chdir(tempfile.mkdtemp(prefix="jarvis-stream-"))
+    stubs.install()
+    stubs.StubDDGS.latency = args.search_ms / 1000
+
+    import server
+    client = server.app.test_client()
+    # Every search goes to the (stubbed) network
+    server.brain.cache.ttl = 0
+    client.post("/command", json={"command": "what is python"})
+
+    print(f"median ms over {args.rounds} rounds, search {args.search_ms:.0f} ms; "
+          f"holding line after {server.STREAM_HOLD_SECONDS * 1000:.0f} ms")
+    print(f"{'class':<10} {'/command':>9} {'first chunk':>12} {'first sentence':>15} {'stream done':>12}")
+    for kind, commands in COMMANDS.items():
+        full, first, sentence, done = [], [], [], []
+        for round_, seed in enumerate(plain_seeds(args.rounds)):
+            for command in commands:
+                session = f"{kind}-{round_}"
+                random.seed(seed)
+                start = time.perf_counter()
+                client.post("/command", json={"command": command, "session": session + "-full"})
+                full.append(time.perf_counter() - start)
+
+                random.seed(seed)
+                start = time.perf_counter()
+                response = client.post("/command/stream", json={"command": command, "session": session},
+                                       buffered=False)
+                first_at = sentence_at = None
+                for chunk in response.response:
+                    now = time.perf_counter() - start
+                    for line in chunk.decode().splitlines():
+                        payload = json.loads(line)
+                        first_at = first_at if first_at is not None else now
+                        if sentence_at is None and "index" in payload:
+                            sentence_at = now
+                response.close()
+                done.append(time.perf_counter() - start)
+                first.append(first_at)
+                sentence.append(sentence_at)
+        print(f"{kind:<10} {statistics.median(full) * 1000:9.1f} {statistics.median(first) * 1000:12.1f} "
+              f"{statistics.median(sentence) * 1000:15.1f} {statistics.median(done) * 1000:12.1f}")
+
+
+if __name__ == "__main__":
+    main()
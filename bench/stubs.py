@@ -0,0 +1,91 @@
+"""
+Deterministic stand-ins for everything JARVIS reaches outside the process:
+DuckDuckGo search, the wttr.in weather API, and the desktop/browser launcher.
+Used by the benchmark suite so it runs offline and repeatably.
+"""
+import json
+import os
+import sys
+import time
+import types
+
+FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+
+WEATHER = {
+    "current_condition": [{"temp_C": "21", "weatherDesc": [{"value": "Partly cloudy"}]}],
+    "nearest_area": [{"areaName": [{"value": "Stark Tower"}]}],
+}
+
+
+def load_results():
+    with open(os.path.join(FIXTURES, "ddgs_results.json"), encoding="utf-8") as f:
+        return json.load(f)
+
+
+class StubDDGS:
+    """Replays recorded DDGS text results, picking the fixture whose topic appears in the query."""
+
+    calls = 0
+    # Seconds to sleep per call, to imitate a network round trip
+    latency = 0
+
+    def __init__(self, *args, **kwargs):
+        self.results = load_results()
+        self.default = next(iter(self.results.values()))
+
+    def text(self, query, region=None, max_results=10, **kwargs):
+        StubDDGS.calls += 1
+        if self.latency:
+            time.sleep(self.latency)
+        query = query.lower()
+        for topic, results in self.results.items():
+            if topic in query:
+                return results[:max_results]
+        return self.default[:max_results]
+
+
+class StubResponse:
+    def __init__(self, payload, status_code=200):
+        self._payload = payload
+        self.status_code = status_code
+
+    def json(self):
+        return self._payload
+
+
+# Seconds stub_get sleeps for a weather request
+weather_latency = 0
+
+
+def stub_get(url, *args, **kwargs):
+    if "wttr.in" in url:
+        if weather_latency:
+            time.sleep(weather_latency)
+        return StubResponse(WEATHER)
+    return StubResponse({}, status_code=404)
+
+
+def install():
+    """
+    Replace network and desktop side effects for the current process.
+    Must run before the JARVIS modules perform their first search/launch.
+    """
+    ddgs = types.ModuleType("duckduckgo_search")
+    ddgs.DDGS = StubDDGS
+    sys.modules["duckduckgo_search"] = ddgs
+
+    try:
+        import requests
+    except ImportError:
+        requests = types.ModuleType("requests")
+        sys.modules["requests"] = requests
+    requests.get = stub_get
+
+    import launcher
+
+    launcher.subprocess = types.SimpleNamespace(Popen=lambda *args, **kwargs: None)
+    launcher.webbrowser = types.SimpleNamespace(open=lambda url, *args, **kwargs: True)
+    launcher.os = types.SimpleNamespace(
+        path=os.path, startfile=lambda path: None, getlogin=lambda: "bench"
+    )
+    return StubDDGS
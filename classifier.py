@@ -0,0 +1,216 @@
+import os
+import hashlib
+
+class ContentClassifier:
+    """
+    Classifies files by their content (magic bytes) instead of their extension,
+    and finds duplicate files without hashing more data than necessary.
+    """
+
+    # Only this many bytes are read from the start of a file when sniffing
+    HEAD_SIZE = 4096
+    # Prefix hashed to split files of the same size before a full hash
+    PARTIAL_SIZE = 64 * 1024
+    CHUNK_SIZE = 1024 * 1024
+
+    # (offset, signature, kind) - checked in order, first match wins
+    SIGNATURES = [
+        (0, b"\x89PNG\r\n\x1a\n", "png"),
+        (0, b"\xff\xd8\xff", "jpeg"),
+        (0, b"GIF87a", "gif"),
+        (0, b"GIF89a", "gif"),
+        (0, b"%PDF-", "pdf"),
+        (0, b"Rar!\x1a\x07", "rar"),
+        (0, b"7z\xbc\xaf\x27\x1c", "7z"),
+        (0, b"\x1f\x8b", "gzip"),
+        (257, b"ustar", "tar"),
+        (0, b"MZ", "exe"),
+        (0, b"\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1", "ole"),
+        (0, b"\x1a\x45\xdf\xa3", "mkv"),
+        (0, b"ID3", "mp3"),
+        (0, b"fLaC", "flac"),
+        (0, b"OggS", "ogg"),
+    ]
+
+    KIND_CATEGORIES = {
+        "png": "Images", "jpeg": "Images", "gif": "Images", "webp": "Images", "svg": "Images",
+        "pdf": "Documents", "docx": "Documents", "xlsx": "Documents", "pptx": "Documents",
+        "exe": "Installers", "msi": "Installers", "iso": "Installers", "dmg": "Installers",
+        "zip": "Archives", "rar": "Archives", "7z": "Archives", "gzip": "Archives", "tar": "Archives",
+        "mp4": "Video", "mov": "Video", "mkv": "Video", "avi": "Video",
+        "mp3": "Audio", "wav": "Audio", "flac": "Audio", "ogg": "Audio", "m4a": "Audio",
+    }
+
+    def __init__(self, extensions=None):
+        # Extension map used when the content is inconclusive (plain text, unknown formats)
+        self.extensions = extensions or {}
+
+    def sniff(self, file_path):
+        """
+        Identify a file from its leading bytes.
+        Returns a short kind string such as 'png' or 'zip', 'text' for plain text, or None.
+        """
+        try:
+            with open(file_path, "rb") as f:
+                head = f.read(self.HEAD_SIZE)
+                if not head:
+                    return None
+
+                kind = self._match_head(head)
+                if kind == "ole":
+                    # Compound files are both .msi installers and legacy Office documents
+                    ext = os.path.splitext(file_path)[1].lower()
+                    return "msi" if ext == ".msi" else "doc"
+                if kind:
+                    return kind
+
+                # Signatures that live past the head are read with a bounded seek
+                size = os.fstat(f.fileno()).st_size
+                if size > 0x8006:
+                    f.seek(0x8001)
+                    if f.read(5) == b"CD001":
+                        return "iso"
+                if size >= 512:
+                    f.seek(size - 512)
+                    if f.read(4) == b"koly":
+                        return "dmg"
+        except OSError:
+            return None
+
+        if self._looks_like_text(head):
+            if b"<svg" in head[:1024]:
+                return "svg"
+            return "text"
+        return None
+
+    def classify(self, file_path):
+        """
+        Return the organizer category for a file, preferring its content over its extension.
+        """
+        kind = self.sniff(file_path)
+        category = self.KIND_CATEGORIES.get(kind)
+        if category:
+            return category
+        if kind == "doc":
+            return "Documents"
+
+        # Text and unknown binaries fall back to the extension
+        file_ext = os.path.splitext(file_path)[1].lower()
+        for category, exts in self.extensions.items():
+            if file_ext in exts:
+                return category
+        return None
+
+    def _match_head(self, head):
+        for offset, signature, kind in self.SIGNATURES:
+            if head.startswith(signature, offset):
+                return kind
+
+        if head[:4] == b"RIFF" and len(head) >= 12:
+            return {b"WEBP": "webp", b"WAVE": "wav", b"AVI ": "avi"}.get(head[8:12])
+
+        if head[4:8] == b"ftyp":
+            brand = head[8:12]
+            if brand == b"qt  ":
+                return "mov"
+            if brand in (b"M4A ", b"M4B "):
+                return "m4a"
+            return "mp4"
+
+        if head[:4] == b"PK\x03\x04":
+            # Office Open XML documents are zip files; the first entries give them away
+            if b"word/" in head:
+                return "docx"
+            if b"xl/" in head:
+                return "xlsx"
+            if b"ppt/" in head:
+                return "pptx"
+            return "zip"
+
+        # Bare MPEG audio frames (no ID3 tag)
+        if head[:2] in (b"\xff\xfb", b"\xff\xf3", b"\xff\xf2"):
+            return "mp3"
+
+        return None
+
+    def _looks_like_text(self, head):
+        if b"\x00" in head:
+            return False
+        try:
+            head.decode("utf-8")
+        except UnicodeDecodeError as e:
+            # A multi-byte character cut off at the end of the head is still text
+            return e.start >= len(head) - 3
+        return True
+
+    def find_duplicates(self, paths, stats=None):
+        """
+        Group identical files.
+        Files are bucketed by size first, then by a hash of their first PARTIAL_SIZE bytes,
+        and only files that still collide are hashed in full.
+        Returns a list of groups, each a sorted list of paths with identical content.
+        """
+        if stats is None:
+            stats = {}
+        stats.setdefault("bytes_read", 0)
+        stats.setdefault("partial_hashed", 0)
+        stats.setdefault("full_hashed", 0)
+
+        by_size = {}
+        for path in paths:
+            try:
+                size = os.path.getsize(path)
+            except OSError:
+                continue
+            # Empty files are trivially identical and not worth reporting
+            if size:
+                by_size.setdefault(size, []).append(path)
+
+        groups = []
+        for size, same_size in by_size.items():
+            if len(same_size) < 2:
+                continue
+
+            by_prefix = {}
+            for path in same_size:
+                digest = self._hash_file(path, self.PARTIAL_SIZE, stats)
+                if digest is not None:
+                    stats["partial_hashed"] += 1
+                    by_prefix.setdefault(digest, []).append(path)
+
+            for candidates in by_prefix.values():
+                if len(candidates) < 2:
+                    continue
+                if size <= self.PARTIAL_SIZE:
+                    # The prefix hash already covered the whole file
+                    groups.append(sorted(candidates))
+                    continue
+
+                by_full = {}
+                for path in candidates:
+                    digest = self._hash_file(path, None, stats)
+                    if digest is not None:
+                        stats["full_hashed"] += 1
+                        by_full.setdefault(digest, []).append(path)
+                groups.extend(sorted(g) for g in by_full.values() if len(g) > 1)
+
+        return sorted(groups)
+
+    def _hash_file(self, path, limit, stats):
+        """Stream a file (or its first `limit` bytes) through BLAKE2b."""
+        h = hashlib.blake2b(digest_size=20)
+        remaining = limit
+        try:
+            with open(path, "rb") as f:
+                while remaining is None or remaining > 0:
+                    size = self.CHUNK_SIZE if remaining is None else min(self.CHUNK_SIZE, remaining)
+                    chunk = f.read(size)
+                    if not chunk:
+                        break
+                    h.update(chunk)
+                    stats["bytes_read"] += len(chunk)
+                    if remaining is not None:
+                        remaining -= len(chunk)
+        except OSError:
+            return None
+        return h.hexdigest()
@@ -0,0 +1,90 @@
+"""
+Response encoding for the JARVIS API.
+JSON goes through orjson when it is installed (several times faster than the
+stdlib encoder) and falls back to Flask's default provider otherwise. Machine
+clients can ask for MessagePack with 'Accept: application/msgpack' when the
+msgpack package is available. Payloads served to many clients, such as the
+/stats snapshot, are wrapped in Snapshot so each format is encoded only once.
+"""
+from flask import current_app, request
+from flask.json.provider import DefaultJSONProvider
+
+from lazy import optional_import
+
+orjson = optional_import("orjson")
+msgpack = optional_import("msgpack")
+
+JSON = "application/json"
+MSGPACK_TYPES = ("application/msgpack", "application/x-msgpack")
+
+
+class OrjsonProvider(DefaultJSONProvider):
+    """Flask JSON provider backed by orjson; keyword arguments orjson cannot honour fall back to stdlib."""
+
+    def dumps(self, obj, **kwargs):
+        if kwargs.get("indent") or kwargs.get("cls"):
+            return super().dumps(obj, **kwargs)
+        return orjson.dumps(obj, default=self.default, option=orjson.OPT_NON_STR_KEYS).decode()
+
+    def loads(self, s, **kwargs):
+        if kwargs:
+            return super().loads(s, **kwargs)
+        return orjson.loads(s)
+
+    def response(self, *args, **kwargs):
+        if (self.compact is None and self._app.debug) or self.compact is False:
+            return super().response(*args, **kwargs)
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(
+            orjson.dumps(obj, default=self.default, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_APPEND_NEWLINE),
+            mimetype=self.mimetype
+        )
+
+
+def install(app):
+    """Use orjson for every jsonify/request.json in app when it is available."""
+    if orjson is not None:
+        app.json = OrjsonProvider(app)
+    return app
+
+
+def encode(payload, mimetype=JSON):
+    """Bytes for payload in the given response type."""
+    if mimetype in MSGPACK_TYPES:
+        return msgpack.packb(payload, use_bin_type=True)
+    if orjson is not None:
+        return orjson.dumps(payload, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_APPEND_NEWLINE)
+    return (current_app.json.dumps(payload, separators=(",", ":")) + "\n").encode("utf-8")
+
+
+class Snapshot:
+    """A payload shared between requests, encoded at most once per response type."""
+    __slots__ = ("data", "_encoded")
+
+    def __init__(self, data):
+        self.data = data
+        self._encoded = {}
+
+    def encode(self, mimetype=JSON):
+        body = self._encoded.get(mimetype)
+        if body is None:
+            # Racing threads may both encode; they produce identical bytes
+            body = self._encoded[mimetype] = encode(self.data, mimetype)
+        return body
+
+
+def negotiate():
+    """Response type for the current request: MessagePack only when the client prefers it."""
+    if msgpack is None:
+        return JSON
+    return request.accept_mimetypes.best_match((JSON,) + MSGPACK_TYPES, default=JSON)
+
+
+def respond(payload, status=200):
+    """Response for a dict or Snapshot in the type the client negotiated."""
+    mimetype = negotiate()
+    body = payload.encode(mimetype) if isinstance(payload, Snapshot) else encode(payload, mimetype)
+    response = current_app.response_class(body, status=status, mimetype=mimetype)
+    if msgpack is not None:
+        response.vary.add("Accept")
+    return response
@@ -0,0 +1,187 @@
+"""
+Persistent conversation journal for JARVIS.
+Every turn is appended to an SQLite database in WAL mode. Callers only put the
+turn on a queue; a background writer commits whatever has accumulated in one
+transaction, so /command never waits on the disk. Old turns are compacted away
+by age and by count, and the last N turns per session can be reloaded at startup.
+
+Environment (read by server.py):
+    JARVIS_JOURNAL                 database path (default jarvis_journal.db), empty to disable
+    JARVIS_JOURNAL_MAX_AGE_DAYS    drop turns older than this (default 90, 0 keeps everything)
+    JARVIS_JOURNAL_MAX_TURNS       keep at most this many turns (default 1000000, 0 for no limit)
+"""
+import atexit
+import queue
+import sqlite3
+import threading
+import time
+
+from logger import get_logger
+from metrics import REGISTRY
+
+log = get_logger("journal")
+
+JOURNAL_TURNS = REGISTRY.counter("jarvis_journal_turns_total", "Conversation turns written to the journal.")
+JOURNAL_PENDING = REGISTRY.gauge("jarvis_journal_pending", "Turns queued but not yet written to the journal.")
+
+_STOP = object()
+
+
+class ConversationJournal:
+    def __init__(self, path="jarvis_journal.db", batch_size=1000, max_age_days=90, max_turns=1000000,
+                 compact_interval=3600):
+        self.path = path
+        self.batch_size = batch_size
+        self.max_age = max_age_days * 86400 if max_age_days else None
+        self.max_turns = max_turns or None
+        self.compact_interval = compact_interval
+        self._queue = queue.SimpleQueue()
+        self._writer = None
+        self._start_lock = threading.Lock()
+        self._closed = False
+
+        conn = self._connect()
+        # Incremental auto-vacuum lets compaction hand freed pages back to the filesystem
+        conn.execute('PRAGMA auto_vacuum = INCREMENTAL')
+        conn.execute('PRAGMA journal_mode = WAL')
+        conn.execute('''
+            CREATE TABLE IF NOT EXISTS turns (
+                id INTEGER PRIMARY KEY,
+                session TEXT NOT NULL,
+                role TEXT NOT NULL,
+                text TEXT NOT NULL,
+                created_at REAL NOT NULL
+            )
+        ''')
+        conn.execute('CREATE INDEX IF NOT EXISTS turns_session ON turns (session, id)')
+        conn.execute('CREATE INDEX IF NOT EXISTS turns_created_at ON turns (created_at)')
+        conn.commit()
+        conn.close()
+
+    def _connect(self):
+        conn = sqlite3.connect(self.path, check_same_thread=False)
+        # WAL keeps readers off the writer's back; NORMAL only fsyncs at checkpoints
+        conn.execute('PRAGMA synchronous = NORMAL')
+        return conn
+
+    def append(self, session, role, text):
+        """Queue one turn for writing; never blocks on the database."""
+        if self._closed:
+            return
+        if self._writer is None:
+            self._start()
+        JOURNAL_PENDING.inc()
+        self._queue.put((session, role, text, time.time()))
+
+    def flush(self, timeout=None):
+        """Wait until every turn appended so far is committed. Returns False on timeout."""
+        if self._writer is None:
+            return True
+        done = threading.Event()
+        self._queue.put(done)
+        return done.wait(timeout)
+
+    def close(self, timeout=5):
+        """Write out queued turns and stop the writer."""
+        if self._closed:
+            return
+        self._closed = True
+        if self._writer is not None:
+            self._queue.put(_STOP)
+            self._writer.join(timeout)
+
+    def recent(self, session, n=10):
+        """The last n turns of a session, oldest first."""
+        conn = self._connect()
+        rows = conn.execute(
+            'SELECT role, text, created_at FROM turns WHERE session = ? ORDER BY id DESC LIMIT ?',
+            (session, n)
+        ).fetchall()
+        conn.close()
+        return [{"role": r[0], "text": r[1], "created_at": r[2]} for r in reversed(rows)]
+
+    def load_recent(self, n=10):
+        """{session: last n turns, oldest first} for every session in the journal."""
+        conn = self._connect()
+        histories = {}
+        # One index range scan per session beats a window over the whole table
+        for (session,) in conn.execute('SELECT DISTINCT session FROM turns').fetchall():
+            rows = conn.execute(
+                'SELECT role, text, created_at FROM turns WHERE session = ? ORDER BY id DESC LIMIT ?',
+                (session, n)
+            ).fetchall()
+            histories[session] = [{"role": r[0], "text": r[1], "created_at": r[2]} for r in reversed(rows)]
+        conn.close()
+        return histories
+
+    def sessions(self):
+        conn = self._connect()
+        rows = conn.execute('SELECT DISTINCT session FROM turns').fetchall()
+        conn.close()
+        return [r[0] for r in rows]
+
+    def compact(self, conn=None):
+        """Drop turns past the age and count limits and return their space; returns rows removed."""
+        own = conn is None
+        conn = conn or self._connect()
+        removed = 0
+        if self.max_age:
+            removed += conn.execute('DELETE FROM turns WHERE created_at < ?', (time.time() - self.max_age,)).rowcount
+        if self.max_turns:
+            # Ids only grow, so the newest max_turns rows are the ids above this cut-off
+            (last_id,) = conn.execute('SELECT COALESCE(MAX(id), 0) FROM turns').fetchone()
+            removed += conn.execute('DELETE FROM turns WHERE id <= ?', (last_id - self.max_turns,)).rowcount
+        conn.commit()
+        if removed:
+            # executescript steps the vacuum to completion (execute() frees a single page)
+            conn.executescript('PRAGMA incremental_vacuum; PRAGMA wal_checkpoint(TRUNCATE);')
+            log.info("Journal compacted: %d old turns removed.", removed)
+        if own:
+            conn.close()
+        return removed
+
+    def _start(self):
+        with self._start_lock:
+            if self._writer is None:
+                self._writer = threading.Thread(target=self._run, name="journal-writer", daemon=True)
+                self._writer.start()
+                atexit.register(self.close)
+
+    def _run(self):
+        conn = self._connect()
+        next_compaction = time.monotonic()
+        stopping = False
+        while not stopping:
+            # Block for the first item, then take whatever else is already waiting
+            items = [self._queue.get()]
+            while len(items) < self.batch_size:
+                try:
+                    items.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            turns = [item for item in items if isinstance(item, tuple)]
+            if turns:
+                try:
+                    with conn:
+                        conn.executemany(
+                            'INSERT INTO turns (session, role, text, created_at) VALUES (?, ?, ?, ?)', turns
+                        )
+                    JOURNAL_TURNS.inc(len(turns))
+                except sqlite3.Error as e:
+                    log.error("Journal write failed, %d turns lost: %s", len(turns), e)
+                JOURNAL_PENDING.dec(len(turns))
+
+            for item in items:
+                if item is _STOP:
+                    stopping = True
+                elif isinstance(item, threading.Event):
+                    item.set()
+
+            if time.monotonic() >= next_compaction:
+                next_compaction = time.monotonic() + self.compact_interval
+                try:
+                    self.compact(conn)
+                except sqlite3.Error as e:
+                    log.error("Journal compaction failed: %s", e)
+        conn.close()
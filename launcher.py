@@ -1,5 +1,6 @@
 import subprocess
 import webbrowser
+import getpass
 import os
 from pathlib import Path
 
@@ -62,8 +63,18 @@ class Launcher:
             "study setup": ["youtube", "google drive", "notepad"],
         }
         
-        # Get current username for path substitution
-        self.username = os.getlogin()
+        self._username = None
+
+    @property
+    def username(self):
+        """Current username for path substitution, looked up on first launch."""
+        if self._username is None:
+            try:
+                self._username = os.getlogin()
+            except OSError:
+                # No controlling terminal (service, container); fall back to the environment
+                self._username = getpass.getuser()
+        return self._username
     
     def launch_desktop_app(self, app_name):
         """Launch a desktop application"""
@@ -0,0 +1,74 @@
+"""
+Lazy loading helpers for JARVIS.
+Keeps server start-up cheap by deferring subsystem construction and optional
+dependencies until the feature that needs them is actually used.
+"""
+import importlib
+import threading
+
+_MISSING = object()
+_optional_modules = {}
+
+
+def optional_import(name):
+    """
+    Import a module on first call and cache it.
+    Returns None (and remembers the failure) when the module is not installed.
+    """
+    module = _optional_modules.get(name, _MISSING)
+    if module is _MISSING:
+        try:
+            module = importlib.import_module(name)
+        except Exception:
+            module = None
+        _optional_modules[name] = module
+    return module
+
+
+class LazyProxy:
+    """
+    Stands in for a subsystem object until it is first used.
+    The wrapped object is built by importing `module_name` and calling `attr`
+    on the first attribute access, then every access is forwarded to it.
+    """
+
+    __slots__ = ("_module_name", "_attr", "_instance", "_lock")
+
+    def __init__(self, module_name, attr):
+        object.__setattr__(self, "_module_name", module_name)
+        object.__setattr__(self, "_attr", attr)
+        object.__setattr__(self, "_instance", None)
+        object.__setattr__(self, "_lock", threading.Lock())
+
+    def _resolve(self):
+        instance = object.__getattribute__(self, "_instance")
+        if instance is None:
+            with object.__getattribute__(self, "_lock"):
+                instance = object.__getattribute__(self, "_instance")
+                if instance is None:
+                    module = importlib.import_module(object.__getattribute__(self, "_module_name"))
+                    instance = getattr(module, object.__getattribute__(self, "_attr"))()
+                    object.__setattr__(self, "_instance", instance)
+        return instance
+
+    @property
+    def loaded(self):
+        return object.__getattribute__(self, "_instance") is not None
+
+    def __getattr__(self, name):
+        return getattr(self._resolve(), name)
+
+    def __setattr__(self, name, value):
+        setattr(self._resolve(), name, value)
+
+    def __repr__(self):
+        if self.loaded:
+            return repr(self._resolve())
+        return f"<lazy {object.__getattribute__(self, '_module_name')}.{object.__getattribute__(self, '_attr')}>"
+
+
+def subsystem(module_name, attr, lazy=True):
+    """Build a subsystem now, or return a LazyProxy that builds it on first use."""
+    if lazy:
+        return LazyProxy(module_name, attr)
+    return getattr(importlib.import_module(module_name), attr)()
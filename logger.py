@@ -0,0 +1,66 @@
+"""
+Logging setup for JARVIS.
+Records are level-gated and, by default, handed to a background thread through a
+queue so request threads never block on stdout.
+
+Environment:
+    JARVIS_LOG_LEVEL   DEBUG, INFO (default), WARNING, ...
+    JARVIS_LOG_ASYNC   1 (default) to write from a background thread, 0 to write inline
+"""
+import atexit
+import logging
+import logging.handlers
+import os
+import queue
+import sys
+
+_listener = None
+
+
+def setup_logging(level=None, async_mode=None):
+    """Configure the 'jarvis' logger once and return it."""
+    global _listener
+
+    logger = logging.getLogger("jarvis")
+    if logger.handlers:
+        return logger
+
+    level = level or os.environ.get("JARVIS_LOG_LEVEL", "INFO")
+    if async_mode is None:
+        async_mode = os.environ.get("JARVIS_LOG_ASYNC", "1") != "0"
+
+    logger.setLevel(level.upper() if isinstance(level, str) else level)
+    logger.propagate = False
+
+    stream = logging.StreamHandler(sys.stdout)
+    stream.setFormatter(logging.Formatter("[%(levelname)s] %(message)s"))
+
+    if async_mode:
+        records = queue.SimpleQueue()
+        logger.addHandler(logging.handlers.QueueHandler(records))
+        _listener = logging.handlers.QueueListener(records, stream)
+        _listener.start()
+        atexit.register(_listener.stop)
+    else:
+        logger.addHandler(stream)
+
+    return logger
+
+
+def reset_logging(async_mode=False):
+    """
+    Configure the 'jarvis' logger again in a worker process. A forked child keeps
+    the parent's QueueHandler but not its listener thread, so records would be
+    queued for nobody. Workers write inline by default.
+    """
+    global _listener
+    logger = logging.getLogger("jarvis")
+    for handler in list(logger.handlers):
+        logger.removeHandler(handler)
+    _listener = None
+    return setup_logging(async_mode=async_mode)
+
+
+def get_logger(name=None):
+    setup_logging()
+    return logging.getLogger(f"jarvis.{name}" if name else "jarvis")
@@ -1,9 +1,24 @@
 import sqlite3
 import os
+import re
+import time
+
+from logger import get_logger
+from state import StateError, default_backend
+
+log = get_logger("memory")
+
+# Words that carry no meaning in a recall question
+NOTE_STOPWORDS = frozenset(
+    "a an the is are was were be do did does i me my you your we it its to of in on at for about "
+    "and or that this what who how when where why tell told remember say said".split()
+)
 
 class MemoryCore:
-    def __init__(self, db_path="jarvis_memory.db"):
+    def __init__(self, db_path="jarvis_memory.db", state=None):
         self.db_path = db_path
+        # Context lives in the state backend; preferences are also mirrored there when it is shared
+        self.state = state if state is not None else default_backend()
         self.init_db()
 
     def init_db(self):
@@ -29,6 +44,35 @@ class MemoryCore:
             )
         ''')
         
+        # Notes: unlimited free-text memories, full-text indexed with FTS5.
+        # The FTS table is external-content, kept in sync by triggers.
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS notes (
+                id INTEGER PRIMARY KEY,
+                content TEXT NOT NULL,
+                created_at REAL NOT NULL
+            )
+        ''')
+        cursor.execute('CREATE INDEX IF NOT EXISTS notes_created_at ON notes (created_at)')
+        cursor.execute('''
+            CREATE VIRTUAL TABLE IF NOT EXISTS notes_fts USING fts5(
+                content, content='notes', content_rowid='id',
+                tokenize='porter unicode61', prefix='2 3'
+            )
+        ''')
+        cursor.executescript('''
+            CREATE TRIGGER IF NOT EXISTS notes_ai AFTER INSERT ON notes BEGIN
+                INSERT INTO notes_fts (rowid, content) VALUES (new.id, new.content);
+            END;
+            CREATE TRIGGER IF NOT EXISTS notes_ad AFTER DELETE ON notes BEGIN
+                INSERT INTO notes_fts (notes_fts, rowid, content) VALUES ('delete', old.id, old.content);
+            END;
+            CREATE TRIGGER IF NOT EXISTS notes_au AFTER UPDATE ON notes BEGIN
+                INSERT INTO notes_fts (notes_fts, rowid, content) VALUES ('delete', old.id, old.content);
+                INSERT INTO notes_fts (rowid, content) VALUES (new.id, new.content);
+            END;
+        ''')
+        
         conn.commit()
         conn.close()
 
@@ -38,9 +82,23 @@ class MemoryCore:
         cursor.execute('INSERT OR REPLACE INTO preferences (key, value) VALUES (?, ?)', (key, value))
         conn.commit()
         conn.close()
+        if self.state.shared:
+            try:
+                self.state.set(f"preference:{key}", value)
+            except StateError as e:
+                log.warning("Preference not shared: %s", e)
         return f"Preference '{key}' set to '{value}'."
 
     def get_preference(self, key):
+        if self.state.shared:
+            # SQLite holds every preference this node set; only other nodes' changes are lost
+            try:
+                value = self.state.get(f"preference:{key}")
+            except StateError as e:
+                log.warning("Shared preferences unavailable: %s", e)
+                value = None
+            if value is not None:
+                return value
         conn = sqlite3.connect(self.db_path)
         cursor = conn.cursor()
         cursor.execute('SELECT value FROM preferences WHERE key = ?', (key,))
@@ -64,11 +122,112 @@ class MemoryCore:
         conn.close()
         return [{"id": t[0], "description": t[1], "status": t[2]} for t in tasks]
 
-    # Context Memory (Transient)
-    context = {}
+    # Notes (Long-term, searchable)
+    def add_note(self, content, created_at=None):
+        return self.add_notes([(content, created_at)])[0]
+
+    def add_notes(self, notes):
+        """
+        Store many notes in one transaction.
+        Each note is a string or a (content, created_at) pair; returns the new ids.
+        """
+        now = time.time()
+        rows = []
+        for note in notes:
+            content, created_at = (note, None) if isinstance(note, str) else note
+            rows.append((content, created_at if created_at is not None else now))
+
+        # SQLite assigns the ids, so concurrent writers never pick the same one
+        conn = sqlite3.connect(self.db_path)
+        try:
+            cursor = conn.cursor()
+            ids = []
+            for content, created_at in rows:
+                cursor.execute('INSERT INTO notes (content, created_at) VALUES (?, ?)', (content, created_at))
+                ids.append(cursor.lastrowid)
+            conn.commit()
+        finally:
+            conn.close()
+        return ids
+
+    def recall_notes(self, query, limit=5, since=None, until=None, prefix=False):
+        """
+        Notes matching the words of `query`, best match first (BM25).
+        With prefix=True the last word also matches as a prefix ('proj' finds 'project').
+        since/until are Unix timestamps bounding created_at.
+        """
+        words = [w for w in re.findall(r"\w+", query.lower()) if w not in NOTE_STOPWORDS]
+        if not words:
+            return self.list_notes(limit, since, until)
+
+        terms = [f'"{w}"' for w in words]
+        if prefix:
+            terms[-1] += "*"
+        match = " OR ".join(terms)
+
+        sql = '''
+            SELECT n.id, n.content, n.created_at
+            FROM notes_fts JOIN notes n ON n.id = notes_fts.rowid
+            WHERE notes_fts MATCH ?
+        '''
+        params = [match]
+        sql, params = self._time_filter(sql, params, since, until)
+        sql += ' ORDER BY bm25(notes_fts) LIMIT ?'
+        params.append(limit)
+        return self._fetch_notes(sql, params)
+
+    def search_notes_prefix(self, prefix, limit=5, since=None, until=None):
+        """Notes containing a word that starts with `prefix`, newest first."""
+        words = re.findall(r"\w+", prefix.lower())
+        if not words:
+            return []
+        sql = '''
+            SELECT n.id, n.content, n.created_at
+            FROM notes_fts JOIN notes n ON n.id = notes_fts.rowid
+            WHERE notes_fts MATCH ?
+        '''
+        params = [" ".join(f'"{w}"' for w in words[:-1]) + f' "{words[-1]}"*']
+        sql, params = self._time_filter(sql, params, since, until)
+        sql += ' ORDER BY n.created_at DESC LIMIT ?'
+        params.append(limit)
+        return self._fetch_notes(sql, params)
+
+    def list_notes(self, limit=10, since=None, until=None):
+        """Most recent notes, optionally within a time range."""
+        sql = 'SELECT n.id, n.content, n.created_at FROM notes n WHERE 1 = 1'
+        sql, params = self._time_filter(sql, [], since, until)
+        sql += ' ORDER BY n.created_at DESC LIMIT ?'
+        params.append(limit)
+        return self._fetch_notes(sql, params)
+
+    def _time_filter(self, sql, params, since, until):
+        if since is not None:
+            sql += ' AND n.created_at >= ?'
+            params.append(since)
+        if until is not None:
+            sql += ' AND n.created_at < ?'
+            params.append(until)
+        return sql, params
+
+    def _fetch_notes(self, sql, params):
+        conn = sqlite3.connect(self.db_path)
+        cursor = conn.cursor()
+        cursor.execute(sql, params)
+        notes = cursor.fetchall()
+        conn.close()
+        return [{"id": n[0], "content": n[1], "created_at": n[2]} for n in notes]
 
+    # Context Memory (Transient, shared between nodes with the state backend)
+    # An unreachable state server forgets context rather than failing the command
     def set_context(self, key, value):
-        self.context[key] = value
+        try:
+            self.state.set(f"context:{key}", value)
+        except StateError as e:
+            log.warning("Context not saved: %s", e)
 
     def get_context(self, key):
-        return self.context.get(key)
+        try:
+            return self.state.get(f"context:{key}")
+        except StateError as e:
+            log.warning("Context unavailable: %s", e)
+            return None
@@ -0,0 +1,222 @@
+"""
+Lightweight metrics for JARVIS.
+Counters, gauges and fixed-bucket histograms that are cheap enough to update on
+every request, rendered in the Prometheus text exposition format for /metrics.
+"""
+import bisect
+import threading
+import time
+from contextlib import contextmanager
+
+# Latency buckets in seconds, from sub-millisecond local intents to slow web searches
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class _Metric:
+    type = None
+
+    def __init__(self, name, help_text, labelnames=()):
+        self.name = name
+        self.help = help_text
+        self.labelnames = tuple(labelnames)
+        self._children = {}
+        self._lock = threading.Lock()
+
+    def _key(self, labels):
+        return tuple(str(labels.get(name, "")) for name in self.labelnames)
+
+    def _label_str(self, key, extra=None):
+        pairs = list(zip(self.labelnames, key))
+        if extra:
+            pairs.append(extra)
+        if not pairs:
+            return ""
+        return "{" + ",".join(f'{k}="{v}"' for k, v in pairs) + "}"
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.type}"]
+        with self._lock:
+            children = sorted(self._children.items())
+        for key, value in children:
+            lines.extend(self._render_child(key, value))
+        return lines
+
+    def _render_child(self, key, value):
+        return [f"{self.name}{self._label_str(key)} {value}"]
+
+
+class Counter(_Metric):
+    type = "counter"
+
+    def inc(self, amount=1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._children[key] = self._children.get(key, 0) + amount
+
+    def value(self, **labels):
+        return self._children.get(self._key(labels), 0)
+
+
+class Gauge(_Metric):
+    type = "gauge"
+
+    def set(self, value, **labels):
+        with self._lock:
+            self._children[self._key(labels)] = value
+
+    def inc(self, amount=1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._children[key] = self._children.get(key, 0) + amount
+
+    def dec(self, amount=1, **labels):
+        self.inc(-amount, **labels)
+
+    def value(self, **labels):
+        return self._children.get(self._key(labels), 0)
+
+
+class Histogram(_Metric):
+    type = "histogram"
+
+    def __init__(self, name, help_text, labelnames=(), buckets=DEFAULT_BUCKETS):
+        super().__init__(name, help_text, labelnames)
+        self.buckets = tuple(buckets)
+
+    def observe(self, value, **labels):
+        key = self._key(labels)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            child = self._children.get(key)
+            if child is None:
+                # [per-bucket counts..., +Inf count, sum]
+                child = self._children[key] = [0] * (len(self.buckets) + 2)
+            child[index] += 1
+            child[-1] += value
+
+    @contextmanager
+    def time(self, **labels):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+
+    def count(self, **labels):
+        child = self._children.get(self._key(labels))
+        return sum(child[:-1]) if child else 0
+
+    def quantile(self, q, **labels):
+        """Estimate a quantile from the buckets (upper bound of the bucket that contains it)."""
+        child = self._children.get(self._key(labels))
+        if not child:
+            return None
+        counts = child[:-1]
+        rank = q * sum(counts)
+        seen = 0
+        for bound, count in zip(self.buckets + (float("inf"),), counts):
+            seen += count
+            if seen >= rank:
+                return bound
+        return float("inf")
+
+    def _render_child(self, key, child):
+        lines = []
+        cumulative = 0
+        for bound, count in zip(self.buckets, child):
+            cumulative += count
+            lines.append(f"{self.name}_bucket{self._label_str(key, ('le', bound))} {cumulative}")
+        cumulative += child[len(self.buckets)]
+        lines.append(f"{self.name}_bucket{self._label_str(key, ('le', '+Inf'))} {cumulative}")
+        lines.append(f"{self.name}_sum{self._label_str(key)} {child[-1]}")
+        lines.append(f"{self.name}_count{self._label_str(key)} {cumulative}")
+        return lines
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self._metrics = {}
+        self._lock = threading.Lock()
+
+    def _register(self, cls, name, *args, **kwargs):
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = self._metrics[name] = cls(name, *args, **kwargs)
+            return metric
+
+    def counter(self, name, help_text, labelnames=()):
+        return self._register(Counter, name, help_text, labelnames)
+
+    def gauge(self, name, help_text, labelnames=()):
+        return self._register(Gauge, name, help_text, labelnames)
+
+    def histogram(self, name, help_text, labelnames=(), buckets=DEFAULT_BUCKETS):
+        return self._register(Histogram, name, help_text, labelnames, buckets)
+
+    def render(self):
+        """Prometheus text exposition of every registered metric."""
+        with self._lock:
+            metrics = list(self._metrics.values())
+        lines = []
+        for metric in metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = MetricsRegistry()
+
+STAGE_SECONDS = REGISTRY.histogram(
+    "jarvis_stage_seconds",
+    "Time spent in each command_handler stage (dispatch includes the nested stages).",
+    ("stage",)
+)
+REQUEST_SECONDS = REGISTRY.histogram(
+    "jarvis_request_seconds",
+    "End-to-end request latency by endpoint.",
+    ("endpoint",)
+)
+REQUESTS = REGISTRY.counter(
+    "jarvis_requests_total",
+    "Requests served by endpoint and HTTP status.",
+    ("endpoint", "code")
+)
+
+
+def timed(stage):
+    """Context manager that records the enclosed block under jarvis_stage_seconds{stage}."""
+    return STAGE_SECONDS.time(stage=stage)
+
+
+class InstrumentedProxy:
+    """
+    Wraps a subsystem so every method call is timed as one stage.
+    Non-callable attributes are passed through untouched.
+    """
+
+    def __init__(self, target, stage, histogram=STAGE_SECONDS):
+        object.__setattr__(self, "_target", target)
+        object.__setattr__(self, "_stage", stage)
+        object.__setattr__(self, "_histogram", histogram)
+
+    def __getattr__(self, name):
+        attr = getattr(self._target, name)
+        if not callable(attr):
+            return attr
+        histogram = self._histogram
+        stage = self._stage
+
+        def call(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return attr(*args, **kwargs)
+            finally:
+                histogram.observe(time.perf_counter() - start, stage=stage)
+
+        return call
+
+    def __setattr__(self, name, value):
+        setattr(self._target, name, value)
+
+    def __repr__(self):
+        return f"<instrumented {self._stage}: {self._target!r}>"
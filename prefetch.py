@@ -0,0 +1,262 @@
+"""
+Speculative prefetch for JARVIS.
+Expensive answers (weather, web searches, the diagnostic snapshot) live in small
+TTL caches. After each command the PrefetchEngine guesses what comes next, from
+the hand-written predictions in server.py and from transition counts it learns
+per session, and warms the matching cache on a small budgeted executor. A later
+request that finds a prefetched entry records how long it would have waited.
+A cache given a shared state backend also publishes its entries there, so other
+nodes reuse them instead of repeating the upstream call.
+"""
+import collections
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from admission import TokenBucket
+from logger import get_logger
+from metrics import REGISTRY
+from state import StateError
+
+log = get_logger("prefetch")
+
+CACHE_LOOKUPS = REGISTRY.counter(
+    "jarvis_cache_lookups_total", "Cache lookups by cache and result (hit or miss).", ("cache", "result")
+)
+PREFETCH_JOBS = REGISTRY.counter(
+    "jarvis_prefetch_jobs_total", "Prefetch jobs by intent kind and outcome.", ("kind", "outcome")
+)
+PREFETCH_FILLED = REGISTRY.counter(
+    "jarvis_prefetch_filled_total", "Cache entries filled by a prefetch.", ("cache",)
+)
+PREFETCH_USED = REGISTRY.counter(
+    "jarvis_prefetch_used_total", "Prefetched cache entries later served to a request.", ("cache",)
+)
+PREFETCH_SAVED_SECONDS = REGISTRY.counter(
+    "jarvis_prefetch_saved_seconds_total", "Request latency avoided by serving prefetched entries.", ("cache",)
+)
+
+_local = threading.local()
+
+
+def prefetching():
+    """True on a thread that is running a prefetch job."""
+    return getattr(_local, "prefetching", False)
+
+
+class _Entry:
+    __slots__ = ("value", "expires", "cost", "prefetched")
+
+    def __init__(self, value, expires, cost, prefetched):
+        self.value = value
+        self.expires = expires
+        self.cost = cost
+        self.prefetched = prefetched
+
+
+class TTLCache:
+    def __init__(self, name, ttl, max_entries=256, shared=None):
+        self.name = name
+        self.ttl = ttl
+        self.max_entries = max_entries
+        # Optional shared StateBackend; the local entries stay the first level
+        self.shared = shared
+        self._entries = {}
+        self._lock = threading.Lock()
+
+    def _shared_key(self, key):
+        return f"cache:{self.name}:{key}"
+
+    def _get_shared(self, key):
+        """Entry another node published for key, copied into this cache."""
+        try:
+            payload = self.shared.get(self._shared_key(key))
+        except StateError as e:
+            log.warning("Shared %s cache unavailable: %s", self.name, e)
+            return None
+        if payload is None:
+            return None
+        expires_at, cost, value = payload
+        remaining = expires_at - time.time()
+        if remaining <= 0:
+            return None
+        entry = _Entry(value, time.monotonic() + remaining, cost, False)
+        with self._lock:
+            self._store(key, entry)
+        return entry
+
+    def _store(self, key, entry):
+        if len(self._entries) >= self.max_entries and key not in self._entries:
+            # Drop the entry closest to expiry
+            del self._entries[min(self._entries, key=lambda k: self._entries[k].expires)]
+        self._entries[key] = entry
+
+    def get(self, key):
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry.expires <= now:
+                del self._entries[key]
+                entry = None
+            used_prefetch = entry is not None and entry.prefetched and not prefetching()
+            if used_prefetch:
+                # Only the first request a prefetch serves counts as saved latency
+                entry.prefetched = False
+        if entry is None and self.shared is not None:
+            entry = self._get_shared(key)
+        if prefetching():
+            return entry.value if entry is not None else None
+        CACHE_LOOKUPS.inc(cache=self.name, result="hit" if entry is not None else "miss")
+        if used_prefetch:
+            PREFETCH_USED.inc(cache=self.name)
+            PREFETCH_SAVED_SECONDS.inc(entry.cost, cache=self.name)
+        return entry.value if entry is not None else None
+
+    def put(self, key, value, cost=0.0):
+        prefetched = prefetching()
+        with self._lock:
+            self._store(key, _Entry(value, time.monotonic() + self.ttl, cost, prefetched))
+        if prefetched:
+            PREFETCH_FILLED.inc(cache=self.name)
+        if self.shared is not None and self.ttl > 0:
+            try:
+                # Wall-clock expiry so other nodes keep the entry only as long as this one
+                self.shared.set(self._shared_key(key), [time.time() + self.ttl, cost, value], self.ttl)
+            except StateError as e:
+                log.warning("Shared %s cache unavailable: %s", self.name, e)
+
+    def get_or_compute(self, key, fn, should_cache=None):
+        """Cached value for key, else fn() (cached when should_cache(value) is not False)."""
+        value = self.get(key)
+        if value is None:
+            start = time.perf_counter()
+            value = fn()
+            if should_cache is None or should_cache(value):
+                self.put(key, value, time.perf_counter() - start)
+        return value
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+class PrefetchEngine:
+    """
+    Learns which intent follows which and runs registered warm-ups for likely next intents.
+    Intents are strings such as 'weather' or 'search:quantum computing'; the part before
+    the colon picks the warm-up and the rest is passed to it. Sessions and intents come
+    from clients, so every table is bounded: at most max_intents learned intents, the
+    max_following most recently seen successors of each, and the last intent of the
+    max_sessions most recently active sessions.
+    """
+
+    def __init__(self, workers=2, max_pending=4, per_minute=30, min_probability=0.3, min_observations=3,
+                 max_intents=1000, max_following=64, max_sessions=10000):
+        self.max_pending = max_pending
+        self.min_probability = min_probability
+        self.min_observations = min_observations
+        self.max_intents = max_intents
+        self.max_following = max_following
+        self.max_sessions = max_sessions
+        self._warmups = {}
+        self._transitions = {}
+        self._last = collections.OrderedDict()
+        self._pending = set()
+        self._budget = TokenBucket(per_minute / 60.0, per_minute, time.monotonic())
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="jarvis-prefetch")
+
+    def register(self, kind, warmup):
+        self._warmups[kind] = warmup
+
+    def learn(self, sequences):
+        """Seed transition counts from past intent sequences (None breaks a sequence)."""
+        with self._lock:
+            for sequence in sequences:
+                previous = None
+                for intent in sequence:
+                    if previous is not None and intent is not None:
+                        self._count(previous, intent)
+                    previous = intent
+
+    def _count(self, previous, intent):
+        following = self._transitions.get(previous)
+        if following is None:
+            if len(self._transitions) >= self.max_intents:
+                return
+            following = self._transitions[previous] = collections.OrderedDict()
+        count = following.get(intent)
+        if count is None:
+            if len(following) >= self.max_following:
+                following.popitem(last=False)
+            following[intent] = 1
+        else:
+            following[intent] = count + 1
+            following.move_to_end(intent)
+
+    def predict(self, intent):
+        """Learned next intents, most likely first."""
+        with self._lock:
+            following = dict(self._transitions.get(intent, {}))
+        total = sum(following.values())
+        if total < self.min_observations:
+            return []
+        ranked = sorted(following.items(), key=lambda item: -item[1])
+        return [nxt for nxt, count in ranked if count / total >= self.min_probability]
+
+    def after_command(self, session, intent, hints=()):
+        """Record the session's intent and warm up what is likely to follow it."""
+        with self._lock:
+            previous = self._last.get(session)
+            if intent is None:
+                self._last.pop(session, None)
+            else:
+                self._last[session] = intent
+                self._last.move_to_end(session)
+                if len(self._last) > self.max_sessions:
+                    self._last.popitem(last=False)
+                if previous is not None:
+                    self._count(previous, intent)
+
+        candidates = [hint for hint in hints if hint]
+        if intent is not None:
+            candidates += self.predict(intent)
+        for candidate in dict.fromkeys(candidates):
+            if candidate != intent:
+                self.schedule(candidate)
+
+    def schedule(self, intent):
+        """Start a warm-up for intent unless one is running, the queue is full or the budget is spent."""
+        kind, _, arg = intent.partition(":")
+        warmup = self._warmups.get(kind)
+        if warmup is None:
+            return False
+        with self._lock:
+            if intent in self._pending:
+                return False
+            if len(self._pending) >= self.max_pending:
+                PREFETCH_JOBS.inc(kind=kind, outcome="dropped_busy")
+                return False
+            if self._budget.take(1, time.monotonic()):
+                PREFETCH_JOBS.inc(kind=kind, outcome="dropped_budget")
+                return False
+            self._pending.add(intent)
+        PREFETCH_JOBS.inc(kind=kind, outcome="started")
+        self._executor.submit(self._run, intent, warmup, arg)
+        return True
+
+    def pending(self):
+        with self._lock:
+            return len(self._pending)
+
+    def _run(self, intent, warmup, arg):
+        _local.prefetching = True
+        try:
+            warmup(arg)
+        except Exception as e:
+            PREFETCH_JOBS.inc(kind=intent.partition(":")[0], outcome="error")
+            log.debug("Prefetch of %s failed: %s", intent, e)
+        finally:
+            _local.prefetching = False
+            with self._lock:
+                self._pending.discard(intent)
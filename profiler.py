@@ -0,0 +1,216 @@
+"""
+On-demand profiling for JARVIS.
+An admin can profile the next N seconds or N requests, or a single request, without
+restarting the server. Each session writes a .pstats file (cProfile, per request
+thread) and a .collapsed file (stack samples, ready for flamegraph.pl / speedscope).
+When no session is running the request hooks only check a boolean.
+
+From Python 3.12 cProfile hooks sys.monitoring, which allows one profiler per
+process at a time. There a request that overlaps another profiled request gets
+stack samples only.
+"""
+import cProfile
+import os
+import pstats
+import sys
+import threading
+import time
+import uuid
+
+from logger import get_logger
+
+log = get_logger("profiler")
+
+
+# Only one cProfile.Profile can be enabled at a time
+_EXCLUSIVE_CPROFILE = sys.version_info >= (3, 12)
+
+
+def _is_number(value):
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+class ProfileSession:
+    def __init__(self, mode="cprofile", seconds=None, requests=None, interval=0.005):
+        self.id = time.strftime("%Y%m%d-%H%M%S-") + uuid.uuid4().hex[:6]
+        self.mode = mode
+        self.deadline = time.monotonic() + seconds if seconds else None
+        self.remaining = requests
+        self.interval = interval
+        self.started_at = time.time()
+        self.requests = 0
+        self.profiles = []
+        self.stacks = {}
+        self.threads = set()
+        self.lock = threading.Lock()
+        self.done = threading.Event()
+        self.sampler = threading.Thread(target=self._sample, name=f"profiler-{self.id}", daemon=True)
+
+    def _sample(self):
+        """Sample the stacks of threads currently serving a profiled request."""
+        own = threading.get_ident()
+        while not self.done.wait(self.interval):
+            with self.lock:
+                threads = set(self.threads)
+            frames = sys._current_frames()
+            for ident in threads:
+                frame = frames.get(ident)
+                if frame is None or ident == own:
+                    continue
+                stack = []
+                while frame is not None:
+                    code = frame.f_code
+                    stack.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})")
+                    frame = frame.f_back
+                key = ";".join(reversed(stack))
+                self.stacks[key] = self.stacks.get(key, 0) + 1
+            if self.deadline is not None and time.monotonic() >= self.deadline:
+                break
+
+    def expired(self):
+        if self.deadline is not None and time.monotonic() >= self.deadline:
+            return True
+        return self.remaining is not None and self.requests >= self.remaining
+
+    def summary(self):
+        return {
+            "id": self.id,
+            "mode": self.mode,
+            "requests": self.requests,
+            "samples": sum(self.stacks.values()),
+            "started_at": self.started_at,
+        }
+
+
+class Profiler:
+    def __init__(self, output_dir=None):
+        self.output_dir = output_dir or os.environ.get("JARVIS_PROFILE_DIR", "profiles")
+        # Checked on every request, so it is a plain attribute rather than a property
+        self.active = False
+        self.session = None
+        self.last_result = None
+        self._lock = threading.Lock()
+        self._cprofile_lock = threading.Lock()
+
+    def start(self, mode="cprofile", seconds=None, requests=None):
+        """Start a session that ends after `seconds` or `requests`, whichever comes first."""
+        if mode not in ("cprofile", "sample"):
+            return {"status": "error", "message": f"Unknown profiling mode '{mode}'."}
+        if not seconds and not requests:
+            return {"status": "error", "message": "Specify a duration in seconds or a number of requests."}
+        if seconds is not None and not (_is_number(seconds) and 0 < seconds < float("inf")):
+            return {"status": "error", "message": "'seconds' must be a positive number."}
+        if requests is not None and not (_is_number(requests) and requests > 0 and float(requests).is_integer()):
+            return {"status": "error", "message": "'requests' must be a positive whole number."}
+        requests = int(requests) if requests is not None else None
+
+        with self._lock:
+            if self.session is not None:
+                return {"status": "error", "message": "A profiling session is already running.", "session": self.session.summary()}
+            self.session = ProfileSession(mode, seconds, requests)
+            self.session.sampler.start()
+            self.active = True
+            session = self.session
+
+        if seconds:
+            timer = threading.Timer(seconds, self._expire, args=(session,))
+            timer.daemon = True
+            timer.start()
+        return {"status": "success", "message": "Profiling started.", "session": session.summary()}
+
+    def stop(self):
+        with self._lock:
+            session = self.session
+            self.session = None
+            self.active = False
+        if session is None:
+            return {"status": "error", "message": "No profiling session is running."}
+        self.last_result = self._finish(session)
+        return self.last_result
+
+    def status(self):
+        session = self.session
+        return {
+            "status": "success",
+            "active": session is not None,
+            "session": session.summary() if session else None,
+            "last_result": self.last_result,
+        }
+
+    def begin_request(self, single=False):
+        """
+        Called before a request. Returns a token for end_request, or None when
+        this request is not being profiled.
+        """
+        if single:
+            session = ProfileSession("cprofile", requests=1, interval=0.001)
+            session.sampler.start()
+        else:
+            session = self.session
+            if session is None:
+                return None
+
+        ident = threading.get_ident()
+        with session.lock:
+            session.threads.add(ident)
+        profile = None
+        if session.mode == "cprofile" and (not _EXCLUSIVE_CPROFILE or self._cprofile_lock.acquire(blocking=False)):
+            profile = cProfile.Profile()
+            try:
+                profile.enable()
+            except ValueError as e:
+                # Another profiling tool holds sys.monitoring; the stack samples still run
+                log.warning("cProfile unavailable for this request: %s", e)
+                profile = None
+                if _EXCLUSIVE_CPROFILE:
+                    self._cprofile_lock.release()
+        return (session, profile, ident, single)
+
+    def end_request(self, token):
+        """Called after a profiled request. Returns the dump summary for single-request sessions."""
+        session, profile, ident, single = token
+        if profile is not None:
+            profile.disable()
+            if _EXCLUSIVE_CPROFILE:
+                self._cprofile_lock.release()
+        with session.lock:
+            session.threads.discard(ident)
+            if profile is not None:
+                session.profiles.append(profile)
+            session.requests += 1
+
+        if single:
+            return self._finish(session)
+        if session.expired():
+            self._expire(session)
+        return None
+
+    def _expire(self, session):
+        with self._lock:
+            if self.session is not session:
+                return
+            self.session = None
+            self.active = False
+        self.last_result = self._finish(session)
+
+    def _finish(self, session):
+        session.done.set()
+        session.sampler.join(timeout=1)
+        os.makedirs(self.output_dir, exist_ok=True)
+        base = os.path.join(self.output_dir, f"jarvis-{session.id}")
+        result = {"status": "success", "session": session.summary(), "files": {}}
+
+        if session.profiles:
+            stats = pstats.Stats(session.profiles[0])
+            for profile in session.profiles[1:]:
+                stats.add(profile)
+            stats.dump_stats(base + ".pstats")
+            result["files"]["pstats"] = base + ".pstats"
+
+        with open(base + ".collapsed", "w", encoding="utf-8") as f:
+            for stack, count in sorted(session.stacks.items()):
+                f.write(f"{stack} {count}\n")
+        result["files"]["collapsed"] = base + ".collapsed"
+
+        result["message"] = f"Profiled {session.requests} requests."
+        return result
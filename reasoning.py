@@ -2,9 +2,18 @@
 Reasoning Engine for JARVIS
 Provides intelligent interpretation and context-aware responses without requiring web search.
 """
+import os
+
+from lazy import optional_import
 
 class ReasoningEngine:
-    def __init__(self):
+    # Minimum cosine similarity for a semantic match to be trusted over a web search
+    SEMANTIC_THRESHOLD = 0.2
+    # Share of the query's content words that need a close word (half their trigrams)
+    # in the matched entry; the cosine alone lets "network engineer" match neural networks
+    SEMANTIC_MIN_COVERAGE = 0.5
+
+    def __init__(self, semantic=None, semantic_index_path=None, pool=None):
         self.knowledge_base = {
             # AI & Machine Learning
             "ai": "Artificial Intelligence (AI) refers to computer systems designed to perform tasks that typically require human intelligence, such as visual perception, speech recognition, decision-making, and language translation. AI systems learn from experience, adjust to new inputs, and perform human-like tasks.",
@@ -50,7 +59,38 @@ class ReasoningEngine:
             "mathematics": "Mathematics is the abstract science of numbers, quantity, structure, space, and change. It uses logic and symbolic notation to study patterns, relationships, and properties through rigorous proof and reasoning.",
         }
         
+        self.comparisons = {
+            ("python", "javascript"): "Python is primarily used for backend development, data science, and automation with simpler syntax. JavaScript is mainly used for frontend web development and runs in browsers, though it can also run on servers via Node.js. Python is interpreted and emphasizes readability, while JavaScript is event-driven and asynchronous.",
+            ("machine learning", "deep learning"): "Machine Learning is a broader field that includes various algorithms for learning from data, such as decision trees, random forests, and support vector machines. Deep Learning is a specialized subset that uses neural networks with multiple layers to automatically learn complex patterns, particularly effective for image recognition and natural language processing.",
+            ("cpu", "gpu"): "CPUs have fewer, more powerful cores optimized for sequential processing and general-purpose computing. GPUs have thousands of smaller cores designed for parallel processing, making them ideal for graphics rendering, AI training, and scientific computations that can be parallelized.",
+            ("ai", "machine learning"): "Artificial Intelligence is the broader concept of machines being able to carry out tasks in a smart way. Machine Learning is a specific subset of AI that focuses on the idea that machines can learn from data and improve from experience without being explicitly programmed for every scenario.",
+        }
+
+        # Longer explanations for "how" and "why" questions
+        self.explanations = {
+            "how neural networks work": "Neural networks work by mimicking how the human brain processes information. They consist of layers of interconnected nodes (neurons). The input layer receives data, hidden layers process it through weighted connections, and the output layer produces predictions. During training, the network adjusts these weights through backpropagation, learning to recognize patterns by minimizing errors between predictions and actual results. This allows them to learn complex relationships in data for tasks like image recognition and language processing.",
+            "how machine learning works": "Machine learning works by training algorithms on data to recognize patterns and make predictions. The process involves: 1) Collecting and preparing training data, 2) Choosing an appropriate algorithm, 3) Training the model by feeding it data and adjusting parameters to minimize errors, 4) Validating the model on new data, and 5) Using the trained model to make predictions on unseen data. The system improves its performance over time as it processes more examples.",
+            "why python is popular": "Python is popular because of its simple, readable syntax that resembles natural language, making it easy to learn for beginners. It has extensive libraries for data science, web development, and automation. The language is versatile, working across different platforms, and has strong community support with abundant resources and documentation. Its interpreted nature allows for rapid development and testing.",
+        }
+
         self.context_memory = {}
+
+        # Offline semantic retrieval (needs numpy/scipy); JARVIS_SEMANTIC=0 turns it off
+        if semantic is None:
+            semantic = os.environ.get("JARVIS_SEMANTIC", "1") != "0"
+        self.semantic = optional_import("semantic") if semantic else None
+        self.semantic_index_path = semantic_index_path or os.environ.get("JARVIS_SEMANTIC_INDEX")
+        self.semantic_index = None
+
+        # Answer in worker processes (see workers.py) when JARVIS_CPU_WORKERS is set;
+        # workers keep the knowledge base they started with
+        if pool is None:
+            from workers import default_pool
+            pool = default_pool()
+        self.pool = pool or None
+        # Answers come from the workers' own index, so one here would go unused
+        if self.semantic and not self.pool:
+            self.build_semantic_index()
     
     def can_answer_directly(self, query):
         """
@@ -90,6 +130,8 @@ class ReasoningEngine:
         Provide a reasoned answer to the query.
         Returns clean, complete answers without source labels.
         """
+        if self.pool:
+            return self.pool.call("reasoning", "answer", query, context)
         query_lower = query.lower()
         
         # Check knowledge base first
@@ -120,6 +162,11 @@ class ReasoningEngine:
             if result['status'] == 'success':
                 return result
         
+        # Paraphrased questions: nearest knowledge-base entry by meaning
+        result = self.semantic_answer(query_lower)
+        if result:
+            return result
+        
         # If we can't answer directly, indicate search is needed
         return {
             "status": "needs_search",
@@ -128,14 +175,7 @@ class ReasoningEngine:
     
     def _handle_comparison(self, query):
         """Handle comparison questions with clean, direct answers."""
-        comparisons = {
-            ("python", "javascript"): "Python is primarily used for backend development, data science, and automation with simpler syntax. JavaScript is mainly used for frontend web development and runs in browsers, though it can also run on servers via Node.js. Python is interpreted and emphasizes readability, while JavaScript is event-driven and asynchronous.",
-            ("machine learning", "deep learning"): "Machine Learning is a broader field that includes various algorithms for learning from data, such as decision trees, random forests, and support vector machines. Deep Learning is a specialized subset that uses neural networks with multiple layers to automatically learn complex patterns, particularly effective for image recognition and natural language processing.",
-            ("cpu", "gpu"): "CPUs have fewer, more powerful cores optimized for sequential processing and general-purpose computing. GPUs have thousands of smaller cores designed for parallel processing, making them ideal for graphics rendering, AI training, and scientific computations that can be parallelized.",
-            ("ai", "machine learning"): "Artificial Intelligence is the broader concept of machines being able to carry out tasks in a smart way. Machine Learning is a specific subset of AI that focuses on the idea that machines can learn from data and improve from experience without being explicitly programmed for every scenario.",
-        }
-        
-        for (term1, term2), explanation in comparisons.items():
+        for (term1, term2), explanation in self.comparisons.items():
             if term1 in query and term2 in query:
                 return {
                     "status": "success",
@@ -151,13 +191,13 @@ class ReasoningEngine:
             if "neural network" in query or "ai" in query:
                 return {
                     "status": "success",
-                    "message": "Neural networks work by mimicking how the human brain processes information. They consist of layers of interconnected nodes (neurons). The input layer receives data, hidden layers process it through weighted connections, and the output layer produces predictions. During training, the network adjusts these weights through backpropagation, learning to recognize patterns by minimizing errors between predictions and actual results. This allows them to learn complex relationships in data for tasks like image recognition and language processing.",
+                    "message": self.explanations["how neural networks work"],
                     "source": "reasoning"
                 }
             elif "machine learning" in query:
                 return {
                     "status": "success",
-                    "message": "Machine learning works by training algorithms on data to recognize patterns and make predictions. The process involves: 1) Collecting and preparing training data, 2) Choosing an appropriate algorithm, 3) Training the model by feeding it data and adjusting parameters to minimize errors, 4) Validating the model on new data, and 5) Using the trained model to make predictions on unseen data. The system improves its performance over time as it processes more examples.",
+                    "message": self.explanations["how machine learning works"],
                     "source": "reasoning"
                 }
         
@@ -169,12 +209,89 @@ class ReasoningEngine:
         if "python" in query and "popular" in query:
             return {
                 "status": "success",
-                "message": "Python is popular because of its simple, readable syntax that resembles natural language, making it easy to learn for beginners. It has extensive libraries for data science, web development, and automation. The language is versatile, working across different platforms, and has strong community support with abundant resources and documentation. Its interpreted nature allows for rapid development and testing.",
+                "message": self.explanations["why python is popular"],
                 "source": "reasoning"
             }
         
         return {"status": "needs_search", "message": "I need to research that reason."}
     
+    def _semantic_documents(self):
+        """(keys, indexed texts, answers) for every answer the engine can give."""
+        keys, texts, answers = [], [], []
+        for term, definition in self.knowledge_base.items():
+            keys.append(f"definition:{term}")
+            # Repeat the term so it outweighs incidental mentions in other entries
+            texts.append(f"{term} {term} {definition}")
+            answers.append(definition)
+        for (term1, term2), explanation in self.comparisons.items():
+            keys.append(f"comparison:{term1}|{term2}")
+            texts.append(f"{term1} versus {term2} difference {explanation}")
+            answers.append(explanation)
+        for topic, explanation in self.explanations.items():
+            keys.append(f"explanation:{topic}")
+            texts.append(f"{topic} {explanation}")
+            answers.append(explanation)
+        return keys, texts, answers
+
+    def build_semantic_index(self):
+        """
+        Build the TF-IDF index, or load it from semantic_index_path when the saved
+        index was built from the same documents. Call again after editing the knowledge base.
+        """
+        if not self.semantic:
+            return None
+        keys, texts, answers = self._semantic_documents()
+        self._semantic_answers = dict(zip(keys, answers))
+        self._semantic_texts = dict(zip(keys, texts))
+        self._semantic_grams = {}
+
+        SemanticIndex = self.semantic.SemanticIndex
+        path = self.semantic_index_path
+        if path and os.path.exists(path):
+            try:
+                index = SemanticIndex.load(path)
+                if index.fingerprint == SemanticIndex.fingerprint_of(keys, texts):
+                    self.semantic_index = index
+                    return index
+            except Exception:
+                pass
+
+        self.semantic_index = SemanticIndex().fit(keys, texts)
+        if path:
+            self.semantic_index.save(path)
+        return self.semantic_index
+
+    def semantic_match(self, query, k=3):
+        """
+        (key, score) of the closest indexed entry, or None unless it clears
+        SEMANTIC_THRESHOLD and holds more than SEMANTIC_MIN_COVERAGE of the query's words.
+        """
+        if self.semantic_index is None:
+            return None
+        matches = self.semantic_index.query(query, k)
+        if not matches or matches[0][1] < self.SEMANTIC_THRESHOLD:
+            return None
+        key, score = matches[0]
+        grams = self._semantic_grams.get(key)
+        if grams is None:
+            grams = self._semantic_grams[key] = self.semantic.word_grams(self._semantic_texts[key])
+        if self.semantic.word_coverage(query, grams) <= self.SEMANTIC_MIN_COVERAGE:
+            return None
+        return key, score
+
+    def semantic_answer(self, query, k=3):
+        """Answer from the closest indexed entry if semantic_match trusts it."""
+        match = self.semantic_match(query, k)
+        if match is None:
+            return None
+        key, score = match
+        return {
+            "status": "success",
+            "message": self._semantic_answers[key],
+            "source": "semantic",
+            "confidence": round(score, 3)
+        }
+
     def set_context(self, key, value):
         """Store context for follow-up questions."""
         self.context_memory[key] = value
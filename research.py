@@ -1,11 +1,57 @@
-from duckduckgo_search import DDGS
 import re
 
+from lazy import optional_import
+from prefetch import TTLCache
+from singleflight import SingleFlight
+from state import shared_backend
+
 class Researcher:
-    def __init__(self):
-        self.ddgs = DDGS()
+    # How long a caller waits for an identical search already in progress
+    FLIGHT_TIMEOUT = 15
+    # How long a successful result is reused (it may also have been prefetched)
+    CACHE_TTL = 300
+
+    def __init__(self, pool=None):
+        self._ddgs = None
+        self._flight = SingleFlight()
+        self.cache = TTLCache("search", self.CACHE_TTL, shared=shared_backend())
+        # Extractive summarizer (needs numpy); without it answers fall back to the top snippets
+        summarizer = optional_import("summarizer")
+        self.summarizer = summarizer.ExtractiveSummarizer() if summarizer else None
+        # Compose answers in worker processes (see workers.py) when JARVIS_CPU_WORKERS is set
+        if pool is None:
+            from workers import default_pool
+            pool = default_pool()
+        self.pool = pool or None
+
+    @property
+    def ddgs(self):
+        """The search client, created on the first search so start-up needs no network stack."""
+        if self._ddgs is None:
+            from duckduckgo_search import DDGS
+            self._ddgs = DDGS()
+        return self._ddgs
     
     def search(self, query):
+        """
+        Search, sharing one upstream request between concurrent identical queries and
+        reusing recent successful results. Each caller gets its own copy of the result dict.
+        """
+        key = " ".join(query.lower().split())
+        try:
+            result = self.cache.get_or_compute(
+                key,
+                lambda: self._flight.do(key, self._search, query, timeout=self.FLIGHT_TIMEOUT),
+                should_cache=lambda r: r.get("status") == "success"
+            )
+        except TimeoutError:
+            return {
+                "status": "error",
+                "message": "That search is taking longer than expected. Please try again in a moment."
+            }
+        return dict(result)
+
+    def _search(self, query):
         """
         Intelligent search that interprets questions and provides structured answers.
         Uses search results to enhance explanations, not replace them.
@@ -28,30 +74,10 @@ class Researcher:
                     "message": "I couldn't find relevant information for that query at the moment."
                 }
             
-            # Filter for English content
-            english_results = [r for r in results if self._is_english(r.get('body', '') + r.get('title', ''))]
-            
-            # If no English results, try to use the best available results anyway
-            # but extract only English portions or provide a general answer
-            if not english_results:
-                # Fallback: Use original results but extract English text only
-                english_results = self._extract_english_content(results[:3])
-            
-            if not english_results:
-                # Last resort: provide a general answer based on the query
-                return self._provide_general_answer(query)
-            
-            # Use top 3 English results
-            final_results = english_results[:3]
-            
-            # Interpret and structure the answer
-            answer = self._interpret_results(query, final_results)
-            
-            return {
-                "status": "success",
-                "message": answer,
-                "sources": [{"title": r.get('title', 'Source'), "url": r.get('href', '#')} for r in final_results]
-            }
+            # Filtering, sanitizing and summarizing are CPU-bound
+            if self.pool:
+                return self.pool.call("research", "compose", query, results)
+            return self.compose(query, results)
         
         except Exception as e:
             return {
@@ -59,6 +85,36 @@ class Researcher:
                 "message": f"I'm having trouble accessing that information right now. Could you rephrase your question?"
             }
 
+    def compose(self, query, results):
+        """The answer dict for raw search results: English-only, interpreted by question type."""
+        # Filter for English content
+        english_results = [r for r in results if self._is_english(r.get('body', '') + r.get('title', ''))]
+        
+        # If no English results, try to use the best available results anyway
+        # but extract only English portions or provide a general answer
+        if not english_results:
+            # Fallback: Use original results but extract English text only
+            english_results = self._extract_english_content(results[:3])
+        
+        if not english_results:
+            # Last resort: provide a general answer based on the query
+            return self._provide_general_answer(query)
+        
+        # Use top 3 English results
+        final_results = english_results[:3]
+        
+        # Interpret and structure the answer from every English result
+        answer = self._interpret_results(query, english_results)
+        
+        return {
+            "status": "success",
+            "message": answer,
+            "sources": [
+                {"title": r.get('title', 'Source'), "url": r.get('href', '#'), "snippet": r.get('body', '')}
+                for r in final_results
+            ]
+        }
+
     def _is_english(self, text):
         """
         Check if text is primarily English.
@@ -83,7 +139,7 @@ class Researcher:
         """
         # Extract key information from top results
         top_result = results[0]
-        snippets = [r.get('body', '') for r in results[:3] if r.get('body')]
+        snippets = [r.get('body', '') for r in results if r.get('body')]
         
         # Determine query type
         query_lower = query.lower()
@@ -110,6 +166,10 @@ class Researcher:
     
     def _format_definition(self, query, snippets, top_result):
         """Format definition-style answers - clean and direct"""
+        summary = self._summarize_snippets(snippets, query, max_chars=450)
+        if summary:
+            return summary
+
         # Just provide the definition cleanly
         if snippets:
             definition = self._sanitize_text(snippets[0][:400])
@@ -121,7 +181,8 @@ class Researcher:
     def _format_howto(self, query, snippets, top_result):
         """Format how-to style answers - clean and direct"""
         combined_text = ' '.join(snippets)
-        steps = re.findall(r'(\d+[\.\)]\s*[^\n]+)', combined_text)
+        # Each step ends at its first sentence terminator, not at the end of the snippet
+        steps = re.findall(r'(\d+[\.\)]\s*[^\n]+?(?:[.!?](?=\s|$)|$))', combined_text)
         
         if steps:
             clean_steps = []
@@ -134,6 +195,9 @@ class Researcher:
                 return " ".join(clean_steps)
         
         # Fallback to general guidance
+        summary = self._summarize_snippets(snippets, query)
+        if summary:
+            return summary
         guidance = self._sanitize_text(snippets[0][:400])
         if guidance:
             return guidance
@@ -142,6 +206,10 @@ class Researcher:
     
     def _format_who(self, query, snippets, top_result):
         """Format who-is style answers - clean and direct"""
+        summary = self._summarize_snippets(snippets, query, max_chars=600)
+        if summary:
+            return summary
+
         main_content = self._sanitize_text(snippets[0][:400])
         
         if len(snippets) > 1:
@@ -153,6 +221,10 @@ class Researcher:
     
     def _format_why(self, query, snippets, top_result):
         """Format why-style answers - clean and direct"""
+        summary = self._summarize_snippets(snippets, query, max_chars=600)
+        if summary:
+            return summary
+
         explanation = self._sanitize_text(snippets[0][:400])
         
         # Add additional context if available
@@ -165,6 +237,10 @@ class Researcher:
     
     def _format_general(self, query, snippets, top_result):
         """Format general answers - clean and direct"""
+        summary = self._summarize_snippets(snippets, query, max_chars=650)
+        if summary:
+            return summary
+
         main_answer = self._sanitize_text(snippets[0][:400])
         
         if len(snippets) > 1:
@@ -239,7 +315,21 @@ class Researcher:
         
         return sanitized
 
-    def summarize(self, text):
-        # Placeholder for a local LLM or summarization logic
-        # For now, we just return the text as is or truncated
-        return text[:500] + "..."
+    def _summarize_snippets(self, snippets, query, max_chars=500):
+        """Summary for the _format_* helpers, or None so they keep their snippet slicing."""
+        if self.summarizer is None:
+            return None
+        return self.summarize(snippets, query, max_chars)
+
+    def summarize(self, text, query="", max_chars=500):
+        """
+        Extractive summary of one text or a list of snippets, biased towards the query.
+        Sentences are ranked across all snippets, near-duplicates dropped, and the best
+        kept in reading order within max_chars.
+        """
+        snippets = [text] if isinstance(text, str) else list(text)
+        snippets = [self._sanitize_text(s) for s in snippets if s]
+        if self.summarizer is None:
+            combined = " ".join(s for s in snippets if s)
+            return combined[:max_chars] + "..." if len(combined) > max_chars else combined
+        return self.summarizer.summarize(snippets, query, max_chars)
@@ -0,0 +1,349 @@
+"""
+Timed jobs for JARVIS: reminders, delayed tasks and recurring automations.
+Jobs are stored in SQLite with an index on their due time and mirrored in an
+in-memory min-heap, so scheduling is one INSERT plus an O(log n) push. A single
+dispatcher thread sleeps on a condition until the earliest deadline (or until
+an earlier job is added) and hands due jobs to a small bounded executor.
+
+After a restart pending jobs are reloaded in (due time, id) order, so missed
+jobs catch up deterministically: one-off jobs overdue by less than
+catch_up_limit run once, older ones are marked missed, and a recurring job runs
+once for all the periods it missed and then resumes on its original cadence.
+A job that was running when the process died runs again (at least once).
+
+Environment (read by server.py):
+    JARVIS_SCHEDULE            database path (default jarvis_schedule.db), empty to disable
+    JARVIS_SCHEDULER_WORKERS   threads running jobs (default 2)
+"""
+import atexit
+import heapq
+import json
+import math
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from logger import get_logger
+from metrics import REGISTRY
+
+log = get_logger("scheduler")
+
+SCHEDULER_JOBS = REGISTRY.counter(
+    "jarvis_scheduler_jobs_total", "Scheduled jobs finished, by action and outcome.", ("action", "outcome")
+)
+SCHEDULER_PENDING = REGISTRY.gauge("jarvis_scheduler_pending", "Jobs waiting for their due time.")
+SCHEDULER_WAKEUPS = REGISTRY.counter("jarvis_scheduler_wakeups_total", "Times the dispatcher thread woke up.")
+SCHEDULER_LAG = REGISTRY.histogram(
+    "jarvis_scheduler_lag_seconds", "Delay between a job's due time and the start of its run.",
+    buckets=(0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1, 5, 30, 300)
+)
+
+# Upper bound on one sleep, so a wall-clock jump is noticed within a minute
+MAX_SLEEP = 60.0
+
+
+class Job:
+    __slots__ = ("id", "action", "payload", "due_at", "interval", "key", "cancelled")
+
+    def __init__(self, id, action, payload, due_at, interval=None, key=None):
+        self.id = id
+        self.action = action
+        self.payload = payload
+        self.due_at = due_at
+        self.interval = interval
+        self.key = key
+        self.cancelled = False
+
+    def to_dict(self):
+        return {"id": self.id, "action": self.action, "payload": self.payload, "due_at": self.due_at,
+                "interval": self.interval, "key": self.key}
+
+    def next_due(self, now):
+        """First due time on this job's cadence after now; missed periods collapse into one run."""
+        periods = math.floor((now - self.due_at) / self.interval) + 1
+        return self.due_at + max(periods, 1) * self.interval
+
+
+class Scheduler:
+    def __init__(self, path="jarvis_schedule.db", workers=2, catch_up_limit=86400, keep_finished_days=30):
+        self.path = path
+        self.workers = workers
+        self.catch_up_limit = catch_up_limit
+        self.keep_finished = keep_finished_days * 86400
+        self._actions = {}
+        self._heap = []
+        self._jobs = {}
+        self._running = {}
+        self._finished = []
+        self._slots = threading.BoundedSemaphore(workers * 2)
+        self._wake = threading.Condition()
+        self._db_lock = threading.Lock()
+        self._executor = None
+        self._dispatcher = None
+        self._loaded = False
+        self._stopping = False
+
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute('PRAGMA journal_mode = WAL')
+        self._conn.execute('PRAGMA synchronous = NORMAL')
+        self._conn.execute('''
+            CREATE TABLE IF NOT EXISTS jobs (
+                id INTEGER PRIMARY KEY,
+                action TEXT NOT NULL,
+                payload TEXT,
+                due_at REAL NOT NULL,
+                interval REAL,
+                key TEXT UNIQUE,
+                status TEXT NOT NULL DEFAULT 'pending',
+                last_run REAL
+            )
+        ''')
+        # Only pending jobs are ever looked up by due time
+        self._conn.execute("CREATE INDEX IF NOT EXISTS jobs_due ON jobs (due_at, id) WHERE status = 'pending'")
+        self._conn.commit()
+
+    def register(self, action, fn):
+        """fn(payload) runs when a job with this action is due."""
+        self._actions[action] = fn
+
+    def schedule(self, action, payload=None, due_at=None, delay=0, interval=None, key=None):
+        """
+        Add a job and return its id. due_at is a Unix time (default now + delay);
+        interval makes it recurring. A job with the same key replaces the old one.
+        """
+        return self.schedule_many([(action, payload, due_at, delay, interval, key)])[0]
+
+    def schedule_many(self, jobs):
+        """Add (action, payload, due_at, delay, interval, key) tuples in one transaction; returns their ids."""
+        now = time.time()
+        rows = []
+        for action, payload, due_at, delay, interval, key in jobs:
+            rows.append((action, json.dumps(payload), now + (delay or 0) if due_at is None else due_at,
+                         interval or None, key))
+        with self._db_lock:
+            replaced = self._replace_keys([row[4] for row in rows if row[4] is not None])
+            with self._conn:
+                (first,) = self._conn.execute('SELECT COALESCE(MAX(id), 0) + 1 FROM jobs').fetchone()
+                self._conn.executemany(
+                    'INSERT INTO jobs (id, action, payload, due_at, interval, key) VALUES (?, ?, ?, ?, ?, ?)',
+                    [(first + i,) + row for i, row in enumerate(rows)]
+                )
+        added = [Job(first + i, row[0], json.loads(row[1]), row[2], row[3], row[4]) for i, row in enumerate(rows)]
+        with self._wake:
+            for job_id in replaced:
+                self._drop(job_id)
+            if self._loaded:
+                earliest = self._heap[0][0] if self._heap else math.inf
+                for job in added:
+                    self._jobs[job.id] = job
+                    heapq.heappush(self._heap, (job.due_at, job.id))
+                SCHEDULER_PENDING.set(len(self._jobs))
+                # Only an earlier deadline changes how long the dispatcher should sleep
+                if min(job.due_at for job in added) < earliest:
+                    self._wake.notify()
+        return [job.id for job in added]
+
+    def _replace_keys(self, keys):
+        """Cancel the jobs holding any of keys; returns their ids. Caller holds _db_lock."""
+        if not keys:
+            return []
+        ids = []
+        for key in keys:
+            row = self._conn.execute('SELECT id FROM jobs WHERE key = ?', (key,)).fetchone()
+            if row:
+                ids.append(row[0])
+        if ids:
+            # Finished jobs just give up the key
+            with self._conn:
+                self._conn.executemany(
+                    "UPDATE jobs SET key = NULL, status = CASE status WHEN 'pending' THEN 'cancelled' ELSE status END "
+                    "WHERE id = ?", [(i,) for i in ids]
+                )
+        return ids
+
+    def cancel(self, job_id):
+        """Cancel a pending or recurring job; returns False when there was nothing to cancel."""
+        with self._db_lock, self._conn:
+            cancelled = self._conn.execute(
+                "UPDATE jobs SET status = 'cancelled', key = NULL WHERE id = ? AND status = 'pending'", (job_id,)
+            ).rowcount
+        with self._wake:
+            self._drop(job_id)
+        return bool(cancelled)
+
+    def _drop(self, job_id):
+        # The heap entry is left behind and skipped when it surfaces
+        self._jobs.pop(job_id, None)
+        running = self._running.get(job_id)
+        if running is not None:
+            running.cancelled = True
+        SCHEDULER_PENDING.set(len(self._jobs))
+
+    def pending(self, action=None, limit=50):
+        """The next pending jobs by due time, as dicts."""
+        sql = "SELECT id, action, payload, due_at, interval, key FROM jobs WHERE status = 'pending'"
+        params = []
+        if action is not None:
+            sql += ' AND action = ?'
+            params.append(action)
+        sql += ' ORDER BY due_at, id LIMIT ?'
+        params.append(limit)
+        with self._db_lock:
+            rows = self._conn.execute(sql, params).fetchall()
+        return [Job(r[0], r[1], json.loads(r[2]), r[3], r[4], r[5]).to_dict() for r in rows]
+
+    def start(self):
+        """Start the dispatcher; pending jobs are loaded on its thread so start-up does not wait."""
+        with self._wake:
+            if self._dispatcher is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="jarvis-job")
+                self._dispatcher = threading.Thread(target=self._run, name="scheduler", daemon=True)
+                self._dispatcher.start()
+                atexit.register(self.stop)
+        return self
+
+    def stop(self, timeout=5):
+        """Stop dispatching, let running jobs finish and record them."""
+        with self._wake:
+            if self._stopping:
+                return
+            self._stopping = True
+            self._wake.notify()
+        if self._dispatcher is not None:
+            self._dispatcher.join(timeout)
+            self._executor.shutdown(wait=True)
+        self._record_finished()
+        with self._db_lock:
+            self._conn.close()
+
+    def wait_idle(self, timeout=None):
+        """Wait until nothing is due or running (jobs due later may remain). Returns False on timeout."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._wake:
+            while True:
+                due = self._heap and self._heap[0][0] <= time.time()
+                if self._loaded and not due and not self._running and not self._finished:
+                    return True
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._wake.wait(min(remaining or 0.05, 0.05))
+
+    def _load(self):
+        now = time.time()
+        with self._db_lock:
+            with self._conn:
+                missed = self._conn.execute(
+                    "UPDATE jobs SET status = 'missed' WHERE status = 'pending' AND interval IS NULL AND due_at < ?",
+                    (now - self.catch_up_limit,)
+                ).rowcount
+                self._conn.execute(
+                    "DELETE FROM jobs WHERE status != 'pending' AND COALESCE(last_run, due_at) < ?",
+                    (now - self.keep_finished,)
+                )
+            rows = self._conn.execute(
+                "SELECT id, action, payload, due_at, interval, key FROM jobs WHERE status = 'pending' "
+                "ORDER BY due_at, id"
+            ).fetchall()
+        if missed:
+            log.warning("%d one-off jobs were overdue by more than %.0fs; marked missed.", missed, self.catch_up_limit)
+        with self._wake:
+            for r in rows:
+                # Jobs scheduled while loading are already in the heap
+                if r[0] not in self._jobs:
+                    self._jobs[r[0]] = Job(r[0], r[1], json.loads(r[2]), r[3], r[4], r[5])
+                    self._heap.append((r[3], r[0]))
+            heapq.heapify(self._heap)
+            self._loaded = True
+            SCHEDULER_PENDING.set(len(self._jobs))
+        overdue = sum(1 for r in rows if r[3] <= now)
+        log.info("Scheduler loaded %d pending jobs (%d to catch up).", len(rows), overdue)
+
+    def _run(self):
+        try:
+            self._load()
+        except sqlite3.Error as e:
+            log.error("Scheduler could not load pending jobs: %s", e)
+            with self._wake:
+                self._loaded = True
+        while True:
+            self._record_finished()
+            with self._wake:
+                job = self._next_due()
+                if job is None:
+                    if self._stopping:
+                        return
+                    timeout = MAX_SLEEP
+                    if self._heap:
+                        timeout = min(max(self._heap[0][0] - time.time(), 0), MAX_SLEEP)
+                    if not self._finished:
+                        self._wake.wait(timeout)
+                        SCHEDULER_WAKEUPS.inc()
+                    continue
+                if self._stopping:
+                    return
+            # Block here, not in the executor queue, when every slot is busy
+            self._slots.acquire()
+            SCHEDULER_LAG.observe(max(time.time() - job.due_at, 0))
+            self._executor.submit(self._execute, job)
+
+    def _next_due(self):
+        """Pop the earliest due live job into _running, or None. Caller holds _wake."""
+        now = time.time()
+        while self._heap and self._heap[0][0] <= now:
+            due_at, job_id = heapq.heappop(self._heap)
+            job = self._jobs.get(job_id)
+            if job is None or job.due_at != due_at:
+                continue
+            del self._jobs[job_id]
+            self._running[job_id] = job
+            SCHEDULER_PENDING.set(len(self._jobs))
+            return job
+        return None
+
+    def _execute(self, job):
+        outcome = "ok"
+        try:
+            action = self._actions.get(job.action)
+            if action is None:
+                raise LookupError(f"no action registered for '{job.action}'")
+            action(job.payload)
+        except Exception as e:
+            outcome = "error"
+            log.error("Scheduled job %s (%s) failed: %s", job.id, job.action, e)
+        finally:
+            self._slots.release()
+        SCHEDULER_JOBS.inc(action=job.action, outcome=outcome)
+
+        finished_at = time.time()
+        with self._wake:
+            del self._running[job.id]
+            if job.interval and not job.cancelled:
+                job.due_at = job.next_due(finished_at)
+                self._jobs[job.id] = job
+                heapq.heappush(self._heap, (job.due_at, job.id))
+                SCHEDULER_PENDING.set(len(self._jobs))
+                status = "pending"
+            else:
+                status = "done" if outcome == "ok" else "failed"
+            self._finished.append((status, finished_at, job.due_at, job.id))
+            self._wake.notify_all()
+
+    def _record_finished(self):
+        """Write finished runs (and recurring jobs' next due times) in one transaction."""
+        with self._wake:
+            finished, self._finished = self._finished, []
+        if not finished:
+            return
+        try:
+            with self._db_lock, self._conn:
+                # A job cancelled while running keeps its cancelled status
+                self._conn.executemany(
+                    "UPDATE jobs SET status = ?, last_run = ?, due_at = ? WHERE id = ? AND status = 'pending'",
+                    finished
+                )
+        except sqlite3.Error as e:
+            log.error("Scheduler could not record %d finished jobs: %s", len(finished), e)
+        with self._wake:
+            self._wake.notify_all()
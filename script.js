@@ -4,6 +4,9 @@
 // a friendly male‑voice TTS engine, command handling, and system stats.
 // ------------------------------------------------------------
 
+// Empty when the page is served by the backend (same origin, no CORS preflight)
+const API_BASE = document.querySelector('meta[name="jarvis-api"]')?.content ?? 'http://localhost:5000';
+
 document.addEventListener('DOMContentLoaded', () => {
     // ------------------- Particle System -------------------
     const canvas = document.getElementById('particles-canvas');
@@ -88,12 +91,14 @@ document.addEventListener('DOMContentLoaded', () => {
         msgDiv.textContent = sender === 'ai' ? `JARVIS: ${text}` : `BOSS: ${text}`;
         chatHistory.appendChild(msgDiv);
         chatHistory.scrollTop = chatHistory.scrollHeight;
+        return msgDiv;
     };
 
     // ------------------- TTS (Male Voice) -------------------
-    const speak = (text) => {
+    // queued: play after what is already speaking (the rest of a streamed answer)
+    const speak = (text, queued = false) => {
         if (!('speechSynthesis' in window)) return;
-        window.speechSynthesis.cancel(); // Interrupt current speech
+        if (!queued) window.speechSynthesis.cancel(); // Interrupt current speech
         const utterance = new SpeechSynthesisUtterance(text);
         const voices = window.speechSynthesis.getVoices();
         const maleNames = [
@@ -163,24 +168,57 @@ document.addEventListener('DOMContentLoaded', () => {
             speak('Closing biometric monitor.');
             return;
         }
-        // General commands – forward to backend
+        // General commands – forward to backend, speaking each sentence as it arrives
         try {
-            const response = await fetch('http://localhost:5000/command', {
+            const response = await fetch(`${API_BASE}/command/stream`, {
                 method: 'POST',
-                headers: { 'Content-Type': 'application/json' },
+                headers: { 'Content-Type': 'application/json', 'Accept': 'application/x-ndjson' },
                 body: JSON.stringify({ command })
             });
-            const data = await response.json();
-            if (data.status === 'success') {
-                addMessage(data.message, 'ai');
-                speak(data.message);
+            let reply = null;
+            let speaking = false;
+            const showResult = (data) => {
+                if (!reply) {
+                    addMessage(data.message, 'ai');
+                    speak(data.message);
+                }
                 if (data.data && Array.isArray(data.data) && data.data.length) {
                     const top = data.data[0];
                     addMessage(`Result: ${top.title}`, 'ai');
                 }
-            } else {
-                addMessage(data.message, 'ai');
-                speak(data.message);
+            };
+            const handleChunk = (chunk) => {
+                if (chunk.done) {
+                    showResult(chunk);
+                } else if (chunk.holding) {
+                    showNotification('PROCESSING');
+                    speak(chunk.text);
+                    speaking = true;
+                } else {
+                    if (reply) reply.textContent += ` ${chunk.text}`;
+                    else reply = addMessage(chunk.text, 'ai');
+                    chatHistory.scrollTop = chatHistory.scrollHeight;
+                    speak(chunk.text, speaking);
+                    speaking = true;
+                }
+            };
+            // Rejections (429/503) and old backends answer with one JSON body
+            if (!response.body || !(response.headers.get('Content-Type') || '').includes('ndjson')) {
+                showResult(await response.json());
+                return;
+            }
+            const reader = response.body.getReader();
+            const decoder = new TextDecoder();
+            let buffered = '';
+            for (;;) {
+                const { value, done } = await reader.read();
+                if (done) break;
+                buffered += decoder.decode(value, { stream: true });
+                const lines = buffered.split('\n');
+                buffered = lines.pop();
+                for (const line of lines) {
+                    if (line.trim()) handleChunk(JSON.parse(line));
+                }
             }
         } catch (e) {
             addMessage('Neural Link Offline.', 'ai');
@@ -270,7 +308,7 @@ document.addEventListener('DOMContentLoaded', () => {
     };
     const fetchStats = async () => {
         try {
-            const response = await fetch('http://localhost:5000/stats');
+            const response = await fetch(`${API_BASE}/stats`);
             const data = await response.json();
             const jitter = (Math.random() - 0.5) * 2;
             const cpuVal = Math.min(100, Math.max(0, data.cpu + jitter));
@@ -312,10 +350,29 @@ document.addEventListener('DOMContentLoaded', () => {
     };
     setInterval(fetchStats, 1000);
 
+    // ------------------- Scheduled Reminders -------------------
+    let remindersSeen = Date.now() / 1000;
+    const fetchReminders = async () => {
+        try {
+            const response = await fetch(`${API_BASE}/reminders`);
+            const data = await response.json();
+            for (const reminder of data.delivered || []) {
+                if (reminder.at <= remindersSeen) continue;
+                remindersSeen = reminder.at;
+                showNotification('REMINDER');
+                addMessage(reminder.message, 'ai');
+                speak(reminder.message);
+            }
+        } catch (e) {
+            // silent fail
+        }
+    };
+    setInterval(fetchReminders, 5000);
+
     // ------------------- Personalized Greeting -------------------
     setTimeout(async () => {
         try {
-            const response = await fetch('/command', {
+            const response = await fetch(`${API_BASE}/command`, {
                 method: 'POST',
                 headers: { 'Content-Type': 'application/json' },
                 body: JSON.stringify({ command: 'get user name' })
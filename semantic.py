@@ -0,0 +1,185 @@
+"""
+Semantic retrieval for the JARVIS knowledge base.
+Documents are embedded as sparse TF-IDF vectors over hashed features (words plus
+character trigrams, so 'nets' still overlaps 'networks'), and a query is answered
+with one sparse matrix-vector product and a top-k selection. word_coverage checks
+a match word by word on the same trigrams, so a query that shares only one word
+with an entry ('network engineer') can be told apart from a paraphrase.
+Requires numpy and scipy.
+"""
+import hashlib
+import json
+import re
+import zlib
+
+import numpy as np
+from scipy import sparse
+
+STOPWORDS = frozenset(
+    "a an the is are was were be been do does did doing what whats who whom how why when where which "
+    "of in on at to for from by with about into and or but if then than so as it its this that these those "
+    "i me my you your we our they them he she his her can could would should will shall may might must "
+    "tell explain define describe mean means please there here some any much many more most".split()
+)
+
+TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+
+def tokenize(text):
+    return [t for t in TOKEN_RE.findall(text.lower()) if t not in STOPWORDS]
+
+
+def char_ngrams(token, n=3):
+    """Character n-grams of token, with '<' and '>' marking its ends."""
+    padded = f"<{token}>"
+    return [padded[i:i + n] for i in range(len(padded) - n + 1)]
+
+
+def word_grams(text, n=3):
+    """{char n-gram: ids of the content words of text that contain it}, for word_coverage."""
+    grams = {}
+    for word_id, token in enumerate(set(tokenize(text))):
+        for gram in char_ngrams(token, n):
+            grams.setdefault(gram, set()).add(word_id)
+    return grams
+
+
+def word_coverage(query, grams, n=3):
+    """
+    Share of the query's content words that have a close word in a document, given
+    the document's word_grams. A word counts when one document word holds at least
+    half of its character n-grams, so 'nets' matches 'networks' but 'engineer'
+    matches nothing in an entry about neural networks.
+    """
+    words = set(tokenize(query))
+    if not words:
+        return 0.0
+    covered = 0
+    for word in words:
+        own = char_ngrams(word, n)
+        hits = {}
+        for gram in own:
+            for word_id in grams.get(gram, ()):
+                hits[word_id] = hits.get(word_id, 0) + 1
+        covered += bool(hits) and 2 * max(hits.values()) >= len(own)
+    return covered / len(words)
+
+
+class SemanticIndex:
+    def __init__(self, n_features=2 ** 20, char_ngrams=3, char_weight=0.5):
+        self.n_features = n_features
+        self.char_ngrams = char_ngrams
+        self.char_weight = char_weight
+        self.keys = []
+        self.matrix = None
+        self.idf = None
+        self.fingerprint = None
+
+    def _features_of_token(self, token, cache):
+        features = cache.get(token) if cache is not None else None
+        if features is None:
+            features = [(zlib.crc32(b"w:" + token.encode()) % self.n_features, 1.0)]
+            for gram in char_ngrams(token, self.char_ngrams):
+                features.append((zlib.crc32(b"c:" + gram.encode()) % self.n_features, self.char_weight))
+            if cache is not None:
+                cache[token] = features
+        return features
+
+    def _features(self, text, cache=None):
+        """Hashed feature counts {column: weight} for a piece of text."""
+        counts = {}
+        for token in tokenize(text):
+            for col, weight in self._features_of_token(token, cache):
+                counts[col] = counts.get(col, 0.0) + weight
+        return counts
+
+    @staticmethod
+    def fingerprint_of(keys, texts):
+        h = hashlib.sha1()
+        for key, text in zip(keys, texts):
+            h.update(str(key).encode())
+            h.update(b"\0")
+            h.update(text.encode())
+            h.update(b"\0")
+        return h.hexdigest()
+
+    def fit(self, keys, texts):
+        """Build the document matrix for parallel lists of keys and texts."""
+        indptr = [0]
+        indices = []
+        data = []
+        # Vocabulary repeats across documents, so hash each distinct token once
+        cache = {}
+        for text in texts:
+            counts = self._features(text, cache)
+            indices.extend(counts.keys())
+            data.extend(counts.values())
+            indptr.append(len(indices))
+
+        tf = sparse.csr_matrix(
+            (np.asarray(data, dtype=np.float32), np.asarray(indices, dtype=np.int32), np.asarray(indptr, dtype=np.int64)),
+            shape=(len(texts), self.n_features)
+        )
+        # Sublinear term frequency, smoothed inverse document frequency
+        tf.data = 1.0 + np.log(tf.data, dtype=np.float32)
+        df = np.bincount(tf.indices, minlength=self.n_features)
+        self.idf = (np.log((1.0 + len(texts)) / (1.0 + df)) + 1.0).astype(np.float32)
+
+        matrix = tf.multiply(self.idf).tocsr()
+        norms = np.sqrt(matrix.multiply(matrix).sum(axis=1)).A1
+        norms[norms == 0] = 1.0
+        matrix = sparse.diags((1.0 / norms).astype(np.float32)) @ matrix
+
+        # Column-major so a query only touches the columns of its own features
+        self.matrix = matrix.tocsc()
+        self.keys = list(keys)
+        self.fingerprint = self.fingerprint_of(keys, texts)
+        return self
+
+    def query(self, text, k=3):
+        """Return up to k (key, cosine score) pairs, best first."""
+        if self.matrix is None or not self.keys:
+            return []
+        counts = self._features(text)
+        if not counts:
+            return []
+
+        cols = np.fromiter(counts.keys(), dtype=np.int64, count=len(counts))
+        weights = np.fromiter(counts.values(), dtype=np.float32, count=len(counts))
+        weights = (1.0 + np.log(weights)) * self.idf[cols]
+        norm = np.linalg.norm(weights)
+        if norm == 0:
+            return []
+
+        scores = self.matrix[:, cols] @ (weights / norm)
+        k = min(k, len(scores))
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top])]
+        return [(self.keys[i], float(scores[i])) for i in top if scores[i] > 0]
+
+    def save(self, path):
+        csc = self.matrix
+        with open(path, "wb") as f:
+            np.savez_compressed(
+                f,
+                data=csc.data, indices=csc.indices, indptr=csc.indptr, shape=np.asarray(csc.shape),
+                idf=self.idf,
+                meta=np.asarray(json.dumps({
+                    "keys": self.keys,
+                    "fingerprint": self.fingerprint,
+                    "n_features": self.n_features,
+                    "char_ngrams": self.char_ngrams,
+                    "char_weight": self.char_weight,
+                }))
+            )
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path, allow_pickle=False) as f:
+            meta = json.loads(str(f["meta"]))
+            index = cls(meta["n_features"], meta["char_ngrams"], meta["char_weight"])
+            index.matrix = sparse.csc_matrix((f["data"], f["indices"], f["indptr"]), shape=tuple(f["shape"]))
+            index.idf = f["idf"]
+        index.keys = meta["keys"]
+        index.fingerprint = meta["fingerprint"]
+        return index
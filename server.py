@@ -1,25 +1,188 @@
-import time
-import psutil
-import GPUtil
-from flask import Flask, jsonify
-from flask_cors import CORS
+import os
+import hmac
+import math
+import queue
+import re
 import threading
+import time
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from flask import Flask, jsonify, g, request, Response
+
+import encoding
+from admission import ADMISSION_REJECTED, AdmissionController, ConcurrencyPool
+from lazy import optional_import, subsystem
+from logger import get_logger
+from metrics import REGISTRY, REQUESTS, REQUEST_SECONDS, STAGE_SECONDS, InstrumentedProxy, timed
+from prefetch import PrefetchEngine, TTLCache
+from profiler import Profiler
+from journal import ConversationJournal
+from scheduler import Scheduler
+from singleflight import SingleFlight
+from traffic import TrafficRecorder
+from state import StateError, default_backend, shared_backend
+from workers import default_pool
+
+app = encoding.install(Flask(__name__))
+
+# CORS is only needed when the dashboard is opened from another origin
+flask_cors = optional_import("flask_cors")
+if flask_cors:
+    flask_cors.CORS(app)
+
+# `python server.py` runs under the Werkzeug reloader, which executes this module
+# twice: in a watcher process that only restarts the server on code changes, and in
+# the child that serves requests (WERKZEUG_RUN_MAIN=true). Worker processes, the
+# prefetch executor and the scheduler start only where requests are served, so
+# jobs do not run twice.
+SERVING = __name__ != "__main__" or os.environ.get("WERKZEUG_RUN_MAIN") == "true"
+
+# Subsystems are built on first use unless JARVIS_EAGER_START=1
+LAZY_START = os.environ.get("JARVIS_EAGER_START") != "1" or not SERVING
+
+jarvis = subsystem("automation", "Automator", lazy=LAZY_START)
+researcher = subsystem("research", "Researcher", lazy=LAZY_START)
+brain = InstrumentedProxy(researcher, "search")
+# Searches off the answer path (prefetch warm-ups, streamed follow-up detail) are
+# timed as their own stage, so the "search" stage stays the latency commands wait on
+background_brain = InstrumentedProxy(researcher, "background_search")
+memory = InstrumentedProxy(subsystem("memory", "MemoryCore", lazy=LAZY_START), "memory")
+launcher = subsystem("launcher", "Launcher", lazy=LAZY_START)
+reasoning = InstrumentedProxy(subsystem("reasoning", "ReasoningEngine", lazy=LAZY_START), "reasoning")
+assets = subsystem("assets", "AssetStore", lazy=LAZY_START)
+
+# Reasoning and search answers in worker processes when JARVIS_CPU_WORKERS is set.
+# Workers fork after the log listener thread has started; they set up their own
+# logging (see workers._init_worker) instead of writing to its queue.
+cpu_pool = default_pool() if SERVING else None
+
+log = get_logger("server")
+profiler = Profiler()
+
+# Record /command and /stats traffic for bench/replay.py (first, so rejected requests are kept too)
+TRAFFIC_LOG = os.environ.get("JARVIS_TRAFFIC_LOG")
+traffic = TrafficRecorder(
+    TRAFFIC_LOG,
+    sample=float(os.environ.get("JARVIS_TRAFFIC_SAMPLE", "1"))
+).install(app) if TRAFFIC_LOG else None
+
+def is_admin():
+    """
+    Admin endpoints need JARVIS_ADMIN_TOKEN in X-Admin-Token, or a local caller when no token is set.
+    Behind a proxy (JARVIS_CLIENT_HEADER set) every caller looks local, so the token is required.
+    """
+    token = os.environ.get("JARVIS_ADMIN_TOKEN")
+    if token:
+        return hmac.compare_digest(request.headers.get("X-Admin-Token", ""), token)
+    if os.environ.get("JARVIS_CLIENT_HEADER"):
+        return False
+    return request.remote_addr in ("127.0.0.1", "::1")
+
+@app.before_request
+def start_profiling():
+    single = request.headers.get("X-Jarvis-Profile") == "1"
+    if profiler.active or single:
+        if single and not is_admin():
+            return
+        g.profile_token = profiler.begin_request(single=single)
+
+@app.after_request
+def finish_profiling(response):
+    token = g.pop("profile_token", None)
+    if token is not None:
+        result = profiler.end_request(token)
+        if result:
+            response.headers["X-Jarvis-Profile-Id"] = result["session"]["id"]
+    return response
+
+@app.teardown_request
+def abandon_profiling(exc):
+    # after_request is skipped when a view raises
+    token = g.pop("profile_token", None)
+    if token is not None:
+        profiler.end_request(token)
+
+@app.before_request
+def start_request_timer():
+    g.request_start = time.perf_counter()
 
-from automation import Automator
-from research import Researcher
-from memory import MemoryCore
-from launcher import Launcher
-from reasoning import ReasoningEngine
+@app.after_request
+def record_request_metrics(response):
+    start = g.pop("request_start", None)
+    if start is not None:
+        endpoint = request.endpoint or "unknown"
+        REQUEST_SECONDS.observe(time.perf_counter() - start, endpoint=endpoint)
+        REQUESTS.inc(endpoint=endpoint, code=response.status_code)
+    return response
 
-app = Flask(__name__)
-CORS(app)
-jarvis = Automator()
-brain = Researcher()
-memory = MemoryCore()
-launcher = Launcher()
-reasoning = ReasoningEngine()
+# --- Admission Control ---
+# Per-client rate limits plus separate concurrency pools for cheap local intents
+# and slow network-bound ones; JARVIS_ADMISSION=0 turns it all off.
+admission = AdmissionController(
+    rate=float(os.environ.get("JARVIS_RATE_LIMIT", "20")),
+    burst=float(os.environ.get("JARVIS_RATE_BURST", "40")),
+    pools=[
+        ConcurrencyPool("fast", int(os.environ.get("JARVIS_FAST_CONCURRENCY", "32")),
+                        int(os.environ.get("JARVIS_FAST_QUEUE", "64")), timeout=1.0),
+        ConcurrencyPool("slow", int(os.environ.get("JARVIS_SLOW_CONCURRENCY", "4")),
+                        int(os.environ.get("JARVIS_SLOW_QUEUE", "8")), timeout=2.0),
+    ]
+) if os.environ.get("JARVIS_ADMISSION") != "0" else None
+
+# Behind a proxy, name the header that carries the real client (e.g. X-Forwarded-For)
+CLIENT_HEADER = os.environ.get("JARVIS_CLIENT_HEADER")
+
+# Observability and admin endpoints are never queued or limited
+UNMETERED_ENDPOINTS = {"metrics", "profile_status", "profile_start", "profile_stop", "home", "health", "asset"}
+
+def request_pool():
+    """(pool, rate-limit cost) for the current request."""
+    if request.endpoint in ("command_handler", "command_stream_handler"):
+        data = request.get_json(silent=True) or {}
+        return command_pool(str(data.get('command', '')).lower()), 1
+    if request.endpoint == "command_batch_handler":
+        data = request.get_json(silent=True) or {}
+        commands = data.get('commands')
+        return "slow", len(commands) if isinstance(commands, list) and commands else 1
+    return "fast", 1
+
+@app.before_request
+def admit_request():
+    if admission is None or request.endpoint in UNMETERED_ENDPOINTS:
+        return
+    pool, cost = request_pool()
+    client = (CLIENT_HEADER and request.headers.get(CLIENT_HEADER)) or request.remote_addr or "unknown"
+    admitted, rejection = admission.admit(client, pool, cost)
+    if not admitted:
+        status, retry_after = rejection
+        message = ("Easy there. Too many requests, try again in a moment." if status == 429
+                   else "Systems at capacity. Please try again shortly.")
+        response = jsonify({"status": "error", "message": message})
+        response.status_code = status
+        response.headers["Retry-After"] = str(max(1, math.ceil(retry_after)))
+        return response
+    g.admission_pool = pool
+
+@app.teardown_request
+def release_admission(exc):
+    pool = g.pop("admission_pool", None)
+    if pool is not None:
+        admission.release(pool)
+
+def hold_admission(response):
+    """
+    Keep the request's admission slot until a streamed response is closed. Teardown
+    runs as soon as the view returns, before the stream has produced anything.
+    """
+    pool = g.pop("admission_pool", None)
+    if pool is not None:
+        response.call_on_close(lambda: admission.release(pool))
+    return response
 
 def get_gpu_stats():
+    GPUtil = optional_import("GPUtil")
+    if GPUtil is None:
+        return None
     try:
         gpus = GPUtil.getGPUs()
         if gpus:
@@ -98,8 +261,11 @@ def get_personality_response(intent, sentiment):
     
     return None # Default to standard response
 
-@app.route('/stats')
-def stats():
+# One snapshot serves the 1 Hz dashboard pollers, the diagnostic command and prefetch
+stats_cache = TTLCache("stats", ttl=float(os.environ.get("JARVIS_STATS_TTL", "1")))
+
+def collect_stats():
+    import psutil
     cpu_percent = psutil.cpu_percent(interval=None)
     ram = psutil.virtual_memory()
     gpu_stats = get_gpu_stats()
@@ -115,19 +281,76 @@ def stats():
         "gpu": gpu_stats,
         "vitals": vitals
     }
-    return jsonify(data)
+    return data
+
+def get_stats_snapshot():
+    """The current stats as an encoding.Snapshot, so concurrent pollers share the encoded bytes."""
+    return stats_cache.get_or_compute("stats", lambda: encoding.Snapshot(collect_stats()))
+
+# A diagnostic scan samples the CPU for half a second, so results are kept for a while
+diagnostic_cache = TTLCache("diagnostic", ttl=float(os.environ.get("JARVIS_DIAGNOSTIC_TTL", "30")))
+
+def run_diagnostics():
+    import psutil
+    snapshot = collect_stats()
+    snapshot["cpu"] = psutil.cpu_percent(interval=0.5)
+    snapshot["disk_percent"] = psutil.disk_usage(os.path.abspath(os.sep)).percent
+    snapshot["processes"] = len(psutil.pids())
+    return snapshot
+
+def get_diagnostics():
+    return diagnostic_cache.get_or_compute("diagnostic", run_diagnostics)
+
+@app.route('/stats')
+def stats():
+    return encoding.respond(get_stats_snapshot())
 
 
     
 # --- Context & Memory Management ---
-conversation_history = []
+DEFAULT_SESSION = "default"
+
+HISTORY_TURNS = 10
+
+# Every turn is also appended to a persistent journal (unless JARVIS_JOURNAL is empty)
+JOURNAL_PATH = os.environ.get("JARVIS_JOURNAL", "jarvis_journal.db")
+journal = ConversationJournal(
+    JOURNAL_PATH,
+    max_age_days=float(os.environ.get("JARVIS_JOURNAL_MAX_AGE_DAYS", "90")),
+    max_turns=int(os.environ.get("JARVIS_JOURNAL_MAX_TURNS", "1000000"))
+) if JOURNAL_PATH else None
+
+# Per-session history lives in the state backend (JARVIS_STATE_URL), so with a
+# shared backend any node can continue a session. Only a batch orders a session's
+# commands; concurrent requests for one session on different nodes may interleave
+# their turns. Sessions pick up where they left off before a restart. An unreachable
+# state server does not stop the node from starting or answering: commands run
+# without history and context until it is back, and the journal keeps every turn.
+state = default_backend()
+restored_histories = journal.load_recent(HISTORY_TURNS) if journal else {}
+try:
+    state.seed_lists({f"history:{session}": turns for session, turns in restored_histories.items()})
+except StateError as e:
+    log.warning("Session histories not restored: %s", e)
+
+def get_history(session=DEFAULT_SESSION):
+    try:
+        return state.get_list(f"history:{session}")
+    except StateError as e:
+        log.warning("Session history unavailable: %s", e)
+        return []
+
+def update_history(role, text, session=DEFAULT_SESSION):
+    try:
+        state.append(f"history:{session}", {"role": role, "text": text}, max_len=HISTORY_TURNS)
+    except StateError as e:
+        log.warning("Session history not saved: %s", e)
+    if journal:
+        journal.append(session, role, text)
 
-def update_history(role, text):
-    conversation_history.append({"role": role, "text": text})
-    if len(conversation_history) > 10:
-        conversation_history.pop(0)
+def get_context_aware_response(cmd, sentiment, session=DEFAULT_SESSION):
+    conversation_history = get_history(session)
 
-def get_context_aware_response(cmd, sentiment):
     # Check for repetition
     if len(conversation_history) >= 2:
         last_user_cmd = conversation_history[-2]['text'] if conversation_history[-2]['role'] == 'user' else ""
@@ -150,49 +373,284 @@ def get_context_aware_response(cmd, sentiment):
 
     return None
 
-def predict_intent(cmd):
+# (trigger words, proactive suggestion, intent worth prefetching for the follow-up)
+INTENT_PREDICTIONS = [
+    (["time"], "Would you like the weather report as well?", "weather"),
+    (["weather"], "Shall I check your calendar for today?", None),
+    (["status", "system"], "Should I run a diagnostic scan?", "diagnostic"),
+    (["music", "play"], "Volume set to 50%. Need it louder?", None),
+]
+
+def _prediction(cmd):
     # Simple heuristic-based prediction
-    if "time" in cmd:
-        return "Would you like the weather report as well?"
+    for triggers, suggestion, intent in INTENT_PREDICTIONS:
+        if any(trigger in cmd for trigger in triggers):
+            return suggestion, intent
+    return None, None
+
+def predict_intent(cmd):
+    return _prediction(cmd)[0]
+
+def command_intent(cmd):
+    """Intent label of a command, for learning which request tends to follow which."""
     if "weather" in cmd:
-        return "Shall I check your calendar for today?"
+        return "weather"
+    if "diagnostic" in cmd:
+        return "diagnostic"
+    if "search for" in cmd or "research" in cmd:
+        query = cmd.replace("search for", "").replace("research", "").strip()
+        return f"search:{query}" if query else None
     if "status" in cmd or "system" in cmd:
-        return "Should I run a diagnostic scan?"
-    if "music" in cmd or "play" in cmd:
-        return "Volume set to 50%. Need it louder?"
+        return "status"
+    if "time" in cmd:
+        return "time"
     return None
 
+# --- Speculative Prefetch ---
+# Warms the weather, search and diagnostic caches for the likely next command;
+# JARVIS_PREFETCH=0 turns it off.
+prefetcher = PrefetchEngine(
+    workers=2,
+    per_minute=int(os.environ.get("JARVIS_PREFETCH_PER_MINUTE", "30"))
+) if SERVING and os.environ.get("JARVIS_PREFETCH") != "0" else None
+
+if prefetcher:
+    prefetcher.register("weather", lambda arg: get_weather())
+    prefetcher.register("diagnostic", lambda arg: get_diagnostics())
+    prefetcher.register("search", lambda query: background_brain.search(query))
+    # Start from what the reloaded sessions did next
+    prefetcher.learn(
+        [command_intent(turn["text"]) for turn in turns if turn["role"] == "user"]
+        for turns in restored_histories.values()
+    )
+
+@app.route('/metrics')
+def metrics():
+    return Response(REGISTRY.render(), mimetype="text/plain; version=0.0.4")
+
+@app.route('/admin/profile', methods=['GET'])
+def profile_status():
+    if not is_admin():
+        return jsonify({"status": "error", "message": "Forbidden."}), 403
+    return jsonify(profiler.status())
+
+@app.route('/admin/profile/start', methods=['POST'])
+def profile_start():
+    if not is_admin():
+        return jsonify({"status": "error", "message": "Forbidden."}), 403
+    data = request.get_json(silent=True) or {}
+    result = profiler.start(
+        mode=data.get("mode", "cprofile"),
+        seconds=data.get("seconds"),
+        requests=data.get("requests")
+    )
+    return jsonify(result), 200 if result["status"] == "success" else 400
+
+@app.route('/admin/profile/stop', methods=['POST'])
+def profile_stop():
+    if not is_admin():
+        return jsonify({"status": "error", "message": "Forbidden."}), 403
+    result = profiler.stop()
+    return jsonify(result), 200 if result["status"] == "success" else 400
+
+# --- Weather ---
+weather_flight = SingleFlight()
+weather_cache = TTLCache("weather", ttl=float(os.environ.get("JARVIS_WEATHER_TTL", "600")), shared=shared_backend())
+
+def fetch_weather():
+    try:
+        import requests
+        w_response = requests.get("https://wttr.in/?format=j1", timeout=10)
+        if w_response.status_code == 200:
+            w_data = w_response.json()
+            current = w_data['current_condition'][0]
+            temp = current['temp_C']
+            desc = current['weatherDesc'][0]['value']
+            city = w_data['nearest_area'][0]['areaName'][0]['value']
+            msg = f"Current weather in {city}: {temp}°C, {desc}."
+            return {"status": "success", "message": msg}
+        return {"status": "error", "message": "Weather sensors offline."}
+    except:
+        return {"status": "error", "message": "Weather sensors offline."}
+
+def get_weather():
+    """Current weather; concurrent requests share one wttr.in call and reuse it for a while."""
+    try:
+        return dict(weather_cache.get_or_compute(
+            "weather",
+            lambda: weather_flight.do("weather", fetch_weather, timeout=15),
+            should_cache=lambda r: r["status"] == "success"
+        ))
+    except TimeoutError:
+        return {"status": "error", "message": "Weather sensors offline."}
+
+# --- Scheduled Jobs ---
+# Reminders ("remind me to stretch in 20 minutes") and recurring automations
+# ("organize downloads every day"); JARVIS_SCHEDULE="" turns the scheduler off.
+SCHEDULE_PATH = os.environ.get("JARVIS_SCHEDULE", "jarvis_schedule.db")
+scheduler = Scheduler(
+    SCHEDULE_PATH,
+    workers=int(os.environ.get("JARVIS_SCHEDULER_WORKERS", "2"))
+) if SCHEDULE_PATH else None
+
+TIME_UNITS = {"second": 1, "minute": 60, "hour": 3600, "day": 86400, "week": 604800}
+SCHEDULE_PATTERN = re.compile(r"\b(in|every)\s+(?:(an?|\d+)\s+)?(second|minute|hour|day|week)s?\b")
+# Automations a command can put on a schedule, by keyword
+AUTOMATIONS = {"organize": "organize_downloads", "weather": "weather_brief"}
+REMINDER_LIST_PHRASES = ["list reminders", "my reminders", "scheduled jobs", "what is scheduled"]
+REMINDERS_KEPT = 50
+
+def parse_schedule(cmd):
+    """(delay, interval, cmd without the phrase) for 'in 10 minutes' or 'every day' in cmd, else None."""
+    match = SCHEDULE_PATTERN.search(cmd)
+    if not match:
+        return None
+    word, count, unit = match.groups()
+    if word == "in" and count is None:
+        return None
+    seconds = (int(count) if count and count.isdigit() else 1) * TIME_UNITS[unit]
+    rest = " ".join((cmd[:match.start()] + cmd[match.end():]).split())
+    return (seconds, seconds if word == "every" else None, rest)
+
+def describe_duration(seconds, every=False):
+    """'10 minutes', or just 'day' for a single unit after 'every'."""
+    for unit, size in sorted(TIME_UNITS.items(), key=lambda u: -u[1]):
+        if seconds % size == 0:
+            count = int(seconds // size)
+            if count == 1:
+                return unit if every else f"1 {unit}"
+            return f"{count} {unit}s"
+    return f"{seconds:g} seconds"
+
+def format_jobs(jobs):
+    lines = []
+    for job in jobs:
+        what = job["payload"].get("text") if job["action"] == "reminder" else job["action"].replace("_", " ")
+        every = f" (every {describe_duration(job['interval'], every=True)})" if job["interval"] else ""
+        lines.append(f"- {time.strftime('%b %d %H:%M', time.localtime(job['due_at']))}: {what}{every}")
+    return "\n".join(lines)
+
+def notify(session, message):
+    """Deliver a scheduled message: into the session history and its reminders feed."""
+    update_history('ai', message, session)
+    try:
+        state.append(f"reminders:{session}", {"message": message, "at": time.time()}, max_len=REMINDERS_KEPT)
+    except StateError as e:
+        log.warning("Reminder not delivered to the feed: %s", e)
+
+def weather_brief(payload):
+    notify(payload.get("session", DEFAULT_SESSION), f"Weather brief: {get_weather()['message']}")
+
+if scheduler:
+    scheduler.register("reminder", lambda payload: notify(payload["session"], f"Reminder: {payload['text']}"))
+    scheduler.register("organize_downloads", lambda payload: jarvis.organize_downloads())
+    scheduler.register("weather_brief", weather_brief)
+    if SERVING:
+        scheduler.start()
+
+@app.route('/reminders')
+def reminders():
+    """Messages scheduled jobs delivered to the session (oldest first) and its pending reminders."""
+    session = get_session()
+    pending = scheduler.pending(action="reminder", limit=200) if scheduler else []
+    try:
+        delivered = state.get_list(f"reminders:{session}")
+    except StateError as e:
+        log.warning("Reminders feed unavailable: %s", e)
+        delivered = []
+    return encoding.respond({
+        "status": "success",
+        "delivered": delivered,
+        "pending": [job for job in pending if job["payload"].get("session") == session],
+    })
+
+def get_session(data=None):
+    """Session id from the request body or the X-Jarvis-Session header."""
+    if data and data.get('session'):
+        return str(data['session'])
+    return request.headers.get('X-Jarvis-Session', DEFAULT_SESSION)
+
+# Spoken phrases that ask for stored notes, longest first
+RECALL_PHRASES = ["what did i tell you about", "what do you remember about", "what do you know about my",
+                  "recall notes about", "recall"]
+NOTE_LIST_PHRASES = ["list notes", "list my notes", "my notes", "show notes", "show my notes"]
+
+def note_time_range(cmd):
+    """(since, until, phrase) for a time phrase such as 'today' or 'this week' in cmd."""
+    now = time.time()
+    midnight = time.mktime(time.localtime(now)[:3] + (0, 0, 0, 0, 0, -1))
+    ranges = [
+        ("yesterday", midnight - 86400, midnight),
+        ("today", midnight, None),
+        ("this week", midnight - time.localtime(now).tm_wday * 86400, None),
+        ("last week", now - 7 * 86400, None),
+        ("this month", time.mktime(time.localtime(now)[:2] + (1, 0, 0, 0, 0, 0, -1)), None),
+    ]
+    for phrase, since, until in ranges:
+        if re.search(rf"\b{phrase}\b", cmd):
+            return since, until, phrase
+    return None, None, None
+
+def format_notes(notes):
+    return "\n".join(f"- {time.strftime('%b %d', time.localtime(n['created_at']))}: {n['content']}" for n in notes)
+
+# Question words that send a command to reasoning, and possibly on to web search
+QUESTION_WORDS = ["what", "who", "how", "why", "where", "when", "define", "explain"]
+SLOW_INTENTS = ["weather", "search for", "research", "organize"]
+LOCAL_QUESTIONS = ["what is my name", "who am i", "who are you"]
+
+def command_pool(cmd):
+    """Admission pool for a command: 'slow' if it may wait on the network or disk, else 'fast'."""
+    if ("remember that" in cmd or any(cmd.startswith(phrase) for phrase in RECALL_PHRASES)
+            or any(phrase in cmd for phrase in NOTE_LIST_PHRASES) or cmd.startswith("remind me")):
+        return "fast"
+    if any(intent in cmd for intent in SLOW_INTENTS):
+        return "slow"
+    if any(q in cmd for q in QUESTION_WORDS) and not any(q in cmd for q in LOCAL_QUESTIONS):
+        return "slow"
+    return "fast"
+
 @app.route('/command', methods=['POST'])
 def command_handler():
-    from flask import request
     data = request.json
     cmd = data.get('command', '').lower()
-    
+    return encoding.respond(process_command(cmd, get_session(data)))
+
+def process_command(cmd, session=DEFAULT_SESSION, emit=None):
+    """
+    Run one (lower-cased) command for a session and return the response dict.
+    emit, when given, is called with text as soon as it is final (see /command/stream).
+    """
     # Update History
-    update_history('user', cmd)
+    update_history('user', cmd, session)
     
     response = {"status": "unknown", "message": "I didn't understand that command."}
     
     # Analyze Sentiment
-    sentiment = analyze_sentiment(cmd)
+    with timed("sentiment"):
+        sentiment = analyze_sentiment(cmd)
     
     # 1. Check for Context/Repetition
-    context_msg = get_context_aware_response(cmd, sentiment)
+    with timed("context"):
+        context_msg = get_context_aware_response(cmd, sentiment, session)
     if context_msg:
         response = {"status": "success", "message": context_msg}
-        update_history('ai', context_msg)
-        return jsonify(response)
+        update_history('ai', context_msg, session)
+        return response
 
     # 2. Check for Personality/Humor overrides
     personality_msg = get_personality_response("joke" if "joke" in cmd else "general", sentiment)
     
     if personality_msg and "joke" in cmd:
         response = {"status": "success", "message": personality_msg}
-        update_history('ai', personality_msg)
-        return jsonify(response)
+        update_history('ai', personality_msg, session)
+        return response
 
     # === COMMAND PROCESSING ===
     # (Existing commands...)
+    dispatch_start = time.perf_counter()
+    # 'in 10 minutes' / 'every day', for reminders and scheduled automations
+    when = parse_schedule(cmd) if scheduler else None
     if "activate full autonomous assistant mode" in cmd or "full intelligent assistant mode" in cmd:
         memory.set_preference("mode_autonomous", "true")
         response = {"status": "success", "message": "Full autonomous mode activated. Systems green."}
@@ -201,6 +659,70 @@ def command_handler():
         memory.set_preference("mode_continuous", "true")
         response = {"status": "success", "message": "Continuous monitoring enabled."}
     
+    # Notes (before keyword commands such as "weather" or "research" so notes about them work)
+    elif "remember that" in cmd:
+        content = cmd.replace("remember that", "").strip()
+        memory.add_note(content)
+        response = {"status": "success", "message": f"I have stored that in my memory banks: '{content}'"}
+
+    elif any(cmd.startswith(phrase) for phrase in RECALL_PHRASES) or any(phrase in cmd for phrase in NOTE_LIST_PHRASES):
+        since, until, period = note_time_range(cmd)
+        topic = cmd
+        # Whole words only, so 'footnotes' or 'fromage' stay intact
+        for phrase in RECALL_PHRASES + NOTE_LIST_PHRASES + ["notes from", "notes", "from", period or ""]:
+            if phrase:
+                topic = re.sub(rf"\b{re.escape(phrase)}\b", " ", topic)
+        topic = " ".join(topic.split())
+        topic = topic.strip(" ?.!")
+
+        if topic:
+            notes = memory.recall_notes(topic, limit=5, since=since, until=until, prefix=True)
+        else:
+            notes = memory.list_notes(limit=10, since=since, until=until)
+
+        if notes:
+            about = f" about '{topic}'" if topic else ""
+            response = {"status": "success", "message": f"Here is what you told me{about}:", "details": format_notes(notes)}
+        elif topic:
+            response = {"status": "success", "message": f"You haven't told me anything about '{topic}'."}
+        else:
+            response = {"status": "success", "message": "I have no notes for that period."}
+
+    # Scheduled jobs
+    elif scheduler and cmd.startswith("remind me"):
+        text = re.sub(r"^remind me\s+(?:to\s+|that\s+|about\s+)?", "", when[2] if when else cmd).strip(" .!")
+        if when and text:
+            delay, interval, _ = when
+            scheduler.schedule("reminder", {"text": text, "session": session}, delay=delay, interval=interval)
+            timing = f"every {describe_duration(interval, every=True)}" if interval else f"in {describe_duration(delay)}"
+            response = {"status": "success", "message": f"I will remind you to {text} {timing}."}
+        else:
+            response = {"status": "error", "message": "Tell me what and when, for example 'remind me to stretch in 20 minutes'."}
+
+    elif scheduler and cmd.startswith(("cancel", "stop")) and ("reminder" in cmd or "scheduled" in cmd):
+        if "reminder" in cmd:
+            jobs = [job for job in scheduler.pending(action="reminder", limit=1000)
+                    if job["payload"].get("session") == session]
+        else:
+            actions = [action for keyword, action in AUTOMATIONS.items() if keyword in cmd] or AUTOMATIONS.values()
+            jobs = [job for action in actions for job in scheduler.pending(action=action)]
+        cancelled = sum(scheduler.cancel(job["id"]) for job in jobs)
+        response = {"status": "success", "message": f"Cancelled {cancelled} scheduled job{'s' if cancelled != 1 else ''}."}
+
+    elif scheduler and any(phrase in cmd for phrase in REMINDER_LIST_PHRASES):
+        jobs = [job for job in scheduler.pending(limit=200)
+                if job["action"] != "reminder" or job["payload"].get("session") == session][:20]
+        if jobs:
+            response = {"status": "success", "message": f"{len(jobs)} scheduled:", "details": format_jobs(jobs)}
+        else:
+            response = {"status": "success", "message": "Nothing is scheduled."}
+
+    elif when and when[1] and any(keyword in cmd for keyword in AUTOMATIONS):
+        action = next(action for keyword, action in AUTOMATIONS.items() if keyword in cmd)
+        # One schedule per automation: asking again replaces it
+        scheduler.schedule(action, {"session": session}, delay=when[0], interval=when[1], key=action)
+        response = {"status": "success", "message": f"Scheduled {action.replace('_', ' ')} every {describe_duration(when[1], every=True)}."}
+
     elif "stop" in cmd or "silence" in cmd or "quiet" in cmd:
         response = {"status": "success", "message": "Silence."}
         # Frontend handles the actual audio stop
@@ -208,26 +730,14 @@ def command_handler():
     # ... (Keep existing commands for modes, automation, launcher, weather, etc.) ...
     
     elif "weather" in cmd:
-        # ... (Existing weather logic) ...
-        try:
-            import requests
-            w_response = requests.get("https://wttr.in/?format=j1")
-            if w_response.status_code == 200:
-                w_data = w_response.json()
-                current = w_data['current_condition'][0]
-                temp = current['temp_C']
-                desc = current['weatherDesc'][0]['value']
-                city = w_data['nearest_area'][0]['areaName'][0]['value']
-                msg = f"Current weather in {city}: {temp}°C, {desc}."
-                response = {"status": "success", "message": msg}
-            else:
-                response = {"status": "error", "message": "Weather sensors offline."}
-        except:
-            response = {"status": "error", "message": "Weather sensors offline."}
+        response = get_weather()
 
     # Automation Commands
     elif "organize" in cmd and "downloads" in cmd:
-        result = jarvis.organize_downloads()
+        result = jarvis.organize_downloads(
+            by_content="content" in cmd or "smart" in cmd,
+            dedupe="duplicate" in cmd
+        )
         response = result
     
     # Launcher Commands
@@ -260,7 +770,7 @@ def command_handler():
         if query:
             result = brain.search(query)
             if result['status'] == 'success':
-                memory.set_context('last_search', result.get('sources', []))
+                memory.set_context(f"{session}:last_search", result.get('sources', []))
             response = result
         else:
             response = {"status": "error", "message": "What should I search for?"}
@@ -268,7 +778,7 @@ def command_handler():
 
     # Explanation / Follow-up
     elif "explain" in cmd:
-        last_search = memory.get_context('last_search')
+        last_search = memory.get_context(f"{session}:last_search")
         if last_search:
             top_result = last_search[0]
             explanation = f"Based on your last search about '{top_result['title']}', here is a summary: {top_result['snippet']}"
@@ -277,11 +787,6 @@ def command_handler():
             response = {"status": "error", "message": "I don't have any recent search results to explain."}
 
     # Memory Commands
-    elif "remember that" in cmd:
-        content = cmd.replace("remember that", "").strip()
-        memory.set_preference("note", content)
-        response = {"status": "success", "message": f"I have stored that in my memory banks: '{content}'"}
-
     elif "add task" in cmd:
         task = cmd.replace("add task", "").strip()
         memory.add_task(task)
@@ -295,6 +800,18 @@ def command_handler():
         else:
             response = {"status": "success", "message": "You have no pending tasks."}
 
+    elif "diagnostic" in cmd:
+        snapshot = get_diagnostics()
+        readings = [
+            f"CPU at {snapshot['cpu']:.0f}%",
+            f"memory at {snapshot['ram']['percent']:.0f}%",
+            f"disk at {snapshot['disk_percent']:.0f}%",
+            f"{snapshot['processes']} processes running",
+        ]
+        if snapshot['gpu']:
+            readings.append(f"GPU at {snapshot['gpu']['load']:.0f}%, {snapshot['gpu']['temperature']}°C")
+        response = {"status": "success", "message": f"Diagnostic complete: {', '.join(readings)}."}
+
     elif "status" in cmd or "report" in cmd:
         response = {"status": "success", "message": "All systems nominal. Monitoring active."}
 
@@ -318,24 +835,24 @@ def command_handler():
              response = {"status": "success", "message": personality_msg}
         
         # 2. Intelligent Fallback: Try reasoning first, then search if needed
-        elif any(q in cmd for q in ["what", "who", "how", "why", "where", "when", "define", "explain"]):
+        elif any(q in cmd for q in QUESTION_WORDS):
             # First, try to answer through reasoning
-            reasoning_result = reasoning.answer(cmd, context=memory.get_context('last_topic'))
+            reasoning_result = reasoning.answer(cmd, context=memory.get_context(f"{session}:last_topic"))
             
             if reasoning_result['status'] == 'success':
                 # We can answer directly through reasoning
                 response = reasoning_result
                 # Store the topic for follow-up questions
-                memory.set_context('last_topic', cmd)
-                memory.set_context('last_answer', reasoning_result['message'])
+                memory.set_context(f"{session}:last_topic", cmd)
+                memory.set_context(f"{session}:last_answer", reasoning_result['message'])
             
             elif reasoning_result['status'] == 'needs_search':
                 # Reasoning engine says we need to search
                 result = brain.search(cmd)
                 if result['status'] == 'success':
-                    memory.set_context('last_search', result.get('sources', []))
-                    memory.set_context('last_topic', cmd)
-                    memory.set_context('last_answer', result['message'])
+                    memory.set_context(f"{session}:last_search", result.get('sources', []))
+                    memory.set_context(f"{session}:last_topic", cmd)
+                    memory.set_context(f"{session}:last_answer", result['message'])
                     response = result
                 else:
                     # Search failed - provide a helpful fallback
@@ -355,24 +872,225 @@ def command_handler():
         else:
              response = {"status": "success", "message": f"I heard '{cmd}'. Standing by for specific instructions."}
 
+    STAGE_SECONDS.observe(time.perf_counter() - dispatch_start, stage="dispatch")
+    if emit:
+        # Final from here on; the suggestion, prefetching and history can follow it
+        emit(response['message'])
+
     # 3. Intent Prediction (Proactive)
-    prediction = predict_intent(cmd)
+    prediction, predicted = _prediction(cmd)
     if prediction and response['status'] == 'success':
         response['message'] += f" {prediction}"
+        if emit:
+            emit(prediction)
+    if prefetcher:
+        prefetcher.after_command(session, command_intent(cmd), [predicted])
 
     # Debug logging
-    print(f"[DEBUG] Command: {cmd}")
-    print(f"[DEBUG] Response status: {response['status']}")
-    print(f"[DEBUG] Response message length: {len(response.get('message', ''))}")
-    print(f"[DEBUG] Response message preview: {response.get('message', '')[:100]}")
+    if log.isEnabledFor(logging.DEBUG):
+        log.debug("Command: %s", cmd)
+        log.debug("Response status: %s", response['status'])
+        log.debug("Response message length: %d", len(response.get('message', '')))
+        log.debug("Response message preview: %s", response.get('message', '')[:100])
+
+    update_history('ai', response['message'], session)
+    return response
+
+# --- Batch Execution ---
+MAX_BATCH = int(os.environ.get("JARVIS_MAX_BATCH", "1000"))
+batch_pool = ThreadPoolExecutor(
+    max_workers=int(os.environ.get("JARVIS_BATCH_WORKERS", "8")),
+    thread_name_prefix="jarvis-batch"
+)
+
+def run_session_commands(items, results):
+    """Run one session's commands in order, reporting (index, response) as each finishes."""
+    for index, cmd, session in items:
+        try:
+            response = process_command(cmd, session)
+        except Exception as e:
+            log.exception("Batch command failed: %s", cmd)
+            response = {"status": "error", "message": f"Command failed: {e}"}
+        results.put((index, response))
+
+@app.route('/command/batch', methods=['POST'])
+def command_batch_handler():
+    """
+    Run an array of commands. Commands of different sessions run concurrently on
+    a bounded pool; commands of the same session run one after another in order.
+    Responses come back in order, or as NDJSON lines (with their index) as each
+    completes when 'stream' is set or the client accepts application/x-ndjson.
+    """
+    data = request.get_json(silent=True) or {}
+    commands = data.get('commands')
+    if not isinstance(commands, list) or not commands:
+        return jsonify({"status": "error", "message": "Expected a non-empty 'commands' array."}), 400
+    if len(commands) > MAX_BATCH:
+        return jsonify({"status": "error", "message": f"Batches are limited to {MAX_BATCH} commands."}), 400
+
+    default_session = get_session(data)
+    by_session = {}
+    for index, item in enumerate(commands):
+        if isinstance(item, dict):
+            cmd, session = item.get('command', ''), str(item.get('session') or default_session)
+        else:
+            cmd, session = item, default_session
+        if not isinstance(cmd, str):
+            return jsonify({"status": "error",
+                            "message": f"Command {index} must be a string or an object with a string 'command'."}), 400
+        by_session.setdefault(session, []).append((index, cmd.lower(), session))
+
+    results = queue.SimpleQueue()
+    for items in by_session.values():
+        batch_pool.submit(run_session_commands, items, results)
+
+    stream = data.get('stream') or request.accept_mimetypes.best == "application/x-ndjson"
+    if stream:
+        def generate():
+            for _ in range(len(commands)):
+                index, response = results.get()
+                yield app.json.dumps({"index": index, **response}) + "\n"
+        return hold_admission(Response(generate(), mimetype="application/x-ndjson"))
+
+    ordered = [None] * len(commands)
+    for _ in range(len(commands)):
+        index, response = results.get()
+        ordered[index] = response
+    return encoding.respond({"status": "success", "results": ordered})
+
+# --- Streaming ---
+# Sentence boundaries for chunking answers (the summarizer splits the same way)
+SENTENCE_END = re.compile(r"(?<=[.!?])\s+(?=[A-Z0-9\"'(])")
+# A slow command that has said nothing by then gets HOLDING_LINE, so the user hears something
+STREAM_HOLD_SECONDS = float(os.environ.get("JARVIS_STREAM_HOLD_MS", "250")) / 1000
+HOLDING_LINE = "One moment, Boss."
+# Web-search sentences added after a local reasoning answer (0 turns this off)
+STREAM_DETAIL_SENTENCES = int(os.environ.get("JARVIS_STREAM_DETAIL", "2"))
+STREAM_WORKERS = int(os.environ.get("JARVIS_STREAM_WORKERS", "16"))
+stream_pool = ThreadPoolExecutor(max_workers=STREAM_WORKERS, thread_name_prefix="jarvis-stream")
+# Streamed commands running or waiting for a worker; past that /command/stream answers 503.
+# A stream whose client went away keeps its place until its command finishes.
+stream_slots = threading.BoundedSemaphore(STREAM_WORKERS + int(os.environ.get("JARVIS_STREAM_QUEUE", "16")))
+
+def split_sentences(text):
+    return [s.strip() for s in SENTENCE_END.split(text) if s.strip()]
+
+def search_detail(cmd, answer, limit=STREAM_DETAIL_SENTENCES):
+    """Up to limit sentences of a web search on cmd that the local answer does not already make."""
+    result = background_brain.search(cmd)
+    if result.get('status') != 'success':
+        return []
+    said = [set(re.findall(r"[a-z0-9]+", s.lower())) for s in split_sentences(answer)]
+    detail = []
+    for sentence in split_sentences(result['message']):
+        words = set(re.findall(r"[a-z0-9]+", sentence.lower()))
+        # Skip fragments and sentences that mostly repeat one already spoken
+        if len(words) < 4 or any(len(words & w) > 0.6 * len(words | w) for w in said):
+            continue
+        detail.append(sentence)
+        said.append(words)
+        if len(detail) >= limit:
+            break
+    return detail
+
+def run_streamed_command(cmd, session, detail, chunks):
+    """Run a command for /command/stream, putting (kind, payload) on chunks and ("done", response) last."""
+    try:
+        response = process_command(cmd, session, emit=lambda text: chunks.put(("answer", text)))
+        # A local answer is spoken while the search for detail runs
+        if detail and response['status'] == 'success' and response.get('source') in ("reasoning", "semantic"):
+            sentences = search_detail(cmd, response['message'])
+            for sentence in sentences:
+                chunks.put(("detail", sentence))
+            if sentences:
+                response = dict(response, detail=" ".join(sentences))
+    except Exception as e:
+        log.exception("Streamed command failed: %s", cmd)
+        response = {"status": "error", "message": f"Command failed: {e}"}
+    chunks.put(("done", response))
+
+@app.route('/command/stream', methods=['POST'])
+def command_stream_handler():
+    """
+    /command, one sentence per chunk as soon as each is ready: NDJSON lines
+    ({"index", "text"}), or server-sent events when the client accepts
+    text/event-stream. A reasoning answer is followed by up to
+    JARVIS_STREAM_DETAIL sentences from a web search ("detail": true; send
+    "detail": false to skip), and a slow command that is still working after
+    JARVIS_STREAM_HOLD_MS sends {"holding": true} first. The last chunk is the
+    full /command response with "done": true.
+    """
+    data = request.get_json(silent=True) or {}
+    cmd = str(data.get('command', '')).lower()
+    session = get_session(data)
+    detail = data.get('detail', True) is not False and STREAM_DETAIL_SENTENCES > 0
+    sse = request.accept_mimetypes.best == "text/event-stream"
+    hold = STREAM_HOLD_SECONDS if command_pool(cmd) == "slow" else None
+
+    if not stream_slots.acquire(blocking=False):
+        ADMISSION_REJECTED.inc(pool="stream", reason="queue_full")
+        response = jsonify({"status": "error", "message": "Systems at capacity. Please try again shortly."})
+        response.status_code = 503
+        response.headers["Retry-After"] = "1"
+        return response
+    chunks = queue.SimpleQueue()
+    stream_pool.submit(run_streamed_command, cmd, session, detail, chunks).add_done_callback(
+        lambda future: stream_slots.release()
+    )
 
-    update_history('ai', response['message'])
-    return jsonify(response)
+    def line(event, payload):
+        body = app.json.dumps(payload)
+        return f"event: {event}\ndata: {body}\n\n" if sse else body + "\n"
 
+    def generate():
+        index = 0
+        timeout = hold
+        while True:
+            try:
+                kind, payload = chunks.get(timeout=timeout)
+            except queue.Empty:
+                yield line("holding", {"text": HOLDING_LINE, "holding": True})
+                timeout = None
+                continue
+            timeout = None
+            if kind == "done":
+                # Replies that return early (jokes, repeats) were never emitted
+                if index == 0:
+                    for sentence in split_sentences(payload.get('message', '')):
+                        yield line("sentence", {"index": index, "text": sentence})
+                        index += 1
+                yield line("done", {"done": True, **payload})
+                return
+            for sentence in split_sentences(payload):
+                chunk = {"index": index, "text": sentence}
+                if kind == "detail":
+                    chunk["detail"] = True
+                yield line("sentence", chunk)
+                index += 1
+
+    response = Response(generate(), mimetype="text/event-stream" if sse else "application/x-ndjson")
+    # Proxies must pass each chunk on as it comes
+    response.headers["Cache-Control"] = "no-cache"
+    response.headers["X-Accel-Buffering"] = "no"
+    return hold_admission(response)
+
+# --- Dashboard ---
+# Served same-origin so the HUD needs no CORS preflight; see assets.py for caching
 @app.route('/')
 def home():
+    return assets.respond("index.html", request, Response)
+
+@app.route('/health')
+def health():
     return "JARVIS System Monitor Backend Online"
 
+@app.route('/<path:name>')
+def asset(name):
+    response = assets.respond(name, request, Response)
+    if response is None:
+        return jsonify({"status": "error", "message": "Not found."}), 404
+    return response
+
 if __name__ == "__main__":
-    print("Initializing JARVIS System Monitor...")
+    log.info("Initializing JARVIS System Monitor...")
     app.run(port=5000, debug=True)
@@ -0,0 +1,57 @@
+"""
+Request coalescing for JARVIS.
+Concurrent calls with the same key share a single execution: the first caller runs
+the function, everyone else waits for it and receives the same result (or exception).
+"""
+import threading
+
+
+class _Call:
+    __slots__ = ("done", "result", "error", "waiters")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+        self.waiters = 0
+
+
+class SingleFlight:
+    def __init__(self):
+        self._calls = {}
+        self._lock = threading.Lock()
+
+    def do(self, key, fn, *args, timeout=None, **kwargs):
+        """
+        Run fn(*args, **kwargs) unless a call for `key` is already in flight, in which
+        case wait up to `timeout` seconds for that call instead.
+        Raises TimeoutError if a waiting caller gives up; the in-flight call keeps running.
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+            else:
+                call.waiters += 1
+
+        if leader:
+            try:
+                call.result = fn(*args, **kwargs)
+            except BaseException as e:
+                call.error = e
+            finally:
+                # Forget the key before waking waiters so later calls start a fresh flight
+                with self._lock:
+                    del self._calls[key]
+                call.done.set()
+        elif not call.done.wait(timeout):
+            raise TimeoutError(f"Timed out waiting for in-flight call '{key}'")
+
+        if call.error is not None:
+            raise call.error
+        return call.result
+
+    def in_flight(self):
+        with self._lock:
+            return len(self._calls)
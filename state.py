@@ -0,0 +1,428 @@
+"""
+Shared state for JARVIS.
+Session histories, conversational context, preferences and the search and
+weather caches go through a StateBackend. The default keeps everything in this
+process; pointing JARVIS_STATE_URL at a Redis-protocol server lets several
+server.py nodes behind a load balancer see the same state and reuse each
+other's upstream results.
+
+Environment:
+    JARVIS_STATE_URL    memory:// (default) or redis://[:password@]host[:port][/db]
+    JARVIS_STATE_POOL   connections kept per node for redis:// (default 16)
+
+Values are stored as JSON, so anything the API already returns can be shared.
+"""
+import abc
+import json
+import os
+import socket
+import threading
+import time
+from urllib.parse import unquote, urlparse
+
+from lazy import optional_import
+from logger import get_logger
+from metrics import REGISTRY
+
+log = get_logger("state")
+
+orjson = optional_import("orjson")
+
+STATE_COMMANDS = REGISTRY.counter(
+    "jarvis_state_commands_total", "Commands sent to the shared state server.", ("op",)
+)
+STATE_ROUND_TRIPS = REGISTRY.counter(
+    "jarvis_state_round_trips_total", "Network round trips to the shared state server (pipelines count once)."
+)
+STATE_CONNECTIONS = REGISTRY.gauge(
+    "jarvis_state_connections", "Open connections to the shared state server."
+)
+
+
+class StateError(Exception):
+    """The state server rejected a command or could not be reached."""
+
+
+class StateBackend(abc.ABC):
+    """
+    Key-value store with optional expiry and capped lists.
+    `shared` is True when other nodes see the same data; callers that keep a
+    local copy anyway (caches, SQLite preferences) only go through shared backends.
+    """
+    shared = False
+
+    @abc.abstractmethod
+    def get(self, key):
+        pass
+
+    @abc.abstractmethod
+    def set(self, key, value, ttl=None):
+        pass
+
+    @abc.abstractmethod
+    def delete(self, *keys):
+        pass
+
+    def get_many(self, keys):
+        """Values for keys, in order, None where missing."""
+        return [self.get(key) for key in keys]
+
+    def set_many(self, mapping, ttl=None):
+        for key, value in mapping.items():
+            self.set(key, value, ttl)
+
+    @abc.abstractmethod
+    def append(self, key, value, max_len=None):
+        """Append value to the list at key, keeping only the newest max_len items."""
+
+    @abc.abstractmethod
+    def get_list(self, key):
+        pass
+
+    @abc.abstractmethod
+    def seed_lists(self, mapping):
+        """Create the lists in mapping that do not exist yet; existing lists win."""
+
+    def close(self):
+        pass
+
+
+class InMemoryBackend(StateBackend):
+    def __init__(self):
+        self._values = {}
+        self._expires = {}
+        self._lists = {}
+        self._lock = threading.Lock()
+
+    def _live(self, key, now):
+        expires = self._expires.get(key)
+        if expires is not None and expires <= now:
+            del self._expires[key]
+            self._values.pop(key, None)
+            return False
+        return key in self._values
+
+    def get(self, key):
+        # Plain dict reads are atomic; only expiring a key needs the lock
+        expires = self._expires.get(key)
+        if expires is not None and expires <= time.monotonic():
+            with self._lock:
+                self._live(key, time.monotonic())
+            return None
+        return self._values.get(key)
+
+    def set(self, key, value, ttl=None):
+        with self._lock:
+            if ttl:
+                self._expires[key] = time.monotonic() + ttl
+            elif self._expires:
+                self._expires.pop(key, None)
+            self._values[key] = value
+
+    def delete(self, *keys):
+        with self._lock:
+            for key in keys:
+                self._values.pop(key, None)
+                self._expires.pop(key, None)
+                self._lists.pop(key, None)
+
+    def get_many(self, keys):
+        now = time.monotonic()
+        with self._lock:
+            return [self._values[key] if self._live(key, now) else None for key in keys]
+
+    def set_many(self, mapping, ttl=None):
+        expires = time.monotonic() + ttl if ttl else None
+        with self._lock:
+            for key, value in mapping.items():
+                self._values[key] = value
+                if expires:
+                    self._expires[key] = expires
+                else:
+                    self._expires.pop(key, None)
+
+    def append(self, key, value, max_len=None):
+        with self._lock:
+            items = self._lists.setdefault(key, [])
+            items.append(value)
+            if max_len and len(items) > max_len:
+                del items[:-max_len]
+
+    def get_list(self, key):
+        with self._lock:
+            return list(self._lists.get(key, ()))
+
+    def seed_lists(self, mapping):
+        with self._lock:
+            for key, values in mapping.items():
+                if key not in self._lists:
+                    self._lists[key] = list(values)
+
+
+def _encode_command(args):
+    out = [b"*%d\r\n" % len(args)]
+    for arg in args:
+        if isinstance(arg, str):
+            arg = arg.encode("utf-8")
+        elif not isinstance(arg, bytes):
+            arg = str(arg).encode("ascii")
+        out.append(b"$%d\r\n%s\r\n" % (len(arg), arg))
+    return b"".join(out)
+
+
+class _ReplyError:
+    __slots__ = ("message",)
+
+    def __init__(self, message):
+        self.message = message
+
+
+class RedisConnection:
+    """One socket speaking RESP; execute() sends a whole pipeline in one write."""
+
+    def __init__(self, host, port, db=0, password=None, timeout=5.0):
+        self.sock = socket.create_connection((host, port), timeout=timeout)
+        self.sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        self._reader = self.sock.makefile("rb")
+        setup = []
+        if password:
+            setup.append(("AUTH", password))
+        if db:
+            setup.append(("SELECT", db))
+        if setup:
+            try:
+                self.execute(setup)
+            except BaseException:
+                self.close()
+                raise
+
+    def execute(self, commands):
+        """Replies for a list of commands (tuples of arguments), sent as one pipeline."""
+        self.sock.sendall(b"".join(_encode_command(c) for c in commands))
+        STATE_ROUND_TRIPS.inc()
+        # Read every reply before raising so the connection stays in step
+        replies = [self._read() for _ in commands]
+        for reply in replies:
+            if isinstance(reply, _ReplyError):
+                raise StateError(reply.message)
+        return replies
+
+    def _read(self):
+        line = self._reader.readline()
+        if not line.endswith(b"\r\n"):
+            raise ConnectionError("state server closed the connection")
+        kind, rest = line[:1], line[1:-2]
+        if kind == b"+":
+            return rest.decode()
+        if kind == b"-":
+            return _ReplyError(rest.decode())
+        if kind == b":":
+            return int(rest)
+        if kind == b"$":
+            length = int(rest)
+            if length < 0:
+                return None
+            return self._reader.read(length + 2)[:-2]
+        if kind == b"*":
+            length = int(rest)
+            if length < 0:
+                return None
+            return [self._read() for _ in range(length)]
+        raise ConnectionError(f"unexpected reply from state server: {line[:40]!r}")
+
+    def close(self):
+        try:
+            self._reader.close()
+            self.sock.close()
+        except OSError:
+            pass
+
+
+class ConnectionPool:
+    """Reuses up to max_connections sockets; callers wait when all of them are busy."""
+
+    def __init__(self, host, port, db=0, password=None, max_connections=16, timeout=5.0):
+        self.host = host
+        self.port = port
+        self.db = db
+        self.password = password
+        self.max_connections = max_connections
+        self.timeout = timeout
+        self._idle = []
+        self._open = 0
+        self._available = threading.Condition()
+
+    def acquire(self):
+        with self._available:
+            while not self._idle and self._open >= self.max_connections:
+                if not self._available.wait(self.timeout):
+                    raise StateError("no state server connection available")
+            if self._idle:
+                return self._idle.pop()
+            self._open += 1
+        try:
+            conn = RedisConnection(self.host, self.port, self.db, self.password, self.timeout)
+        except (OSError, ConnectionError, ValueError) as e:
+            self._discard()
+            raise StateError(f"state server {self.host}:{self.port}: {e}") from e
+        except BaseException:
+            self._discard()
+            raise
+        STATE_CONNECTIONS.inc()
+        return conn
+
+    def release(self, conn, broken=False):
+        if broken:
+            conn.close()
+            STATE_CONNECTIONS.dec()
+            self._discard()
+            return
+        with self._available:
+            self._idle.append(conn)
+            self._available.notify()
+
+    def _discard(self):
+        with self._available:
+            self._open -= 1
+            self._available.notify()
+
+    def execute(self, commands):
+        conn = self.acquire()
+        try:
+            replies = conn.execute(commands)
+        except StateError:
+            self.release(conn)
+            raise
+        except (OSError, ConnectionError, ValueError) as e:
+            self.release(conn, broken=True)
+            raise StateError(f"state server {self.host}:{self.port}: {e}") from e
+        self.release(conn)
+        return replies
+
+    def close(self):
+        with self._available:
+            idle, self._idle = self._idle, []
+            self._open -= len(idle)
+        for conn in idle:
+            conn.close()
+            STATE_CONNECTIONS.dec()
+
+
+class RedisBackend(StateBackend):
+    """Redis-protocol backend; batch operations and multi-step updates are pipelined."""
+    shared = True
+
+    def __init__(self, host="localhost", port=6379, db=0, password=None, max_connections=16, timeout=5.0,
+                 namespace="jarvis:"):
+        self.namespace = namespace
+        self.pool = ConnectionPool(host, port, db, password, max_connections, timeout)
+
+    def _key(self, key):
+        return self.namespace + key
+
+    def _run(self, op, commands):
+        STATE_COMMANDS.inc(len(commands), op=op)
+        return self.pool.execute(commands)
+
+    @staticmethod
+    def _dump(value):
+        if orjson is not None:
+            return orjson.dumps(value, option=orjson.OPT_NON_STR_KEYS)
+        return json.dumps(value, separators=(",", ":"))
+
+    @staticmethod
+    def _load(raw):
+        if raw is None:
+            return None
+        return orjson.loads(raw) if orjson is not None else json.loads(raw)
+
+    def _set_command(self, key, value, ttl):
+        command = ("SET", self._key(key), self._dump(value))
+        if ttl:
+            # PX keeps sub-second TTLs
+            command += ("PX", max(1, int(ttl * 1000)))
+        return command
+
+    def get(self, key):
+        return self._load(self._run("get", [("GET", self._key(key))])[0])
+
+    def set(self, key, value, ttl=None):
+        self._run("set", [self._set_command(key, value, ttl)])
+
+    def delete(self, *keys):
+        if keys:
+            self._run("delete", [("DEL",) + tuple(self._key(k) for k in keys)])
+
+    def get_many(self, keys):
+        if not keys:
+            return []
+        raw = self._run("get_many", [("MGET",) + tuple(self._key(k) for k in keys)])[0]
+        return [self._load(r) for r in raw]
+
+    def set_many(self, mapping, ttl=None):
+        if mapping:
+            self._run("set_many", [self._set_command(k, v, ttl) for k, v in mapping.items()])
+
+    def append(self, key, value, max_len=None):
+        commands = [("RPUSH", self._key(key), self._dump(value))]
+        if max_len:
+            commands.append(("LTRIM", self._key(key), -max_len, -1))
+        self._run("append", commands)
+
+    def get_list(self, key):
+        return [self._load(r) for r in self._run("get_list", [("LRANGE", self._key(key), 0, -1)])[0]]
+
+    def seed_lists(self, mapping):
+        mapping = {k: v for k, v in mapping.items() if v}
+        if not mapping:
+            return
+        keys = list(mapping)
+        exists = self._run("seed_lists", [("EXISTS", self._key(k)) for k in keys])
+        # Another node may create a list between the two pipelines; its turns are kept as well
+        commands = [("RPUSH", self._key(k)) + tuple(self._dump(v) for v in mapping[k])
+                    for k, found in zip(keys, exists) if not found]
+        if commands:
+            self._run("seed_lists", commands)
+
+    def close(self):
+        self.pool.close()
+
+
+def backend_from_url(url, max_connections=16):
+    """StateBackend for a memory:// or redis:// URL."""
+    parsed = urlparse(url or "memory://")
+    if parsed.scheme in ("", "memory"):
+        return InMemoryBackend()
+    if parsed.scheme == "redis":
+        db = parsed.path.strip("/")
+        return RedisBackend(
+            host=parsed.hostname or "localhost",
+            port=parsed.port or 6379,
+            db=int(db) if db else 0,
+            password=unquote(parsed.password) if parsed.password else None,
+            max_connections=max_connections,
+        )
+    raise ValueError(f"unsupported JARVIS_STATE_URL scheme: {parsed.scheme!r}")
+
+
+_default = None
+_default_lock = threading.Lock()
+
+
+def default_backend():
+    """The process-wide backend chosen by JARVIS_STATE_URL, built on first use."""
+    global _default
+    if _default is None:
+        with _default_lock:
+            if _default is None:
+                url = os.environ.get("JARVIS_STATE_URL", "memory://")
+                _default = backend_from_url(url, int(os.environ.get("JARVIS_STATE_POOL", "16")))
+                if _default.shared:
+                    log.info("Sharing state through %s", urlparse(url).hostname)
+    return _default
+
+
+def shared_backend():
+    """The default backend when it is shared between nodes, else None."""
+    backend = default_backend()
+    return backend if backend.shared else None
@@ -0,0 +1,136 @@
+"""
+Extractive summarization for JARVIS research answers.
+Sentences from all retrieved snippets are scored by a query-biased TextRank over
+TF-IDF sentence vectors, near-duplicates are dropped with MinHash signatures, and
+the best sentences are assembled (in reading order) up to a character budget.
+Requires numpy; no models or downloads.
+"""
+import re
+import zlib
+
+import numpy as np
+
+from semantic import tokenize
+
+SENTENCE_RE = re.compile(r"(?<=[.!?])\s+(?=[A-Z0-9\"'(])")
+
+# Random affine hash family for MinHash, fixed so summaries are deterministic.
+# A 32-bit prime keeps crc32 * a + b inside uint64.
+_PRIME = 4294967291
+_rng = np.random.default_rng(20240601)
+_MINHASH_A = _rng.integers(1, _PRIME, size=64, dtype=np.uint64)
+_MINHASH_B = _rng.integers(0, _PRIME, size=64, dtype=np.uint64)
+
+
+def split_sentences(text):
+    return [s.strip() for s in SENTENCE_RE.split(text) if s.strip()]
+
+
+class ExtractiveSummarizer:
+    def __init__(self, max_chars=500, max_sentences=4, min_words=4, damping=0.85,
+                 duplicate_threshold=0.5, query_weight=0.5):
+        self.max_chars = max_chars
+        self.max_sentences = max_sentences
+        self.min_words = min_words
+        self.damping = damping
+        self.duplicate_threshold = duplicate_threshold
+        self.query_weight = query_weight
+
+    def summarize(self, snippets, query="", max_chars=None):
+        """Return the summary text for a list of snippets (or one string)."""
+        if isinstance(snippets, str):
+            snippets = [snippets]
+        max_chars = max_chars or self.max_chars
+
+        sentences = []
+        for source, snippet in enumerate(snippets):
+            for position, sentence in enumerate(split_sentences(snippet)):
+                tokens = tokenize(sentence)
+                # Fragments such as 'Today, IBM...' cut mid-way carry little meaning
+                if len(sentence.split()) >= self.min_words and tokens:
+                    sentences.append((source, position, sentence, tokens))
+        if not sentences:
+            return ""
+
+        scores = self._score([s[3] for s in sentences], tokenize(query))
+        signatures = self._minhash([s[3] for s in sentences])
+
+        chosen = []
+        length = 0
+        for i in np.argsort(-scores, kind="stable"):
+            if len(chosen) >= self.max_sentences:
+                break
+            text = sentences[i][2]
+            if length + len(text) + 1 > max_chars and chosen:
+                continue
+            if any(np.mean(signatures[i] == signatures[j]) >= self.duplicate_threshold for j in chosen):
+                continue
+            chosen.append(i)
+            length += len(text) + 1
+
+        chosen.sort(key=lambda i: (sentences[i][0], sentences[i][1]))
+        summary = " ".join(sentences[i][2] for i in chosen)
+        if len(summary) > max_chars:
+            summary = summary[:max_chars].rsplit(" ", 1)[0] + "..."
+        return summary
+
+    def _score(self, token_lists, query_tokens):
+        """Query-biased TextRank over TF-IDF sentence vectors."""
+        vocab = {}
+        rows, cols, vals = [], [], []
+        for row, tokens in enumerate(token_lists):
+            counts = {}
+            for token in tokens:
+                col = vocab.setdefault(token, len(vocab))
+                counts[col] = counts.get(col, 0) + 1
+            rows.extend([row] * len(counts))
+            cols.extend(counts.keys())
+            vals.extend(counts.values())
+
+        n = len(token_lists)
+        tf = np.zeros((n, len(vocab)), dtype=np.float32)
+        tf[rows, cols] = vals
+        present = tf > 0
+        tf[present] = 1.0 + np.log(tf[present])
+        idf = np.log((1.0 + n) / (1.0 + present.sum(axis=0))) + 1.0
+        X = tf * idf
+        X /= np.maximum(np.linalg.norm(X, axis=1, keepdims=True), 1e-9)
+
+        # Query relevance doubles as the teleport distribution of the random walk
+        relevance = np.zeros(n, dtype=np.float32)
+        q_cols = [vocab[t] for t in query_tokens if t in vocab]
+        if q_cols:
+            q = np.zeros(len(vocab), dtype=np.float32)
+            np.add.at(q, q_cols, 1.0)
+            q *= idf
+            relevance = X @ (q / np.linalg.norm(q))
+        teleport = relevance + 1.0 / n
+        teleport /= teleport.sum()
+
+        S = X @ X.T
+        np.fill_diagonal(S, 0.0)
+        out = S.sum(axis=1, keepdims=True)
+        P = np.divide(S, out, out=np.full_like(S, 1.0 / n), where=out > 0)
+
+        rank = np.full(n, 1.0 / n, dtype=np.float32)
+        for _ in range(30):
+            updated = (1 - self.damping) * teleport + self.damping * (rank @ P)
+            if np.abs(updated - rank).sum() < 1e-6:
+                rank = updated
+                break
+            rank = updated
+
+        centrality = rank / rank.max()
+        return (1 - self.query_weight) * centrality + self.query_weight * relevance
+
+    def _minhash(self, token_lists):
+        """64-value MinHash signature of each sentence's word 3-gram shingles."""
+        hashes = []
+        offsets = []
+        for tokens in token_lists:
+            offsets.append(len(hashes))
+            shingles = {" ".join(tokens[j:j + 3]) for j in range(max(1, len(tokens) - 2))}
+            hashes.extend(zlib.crc32(s.encode()) for s in shingles)
+        # One hash matrix for all shingles, reduced per sentence in a single pass
+        values = (np.outer(np.asarray(hashes, dtype=np.uint64), _MINHASH_A) + _MINHASH_B) % _PRIME
+        return np.minimum.reduceat(values, np.asarray(offsets), axis=0)
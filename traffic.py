@@ -0,0 +1,150 @@
+"""
+Traffic recording for JARVIS.
+When JARVIS_TRAFFIC_LOG names a file, every /command, /command/batch,
+/command/stream and /stats request is appended to it as one JSON line: arrival time, method, path,
+session, the headers that change the response, the JSON body, status, server
+time and (for JSON replies) the response itself. Lines are gzip-compressed and
+written by a background thread, so recording adds a queue put to the request.
+bench/replay.py plays a log back against a build and diffs the responses.
+
+Environment (read by server.py):
+    JARVIS_TRAFFIC_LOG      log path, e.g. traffic.jsonl.gz (unset: no recording)
+    JARVIS_TRAFFIC_SAMPLE   fraction of requests to record (default 1.0)
+
+Recorded bodies contain what users said; treat the log like the memory database.
+"""
+import atexit
+import gzip
+import json
+import queue
+import random
+import threading
+import time
+import zlib
+
+from flask import g, request
+
+from logger import get_logger
+from metrics import REGISTRY
+
+log = get_logger("traffic")
+
+TRAFFIC_RECORDED = REGISTRY.counter("jarvis_traffic_recorded_total", "Requests written to the traffic log.")
+
+RECORDED_ENDPOINTS = ("command_handler", "command_batch_handler", "command_stream_handler", "stats")
+# Request headers that change what the app returns
+RECORDED_HEADERS = ("Accept", "X-Jarvis-Session")
+
+_STOP = object()
+
+
+class TrafficRecorder:
+    def __init__(self, path, endpoints=RECORDED_ENDPOINTS, sample=1.0, batch_size=500):
+        self.path = path
+        self.endpoints = frozenset(endpoints)
+        self.sample = sample
+        self.batch_size = batch_size
+        self._queue = queue.SimpleQueue()
+        self._writer = None
+        self._start_lock = threading.Lock()
+        self._closed = False
+
+    def install(self, app):
+        """Record matching requests of app from now on."""
+        app.before_request(self._begin)
+        app.after_request(self._finish)
+        return self
+
+    def _begin(self):
+        if request.endpoint in self.endpoints and (self.sample >= 1 or random.random() < self.sample):
+            g.traffic_start = (time.time(), time.perf_counter())
+
+    def _finish(self, response):
+        start = g.pop("traffic_start", None)
+        if start is None or self._closed:
+            return response
+        arrived, started = start
+        body = request.get_json(silent=True)
+        session = body.get("session") if isinstance(body, dict) else None
+        entry = {
+            "t": round(arrived, 6),
+            "method": request.method,
+            "path": request.path,
+            "session": str(session or request.headers.get("X-Jarvis-Session", "default")),
+            "headers": {name: request.headers[name] for name in RECORDED_HEADERS if name in request.headers},
+            "body": body,
+            "status": response.status_code,
+            "ms": round((time.perf_counter() - started) * 1000, 3),
+        }
+        # Streamed bodies would be consumed here; msgpack replies are not diffed
+        if not response.is_streamed and response.mimetype == "application/json":
+            entry["response"] = response.get_json(silent=True)
+        if self._writer is None:
+            self._start()
+        self._queue.put(entry)
+        return response
+
+    def flush(self, timeout=None):
+        """Wait until everything recorded so far is in the file. Returns False on timeout."""
+        if self._writer is None:
+            return True
+        done = threading.Event()
+        self._queue.put(done)
+        return done.wait(timeout)
+
+    def close(self, timeout=5):
+        if self._closed:
+            return
+        self._closed = True
+        if self._writer is not None:
+            self._queue.put(_STOP)
+            self._writer.join(timeout)
+
+    def _start(self):
+        with self._start_lock:
+            if self._writer is None:
+                self._writer = threading.Thread(target=self._run, name="traffic-writer", daemon=True)
+                self._writer.start()
+                atexit.register(self.close)
+
+    def _run(self):
+        # Appending starts a new gzip member; readers see one continuous stream
+        with gzip.open(self.path, "ab", compresslevel=6) as out:
+            stopping = False
+            while not stopping:
+                items = [self._queue.get()]
+                while len(items) < self.batch_size:
+                    try:
+                        items.append(self._queue.get_nowait())
+                    except queue.Empty:
+                        break
+                lines = [json.dumps(item, separators=(",", ":"), default=str) + "\n"
+                         for item in items if isinstance(item, dict)]
+                if lines:
+                    try:
+                        out.write("".join(lines).encode("utf-8"))
+                        # A sync flush keeps the file readable up to here if the process dies
+                        out.flush()
+                        TRAFFIC_RECORDED.inc(len(lines))
+                    except OSError as e:
+                        log.error("Traffic log write failed, %d requests lost: %s", len(lines), e)
+                for item in items:
+                    if item is _STOP:
+                        stopping = True
+                    elif isinstance(item, threading.Event):
+                        item.set()
+
+
+def read_log(path):
+    """Entries of a traffic log in arrival order; a truncated tail is ignored."""
+    entries = []
+    try:
+        with gzip.open(path, "rt", encoding="utf-8") as f:
+            for line in f:
+                if line.endswith("\n"):
+                    entries.append(json.loads(line))
+    except (EOFError, zlib.error):
+        log.warning("Traffic log %s ends mid-write; replaying the %d complete requests.", path, len(entries))
+    # Lines are written as requests finish
+    entries.sort(key=lambda entry: entry["t"])
+    return entries
@@ -0,0 +1,208 @@
+"""
+Worker processes for CPU-bound answer stages.
+Reasoning lookups (keyword scan plus the TF-IDF semantic index) and search
+answer composition (language filtering, sanitizing, extractive summaries) are
+pure Python or numpy and hold the GIL, so under a threaded server they run one
+at a time. A CpuPool runs them in warm worker processes instead.
+
+Workers hold their own ReasoningEngine and Researcher, built by a setup
+function. With the fork start method setup runs once in the parent, just
+before the workers fork, so the knowledge base and semantic index are shared
+copy-on-write. With spawn or forkserver, setup runs once in each worker.
+Either way each worker sets up its own logging, since a forked child inherits
+the parent's log queue but not the thread that drains it.
+
+Calls are batched on the way out. While every worker is busy, new calls wait
+in a queue, and the next free worker takes up to batch_size of them in one
+message. An idle pool sends each call on its own, so batching adds no latency.
+
+Environment (read by default_pool):
+    JARVIS_CPU_WORKERS   worker processes (default 0: stages run on the request thread)
+    JARVIS_CPU_BATCH     most calls sent to a worker in one message (default 32)
+    JARVIS_CPU_START     multiprocessing start method (default fork where available)
+"""
+import atexit
+import multiprocessing
+import os
+import queue
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from logger import get_logger, reset_logging
+from metrics import REGISTRY
+
+log = get_logger("workers")
+
+CPU_CALLS = REGISTRY.counter(
+    "jarvis_cpu_calls_total", "Calls run in worker processes, by stage.", ("stage",)
+)
+CPU_BATCH = REGISTRY.histogram(
+    "jarvis_cpu_batch_size", "Calls sent to a worker process in one message.",
+    buckets=(1, 2, 4, 8, 16, 32, 64, 128)
+)
+CPU_QUEUED = REGISTRY.gauge("jarvis_cpu_queued", "Calls waiting for a free worker process.")
+
+_STOP = object()
+
+# The objects calls run against; set in workers (and, under fork, in the parent)
+_worker_state = None
+
+
+def default_state():
+    """Setup for the default pool: a ReasoningEngine and a Researcher that never offload."""
+    from reasoning import ReasoningEngine
+    from research import Researcher
+    return {"reasoning": ReasoningEngine(pool=False), "research": Researcher(pool=False)}
+
+
+def _init_worker(setup):
+    global _worker_state
+    reset_logging()
+    if _worker_state is None:
+        _worker_state = setup()
+
+
+def _ping():
+    return None
+
+
+def _run_batch(calls):
+    """Run (target, method, args) calls in a worker; returns (ok, value) per call."""
+    results = []
+    for target, method, args in calls:
+        try:
+            results.append((True, getattr(_worker_state[target], method)(*args)))
+        except Exception as e:
+            results.append((False, e))
+    return results
+
+
+class CpuPool:
+    def __init__(self, processes, setup=default_state, batch_size=32, start_method=None):
+        global _worker_state
+        self.processes = processes
+        self.batch_size = batch_size
+        if start_method is None:
+            start_method = "fork" if "fork" in multiprocessing.get_all_start_methods() else "spawn"
+        self.start_method = start_method
+        if start_method == "fork":
+            # Build once here; forked workers inherit it
+            _worker_state = setup()
+        self._setup = setup
+        self._executor = self._start_executor()
+        # One message in flight per worker; everything else waits here to be batched
+        self._slots = threading.Semaphore(processes)
+        self._queue = queue.SimpleQueue()
+        self._closed = False
+        self._dispatcher = threading.Thread(target=self._run, name="cpu-dispatch", daemon=True)
+        self._dispatcher.start()
+        atexit.register(self.close)
+        log.info("Started %d %s worker processes", processes, start_method)
+
+    def _start_executor(self):
+        executor = ProcessPoolExecutor(
+            self.processes, mp_context=multiprocessing.get_context(self.start_method),
+            initializer=_init_worker, initargs=(self._setup,)
+        )
+        # Start every worker now, so the first call does not pay for it
+        for future in [executor.submit(_ping) for _ in range(self.processes)]:
+            future.result()
+        return executor
+
+    def submit(self, target, method, *args):
+        """Run getattr(state[target], method)(*args) in a worker; returns a Future."""
+        if self._closed:
+            raise RuntimeError("CPU pool is closed")
+        future = Future()
+        self._queue.put((future, (target, method, args)))
+        return future
+
+    def call(self, target, method, *args, timeout=None):
+        return self.submit(target, method, *args).result(timeout)
+
+    def map(self, target, method, arglists, timeout=None):
+        """Results of method(*args) for every args in arglists, in order."""
+        futures = [self.submit(target, method, *args) for args in arglists]
+        return [future.result(timeout) for future in futures]
+
+    def close(self, timeout=5):
+        if self._closed:
+            return
+        self._closed = True
+        self._queue.put(_STOP)
+        self._dispatcher.join(timeout)
+        self._executor.shutdown(wait=True, cancel_futures=True)
+
+    def _run(self):
+        stopping = False
+        while not stopping:
+            items = [self._queue.get()]
+            self._slots.acquire()
+            # Whatever queued while the workers were busy goes in the same message
+            while len(items) < self.batch_size:
+                try:
+                    items.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            CPU_QUEUED.set(self._queue.qsize())
+            if any(item is _STOP for item in items):
+                stopping = True
+                items = [item for item in items if item is not _STOP]
+            items = [(future, call) for future, call in items if future.set_running_or_notify_cancel()]
+            if not items:
+                self._slots.release()
+                continue
+            CPU_BATCH.observe(len(items))
+            calls = [call for _, call in items]
+            try:
+                try:
+                    batch = self._executor.submit(_run_batch, calls)
+                except BrokenProcessPool:
+                    log.warning("A CPU worker died; restarting the pool")
+                    self._executor = self._start_executor()
+                    batch = self._executor.submit(_run_batch, calls)
+            except Exception as e:
+                self._slots.release()
+                for future, _ in items:
+                    future.set_exception(e)
+                continue
+            batch.add_done_callback(lambda done, items=items: self._finish(done, items))
+
+    def _finish(self, batch, items):
+        self._slots.release()
+        try:
+            results = batch.result()
+        except Exception as e:
+            # A worker died mid-batch; the next batch restarts the pool
+            log.error("CPU worker batch of %d failed: %s", len(items), e)
+            for future, _ in items:
+                future.set_exception(e)
+            return
+        for (future, (target, method, _)), (ok, value) in zip(items, results):
+            CPU_CALLS.inc(stage=f"{target}.{method}")
+            if ok:
+                future.set_result(value)
+            else:
+                future.set_exception(value)
+
+
+_default = None
+_default_lock = threading.Lock()
+
+
+def default_pool():
+    """The process-wide pool sized by JARVIS_CPU_WORKERS, started on first use; None when disabled."""
+    global _default
+    processes = int(os.environ.get("JARVIS_CPU_WORKERS", "0"))
+    if processes <= 0 or multiprocessing.parent_process() is not None:
+        return None
+    if _default is None:
+        with _default_lock:
+            if _default is None:
+                _default = CpuPool(
+                    processes,
+                    batch_size=int(os.environ.get("JARVIS_CPU_BATCH", "32")),
+                    start_method=os.environ.get("JARVIS_CPU_START") or None
+                )
+    return _default